@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""
+LSF Async Decoding Benchmark
+
+This script decodes one large chunk of LSF with ``aiter_objects`` while a
+second task keeps waking up on the same event loop, and reports throughput
+and the longest time the loop was blocked: parsing the chunk in one piece,
+in slices, and in a thread pool.
+
+Usage:
+    python -m benchmarks.async_decoding [size_in_MB]
+"""
+
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from lsf.aio import DEFAULT_SLICE_SIZE, aiter_objects
+
+
+def make_document(size: int) -> bytes:
+    record = "$o~user{}$r~$f~name$f~Üser$r~$t~int$f~id$f~{}$r~$f~tags$f~a$l~b$r~$f~bio$f~" + "x" * 120 + "$r~\n"
+    count = size // len(record.format(0, 0).encode("utf-8")) + 1
+    return "".join(record.format(i, i) for i in range(count)).encode("utf-8")
+
+
+async def run(data: bytes, **kwargs) -> tuple:
+    longest = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal longest
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            longest = max(longest, now - last)
+            last = now
+
+    async def source():
+        yield data
+
+    task = asyncio.ensure_future(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    count = 0
+    async for _ in aiter_objects(source(), **kwargs):
+        count += 1
+    elapsed = time.perf_counter() - start
+    done = True
+    await task
+    return count, elapsed, longest
+
+
+def main() -> None:
+    size = int(float(sys.argv[1]) * 1024 * 1024) if len(sys.argv) > 1 else 50 * 1024 * 1024
+    data = make_document(size)
+
+    print("LSF Async Decoding Benchmark")
+    print("============================\n")
+    print(f"One chunk of {len(data) / 1024 / 1024:.0f} MB\n")
+    print("| Mode | Objects | Time (s) | MB/s | Longest loop stall (ms) |")
+    print("|------|---------|----------|------|-------------------------|")
+    with ThreadPoolExecutor(1) as executor:
+        modes = [
+            ("unsliced", {"slice_size": len(data)}),
+            (f"slices of {DEFAULT_SLICE_SIZE // 1024} KiB", {}),
+            ("thread pool", {"executor": executor}),
+        ]
+        for label, kwargs in modes:
+            count, elapsed, longest = asyncio.run(run(data, **kwargs))
+            print(f"| {label} | {count:,} | {elapsed:8.2f} | {len(data) / 1024 / 1024 / elapsed:4.0f} | "
+                  f"{longest * 1000:23.1f} |")
+
+
+if __name__ == "__main__":
+    main()
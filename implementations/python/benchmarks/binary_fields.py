@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+LSF Binary Field Benchmark
+
+This script writes and reads one LSF object holding a large ``bin``
+attachment and reports time and peak traced memory for each way of doing
+it: encoding the payload as one base64 string against ``add_binary`` and
+``iter_base64`` writing chunks to a file, and decoding with ``from_lsf`` on
+the file's text against ``decode_file`` and ``decode_file(lazy_bin=True)``
+streaming into a file. Memory-mapped pages are not counted, as they belong
+to the OS page cache.
+
+Usage:
+    python -m benchmarks.binary_fields [size_in_MB]
+"""
+
+import base64
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+from lsf import LSFEncoder, decode_file, from_lsf
+from lsf.binary import iter_base64
+
+
+def measure(func: Callable[[], object]) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    size = int(float(sys.argv[1]) * 1024 * 1024) if len(sys.argv) > 1 else 100 * 1024 * 1024
+    directory = tempfile.mkdtemp()
+    payload = os.path.join(directory, "payload.bin")
+    document = os.path.join(directory, "document.lsf")
+    output = os.path.join(directory, "output.bin")
+    with open(payload, "wb") as f:
+        for _ in range(size // (1 << 20)):
+            f.write(os.urandom(1 << 20))
+        f.write(os.urandom(size % (1 << 20)))
+
+    def encode_whole() -> None:
+        with open(payload, "rb") as f:
+            data = f.read()
+        text = f"$o~mail$r~$f~subject$f~Report$r~$t~bin$f~file$f~{base64.b64encode(data).decode('ascii')}$r~"
+        with open(document, "w", encoding="ascii") as f:
+            f.write(text)
+
+    def encode_add_binary() -> None:
+        with open(payload, "rb") as f:
+            text = LSFEncoder().start_object("mail").add_field("subject", "Report").add_binary("file", f).to_string()
+        with open(document, "w", encoding="ascii") as f:
+            f.write(text)
+
+    def encode_streaming() -> None:
+        with open(payload, "rb") as source, open(document, "w", encoding="ascii") as f:
+            f.write("$o~mail$r~$f~subject$f~Report$r~$t~bin$f~file$f~")
+            for chunk in iter_base64(source):
+                f.write(chunk)
+            f.write("$r~")
+
+    def decode_text() -> None:
+        with open(document, encoding="ascii") as f:
+            data = from_lsf(f.read())
+        with open(output, "wb") as f:
+            f.write(data["mail"]["file"])
+
+    def decode_mapped() -> None:
+        data = decode_file(document)
+        with open(output, "wb") as f:
+            f.write(data["mail"]["file"])
+
+    def decode_lazy() -> None:
+        data = decode_file(document, lazy_bin=True)
+        with open(output, "wb") as f:
+            data["mail"]["file"].write_to(f)
+
+    print("LSF Binary Field Benchmark")
+    print("==========================\n")
+    print(f"Payload: {size / 1024 / 1024:.0f} MB\n")
+    print("| Step | Mode | Time (s) | Peak traced memory (MB) |")
+    print("|------|------|----------|-------------------------|")
+    try:
+        rows = [
+            ("encode", "b64encode of the whole payload", encode_whole),
+            ("encode", "add_binary(file) + to_string", encode_add_binary),
+            ("encode", "iter_base64(file) to a file", encode_streaming),
+            ("decode", "from_lsf(text)", decode_text),
+            ("decode", "decode_file", decode_mapped),
+            ("decode", "decode_file(lazy_bin=True) + write_to", decode_lazy),
+        ]
+        for step, label, func in rows:
+            elapsed, peak = measure(func)
+            if step == "decode":
+                with open(output, "rb") as f, open(payload, "rb") as g:
+                    assert f.read() == g.read()
+            print(f"| {step} | {label} | {elapsed:8.2f} | {peak / 1024 / 1024:23.1f} |")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
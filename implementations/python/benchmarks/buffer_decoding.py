@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+LSF Buffer Decoding Benchmark
+
+This script compares time and peak Python memory of decoding an LSF file by
+reading it into a ``str`` and calling ``from_lsf`` against the bytes-native
+``decode_buffer`` and the memory-mapped ``decode_file``.
+
+Usage:
+    python -m benchmarks.buffer_decoding [size_in_MB]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+from lsf import from_lsf
+from lsf.buffer_decoder import decode_buffer, decode_file
+
+# Number of distinct object names; repeated names replace earlier objects,
+# so the decoded result stays small while the file grows.
+DISTINCT_OBJECTS = 1000
+
+
+def write_file(path: str, size: int) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        written = 0
+        i = 0
+        while written < size:
+            record = (
+                f"$o~item{i % DISTINCT_OBJECTS}$r~$f~name$f~Ítem {i}$r~$t~int$f~id$f~{i}$r~"
+                f"$f~blob$f~{'x' * 200}$r~$t~float$f~price$f~{i * 0.5}$r~\n"
+            )
+            f.write(record)
+            written += len(record.encode("utf-8"))
+            i += 1
+
+
+def measure(func: Callable[[], object]) -> Tuple[float, int]:
+    """Time one untraced run, then measure peak memory on a traced run."""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def from_str(path: str):
+    with open(path, encoding="utf-8") as f:
+        return from_lsf(f.read())
+
+
+def from_bytes(path: str):
+    with open(path, "rb") as f:
+        return decode_buffer(f.read())
+
+
+def main() -> None:
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 50
+    fd, path = tempfile.mkstemp(suffix=".lsf")
+    os.close(fd)
+    try:
+        write_file(path, int(size_mb * 1024 * 1024))
+        file_size = os.path.getsize(path)
+        print("LSF Buffer Decoding Benchmark")
+        print("=============================\n")
+        print(f"File size: {file_size / 1024 / 1024:.1f} MB\n")
+        print("| Method                       | Time (s) | Peak Python memory (MB) | Peak / file size |")
+        print("|------------------------------|----------|-------------------------|------------------|")
+        for label, func in (
+            ("read() + from_lsf", lambda: from_str(path)),
+            ("read() bytes + decode_buffer", lambda: from_bytes(path)),
+            ("decode_file (mmap)", lambda: decode_file(path)),
+        ):
+            elapsed, peak = measure(func)
+            print(f"| {label:<28} | {elapsed:>8.2f} | {peak / 1024 / 1024:>23.1f} | {peak / file_size:>16.2f} |")
+        print("\nPeak memory is measured with tracemalloc; mapped file pages are not Python allocations.")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+LSF Bytes Encoding Benchmark
+
+This script produces LSF bytes with ``to_lsf(data).encode()``, with
+``encode_to_bytes`` as one bytearray and as a list of chunks, and with
+``LSFEncoder(binary=True)`` against its str output encoded afterwards. It
+uses the ``large`` data set flattened into top-level objects, and objects
+carrying ``bin`` attachments, and reports bytes produced per second (best
+of five runs) and peak traced memory from a separate run.
+
+Usage:
+    python -m benchmarks.bytes_encoding [copies] [attachment_KB]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict
+
+from lsf import LSFEncoder, encode_to_bytes, to_lsf
+
+from .scenarios import flat_records
+
+ATTACHMENTS = 200
+
+
+def fluent(data: Dict[str, Dict[str, Any]], binary: bool) -> bytes:
+    """Write the objects' str and bytes fields through the fluent encoder."""
+    encoder = LSFEncoder(binary=binary)
+    for name, fields in data.items():
+        encoder.start_object(name)
+        for key, value in fields.items():
+            if isinstance(value, bytes):
+                encoder.add_binary(key, value)
+            else:
+                encoder.add_field(key, value)
+    return encoder.to_bytes() if binary else encoder.to_string().encode("utf-8")
+
+
+def measure(func: Callable[[], Any]) -> tuple:
+    """Return (best seconds, peak bytes); tracing is kept out of the timed runs."""
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def main() -> None:
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    attachment_size = int(sys.argv[2]) * 1024 if len(sys.argv) > 2 else 256 * 1024
+    data_sets = {
+        f"large x{copies}": flat_records(copies),
+        f"{ATTACHMENTS} x {attachment_size // 1024} KB bin": {
+            f"mail{i}": {"subject": f"Report {i}", "attachment": os.urandom(attachment_size)}
+            for i in range(ATTACHMENTS)
+        },
+    }
+
+    print("LSF Bytes Encoding Benchmark")
+    print("============================\n")
+    for label, data in data_sets.items():
+        expected = to_lsf(data).encode("utf-8")
+        size = len(expected) / 1024 / 1024
+        rows = (
+            ("to_lsf(...).encode()", lambda: to_lsf(data).encode("utf-8")),
+            ("encode_to_bytes", lambda: encode_to_bytes(data)),
+            ("encode_to_bytes(chunks=True)", lambda: encode_to_bytes(data, chunks=True)),
+            ("LSFEncoder().to_string().encode()", lambda: fluent(data, binary=False)),
+            ("LSFEncoder(binary=True).to_bytes()", lambda: fluent(data, binary=True)),
+        )
+        assert encode_to_bytes(data) == expected
+        assert b"".join(encode_to_bytes(data, chunks=True)) == expected
+        assert fluent(data, binary=True) == fluent(data, binary=False)
+
+        print(f"{label}: {size:.1f} MB\n")
+        print("| Method | MB/s | Peak (MB) |")
+        print("|--------|------|-----------|")
+        for name, func in rows:
+            elapsed, peak = measure(func)
+            print(f"| {name} | {size / elapsed:4.0f} | {peak / 1024 / 1024:9.1f} |")
+        print()
+
+
+if __name__ == "__main__":
+    main()
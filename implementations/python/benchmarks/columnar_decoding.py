@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+LSF Columnar Decoding Benchmark
+
+This script compares decoding the flattened records of the ``large`` data
+set into dictionaries and pivoting them into columns, as analytics jobs do,
+with ``decode_columns`` writing each field straight into an array or list.
+It reports time and the memory held by the result.
+
+Usage:
+    python -m benchmarks.columnar_decoding [copies]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from lsf import from_lsf, to_lsf
+from lsf.columnar import decode_columns
+
+from .scenarios import flat_records
+
+ITERATIONS = 10
+
+
+def type_of(name: str) -> str:
+    return name.rstrip("0123456789")
+
+
+def dicts_then_pivot(lsf_str: str) -> Dict[str, Tuple[List[str], Dict[str, List[Any]]]]:
+    """Decode to dictionaries, then pivot each object type into row names and column lists."""
+    tables: Dict[str, Tuple[List[str], Dict[str, List[Any]]]] = {}
+    for name, fields in from_lsf(lsf_str).items():
+        names, columns = tables.setdefault(type_of(name), ([], {}))
+        names.append(name)
+        for key, value in fields.items():
+            columns.setdefault(key, []).append(value)
+    return tables
+
+
+def measure(decode: Callable[[], Any]) -> Tuple[float, int, int]:
+    """Return the best time, the bytes held by the result and the peak while decoding."""
+    best = float("inf")
+    for _ in range(ITERATIONS):
+        gc.collect()
+        start = time.perf_counter()
+        decode()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    result = decode()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best, held, peak
+
+
+def main() -> None:
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    lsf_str = to_lsf(flat_records(copies))
+    records = lsf_str.count("$o~")
+
+    print("LSF Columnar Decoding Benchmark")
+    print("===============================\n")
+    print(f"{records} records, {len(lsf_str) / 1024 / 1024:.1f} MB\n")
+    print("| Mode | Time (ms) | Held (MB) | Peak (MB) | Held bytes per record | Peak saved |")
+    print("|------|-----------|-----------|-----------|-----------------------|------------|")
+    rows = (
+        ("from_lsf dicts", lambda: from_lsf(lsf_str)),
+        ("from_lsf + pivot to columns", lambda: dicts_then_pivot(lsf_str)),
+        ("decode_columns (array/list)", lambda: decode_columns(lsf_str, type_of, use_numpy=False)),
+    )
+    baseline = None
+    for label, decode in rows:
+        elapsed, held, peak = measure(decode)
+        if baseline is None:
+            baseline = peak
+        print(
+            f"| {label} | {elapsed * 1000:9.1f} | {held / 1024 / 1024:9.2f} | {peak / 1024 / 1024:9.2f} | "
+            f"{held / records:21.0f} | {(1 - peak / baseline) * 100:9.0f}% |"
+        )
+
+    # The numeric columns alone, where arrays replace boxed Python objects
+    tables = decode_columns(lsf_str, type_of, use_numpy=False)
+    numeric = [(table, key) for table in tables.values() for key, column in table.columns.items()
+               if not isinstance(column, list)]
+    array_bytes = sum(table.columns[key].itemsize * len(table) for table, key in numeric)
+    boxed_bytes = sum(sys.getsizeof(value) + 8 for table, key in numeric for value in table.columns[key])
+    print(f"\nNumeric columns: {array_bytes / 1024:.0f} KB as arrays vs {boxed_bytes / 1024:.0f} KB as lists of Python numbers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+LSF decode_many Scaling Benchmark
+
+This script decodes many independent responses with a ``from_lsf`` loop and
+with ``decode_many`` on 1 to N worker processes, reporting throughput and
+speedup. Responses are the benchmark scenarios encoded with ``to_lsf``.
+
+Usage:
+    python -m benchmarks.decode_many [documents] [max_workers]
+"""
+
+import os
+import sys
+import time
+
+from lsf import from_lsf, to_lsf
+from lsf.parallel import decode_many
+
+from .scenarios import DATA_SETS, SCENARIOS, flat_records
+
+
+def make_documents(count: int):
+    records = flat_records()
+    shapes = [to_lsf(scenario["data"]) for scenario in SCENARIOS]
+    shapes += [to_lsf(data) for data in DATA_SETS.values()]
+    # Responses of 10 flattened records, like a page of an API listing
+    names = list(records)
+    shapes += [to_lsf({name: records[name] for name in names[i:i + 10]}) for i in range(0, len(names), 10)]
+    return [shapes[i % len(shapes)] for i in range(count)]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    documents = make_documents(count)
+    size = sum(map(len, documents))
+
+    print("LSF decode_many Scaling Benchmark")
+    print("=================================\n")
+    print(f"{count} documents, {size / 1024 / 1024:.1f} MB, {os.cpu_count()} CPUs\n")
+
+    # Results are kept, as decode_many keeps them
+    start = time.perf_counter()
+    results = [from_lsf(document) for document in documents]
+    baseline = time.perf_counter() - start
+    del results
+
+    print("| Mode | Time (s) | Documents/s | Speedup |")
+    print("|------|----------|-------------|---------|")
+    print(f"| from_lsf loop | {baseline:8.2f} | {count / baseline:11,.0f} | {1:6.2f}x |")
+    counts = sorted({max_workers, *(1 << i for i in range(max_workers.bit_length()) if 1 << i < max_workers)})
+    for workers in counts:
+        for chunksize in (16, 256):
+            start = time.perf_counter()
+            results = decode_many(documents, workers=workers, chunksize=chunksize)
+            elapsed = time.perf_counter() - start
+            assert all(result.ok for result in results)
+            print(f"| decode_many workers={workers} chunksize={chunksize} | {elapsed:8.2f} | "
+                  f"{count / elapsed:11,.0f} | {baseline / elapsed:6.2f}x |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+LSF 3.0 DOM Memory Benchmark
+
+This script compares the memory per node of the struct-of-arrays
+``lsf.v3.DOMBuilder`` with the per-node dataclass layout planned in
+``ver2-parser-python-pllan.md`` (one ``LSFNode`` object per node with a
+``children_indices`` list per parent), and reports the peak memory of
+building the arrays next to what they retain.
+
+Usage:
+    python -m benchmarks.dom_memory [objects]
+"""
+
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import List, Optional
+
+from lsf.v3 import DOMBuilder, TokenScanner
+from lsf.v3.dom_builder import DOM
+from benchmarks.scenarios import v3_dataset
+
+
+@dataclass
+class LSFNode:
+    """Per-node layout from the Python parser plan, for comparison."""
+    token_type: int
+    token_position: int
+    data_position: int
+    data_length: int
+    parent_index: int
+    children_indices: Optional[List[int]]
+    type_hint: int
+
+
+def to_node_objects(dom: DOM) -> List[LSFNode]:
+    """Copy a DOM into one LSFNode per node with per-parent children lists."""
+    nodes = [
+        LSFNode(dom.types[i], dom.token_positions[i], dom.data_positions[i],
+                dom.data_lengths[i], dom.parents[i], None, dom.hints[i])
+        for i in range(len(dom))
+    ]
+    for i, node in enumerate(nodes):
+        if node.parent_index >= 0:
+            parent = nodes[node.parent_index]
+            if parent.children_indices is None:
+                parent.children_indices = []
+            parent.children_indices.append(i)
+    return nodes
+
+
+def retained_bytes(func):
+    """Return (result, bytes still allocated for the result after func returns, peak bytes during func)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = func()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, after - before, peak - before
+
+
+def main() -> None:
+    sizes = [int(sys.argv[1])] if len(sys.argv) > 1 else [1000, 10000, 100000]
+    builder = DOMBuilder()
+
+    print("LSF 3.0 DOM Memory Benchmark")
+    print("============================\n")
+    print("| Objects | Nodes     | Build (s) | Arrays (bytes/node) | Build peak (bytes/node) "
+          "| Dataclass nodes (bytes/node) | Saving |")
+    print("|---------|-----------|-----------|---------------------|-------------------------"
+          "|------------------------------|--------|")
+    for objects in sizes:
+        lsf_bytes, _ = v3_dataset(objects)
+        tokens = TokenScanner().scan(lsf_bytes)
+        start = time.perf_counter()
+        dom = builder.build(tokens)
+        elapsed = time.perf_counter() - start
+        _, array_bytes, build_peak = retained_bytes(lambda: builder.build(tokens))
+        nodes, object_bytes, _ = retained_bytes(lambda: to_node_objects(dom))
+        per_node_arrays = array_bytes / len(dom)
+        per_node_objects = object_bytes / len(nodes)
+        print(
+            f"| {objects:>7} | {len(dom):>9} | {elapsed:>9.3f} | {per_node_arrays:>19.1f} | "
+            f"{build_peak / len(dom):>23.1f} | "
+            f"{per_node_objects:>28.1f} | {per_node_objects / per_node_arrays:>5.1f}x |"
+        )
+    print("\nBytes are measured with tracemalloc and exclude the input buffer.")
+
+
+if __name__ == "__main__":
+    main()
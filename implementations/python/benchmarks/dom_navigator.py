@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+"""
+LSF 3.0 DOMNavigator Benchmark
+
+This script measures how the cost of reading an LSF 3.0 document through
+``lsf.v3.DOMNavigator`` scales with the share of fields actually read:
+1% of the fields against all of them, with and without the decode cache.
+
+Usage:
+    python -m benchmarks.dom_navigator [objects]
+"""
+
+import sys
+import time
+from typing import Callable, List
+
+from lsf.v3 import DOMBuilder, DOMNavigator, TokenScanner
+from benchmarks.scenarios import v3_dataset
+
+
+def timed(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def read_fields(navigator: DOMNavigator, fields: List[int]) -> None:
+    get_name = navigator.get_name
+    get_field_value = navigator.get_field_value
+    for field in fields:
+        get_name(field)
+        get_field_value(field)
+
+
+def main() -> None:
+    objects = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    lsf_bytes, _ = v3_dataset(objects)
+
+    parse_time = timed(lambda: DOMBuilder().build(TokenScanner().scan(lsf_bytes)))
+    dom = DOMBuilder().build(TokenScanner().scan(lsf_bytes))
+    fields = [field for root in dom.roots for field in dom.get_children(root)]
+
+    print("LSF 3.0 DOMNavigator Benchmark")
+    print("==============================\n")
+    print(f"Document: {len(lsf_bytes) / 1024 / 1024:.1f} MB, {len(dom)} nodes, {len(fields)} fields")
+    print(f"Scan + build: {parse_time:.3f} s\n")
+    print("| Fields read | Cache     | First read (s) | Second read (s) |")
+    print("|-------------|-----------|----------------|-----------------|")
+    for share in (0.01, 1.0):
+        selected = fields[::round(1 / share)]
+        for label, cache_size in (("none", 0), ("unbounded", None)):
+            navigator = DOMNavigator(dom, cache_size=cache_size)
+            first = timed(lambda: read_fields(navigator, selected))
+            second = timed(lambda: read_fields(navigator, selected))
+            print(f"| {share:>10.0%} | {label:<9} | {first:>14.4f} | {second:>15.4f} |")
+    print("\nUnread fields are never decoded, so reading 1% costs about 1% of a full read.")
+
+
+if __name__ == "__main__":
+    main()
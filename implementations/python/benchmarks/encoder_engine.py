@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""
+LSF Encoder Engine Benchmark
+
+This script compares ``to_lsf`` with the same conversion written through
+the ``LSFEncoder`` fluent API and an ``isinstance`` chain, as ``to_lsf``
+used to be, on every data set in ``DATA_SETS`` and on the ``large`` set
+flattened into top-level objects. It checks that both write the same text
+and reports the best time per call of each.
+
+Usage:
+    python -m benchmarks.encoder_engine
+"""
+
+import timeit
+from typing import Any, Dict
+
+from lsf import LSFEncoder, to_lsf
+from lsf.simple import _list_type_hint
+
+from .scenarios import DATA_SETS, flat_records
+
+# Roughly 0.2 s of work per timing run
+TARGET_SECONDS = 0.2
+
+
+def fluent_to_lsf(data: Dict[str, Dict[str, Any]]) -> str:
+    """to_lsf through the fluent encoder, as before the fast path."""
+    encoder = LSFEncoder()
+    for obj_name, obj_data in data.items():
+        encoder.start_object(obj_name)
+        for key, value in obj_data.items():
+            if isinstance(value, list):
+                encoder.add_list(key, value)
+            elif isinstance(value, int) and not isinstance(value, bool):
+                encoder.add_typed_field(key, value, "int")
+            elif isinstance(value, float):
+                encoder.add_typed_field(key, value, "float")
+            elif isinstance(value, bool):
+                encoder.add_typed_field(key, value, "bool")
+            elif value is None:
+                encoder.add_typed_field(key, value, "null")
+            elif isinstance(value, bytes):
+                encoder.add_typed_field(key, value, "bin")
+            else:
+                type_hint = _list_type_hint(value)
+                if type_hint is not None:
+                    encoder.add_list(key, value, type_hint)
+                else:
+                    encoder.add_field(key, value)
+    return encoder.to_string()
+
+
+def best_time(func, data) -> float:
+    """Return the best seconds per call of seven repeats."""
+    number = max(1, int(TARGET_SECONDS / timeit.timeit(lambda: func(data), number=1)))
+    return min(timeit.repeat(lambda: func(data), number=number, repeat=7)) / number
+
+
+def main() -> None:
+    data_sets = dict(DATA_SETS)
+    data_sets["large (flattened)"] = flat_records()
+
+    print("LSF Encoder Engine Benchmark")
+    print("============================\n")
+    print("| Data set | Fluent encoder (µs) | to_lsf (µs) | Speedup |")
+    print("|----------|---------------------|-------------|---------|")
+    for name, data in data_sets.items():
+        assert to_lsf(data) == fluent_to_lsf(data)
+        fluent = best_time(fluent_to_lsf, data)
+        fast = best_time(to_lsf, data)
+        print(f"| {name} | {fluent * 1e6:19.1f} | {fast * 1e6:11.1f} | {fluent / fast:6.2f}x |")
+
+
+if __name__ == "__main__":
+    main()
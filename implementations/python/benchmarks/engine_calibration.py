@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+LSF Decode Engine Calibration
+
+This script times every registered decode engine on synthetic documents of
+varying size and record shape, and derives the thresholds used by the
+``auto`` engine in ``lsf.engines.AUTO_THRESHOLDS``.
+"""
+
+import timeit
+from typing import Dict, List
+
+from lsf.engines import AUTO_THRESHOLDS, available_engines, get_decoder
+
+# Engines compared by the calibration (the reference decoder is far slower
+# and would only make the sweep take longer)
+CANDIDATES = ["bulk", "regex", "scan"]
+
+RECORD_SIZES = [16, 64, 256, 512, 1024, 2048, 4096, 8192, 16384, 65536]
+DOCUMENT_SIZES = [256, 1024, 4096, 16384, 65536, 262144, 1048576]
+SWEEP_DOCUMENT_SIZE = 1024 * 1024
+
+
+def make_document(size: int, record_size: int) -> str:
+    """Build a document of roughly `size` characters whose records average `record_size`."""
+    head = "$o~obj$r~$t~int$f~id$f~12345$r~"
+    # Three records per unit: the object, the typed id and the name field
+    value_len = max(1, 3 * record_size - len(head) - len("$f~name$f~$r~\n"))
+    body = f"$f~name$f~{'x' * value_len}$r~\n"
+    unit = head + body
+    return unit * max(1, size // len(unit))
+
+
+def time_engine(engine: str, lsf_str: str) -> float:
+    """Return the best per-call decode time in seconds."""
+    decoder = get_decoder(engine)
+    number = max(1, 2_000_000 // max(1, len(lsf_str)))
+    return min(timeit.repeat(lambda: decoder.decode(lsf_str), number=number, repeat=5)) / number
+
+
+def time_all(lsf_str: str) -> Dict[str, float]:
+    return {engine: time_engine(engine, lsf_str) for engine in CANDIDATES if engine in available_engines()}
+
+
+def print_row(label: str, timings: Dict[str, float]) -> None:
+    best = min(timings, key=timings.get)
+    cells = " | ".join(f"{timings[engine] * 1000:10.4f}" for engine in CANDIDATES)
+    print(f"| {label:>10} | {cells} | {best:>7} |")
+
+
+def calibrate() -> Dict[str, int]:
+    """Run the sweeps and return measured thresholds."""
+    header = " | ".join(f"{engine + ' (ms)':>10}" for engine in CANDIDATES)
+
+    print("\n## Record size sweep (1 MB documents)\n")
+    print(f"| {'record':>10} | {header} | {'fastest':>7} |")
+    regex_min_record_size = None
+    for record_size in RECORD_SIZES:
+        lsf_str = make_document(SWEEP_DOCUMENT_SIZE, record_size)
+        timings = time_all(lsf_str)
+        print_row(str(record_size), timings)
+        if timings["regex"] < timings["bulk"]:
+            if regex_min_record_size is None:
+                regex_min_record_size = record_size
+        else:
+            regex_min_record_size = None
+    if regex_min_record_size is None:
+        regex_min_record_size = RECORD_SIZES[-1] * 2
+
+    print(f"\n## Document size sweep ({regex_min_record_size * 2}-char records)\n")
+    print(f"| {'size':>10} | {header} | {'fastest':>7} |")
+    min_probe_size = None
+    record_size = regex_min_record_size * 2
+    for size in DOCUMENT_SIZES:
+        if size < 3 * record_size:
+            continue
+        lsf_str = make_document(size, record_size)
+        timings = time_all(lsf_str)
+        print_row(str(len(lsf_str)), timings)
+        # The probe only pays off once "regex" wins at every larger size too
+        if timings["regex"] < timings["bulk"]:
+            if min_probe_size is None:
+                min_probe_size = size
+        else:
+            min_probe_size = None
+    if min_probe_size is None:
+        min_probe_size = DOCUMENT_SIZES[-1] * 2
+
+    return {
+        "min_probe_size": min_probe_size,
+        "regex_min_record_size": regex_min_record_size,
+    }
+
+
+def main() -> None:
+    print("LSF Decode Engine Calibration")
+    print("=============================")
+    measured = calibrate()
+    print("\n## Thresholds\n")
+    print(f"{'name':<24} {'current':>10} {'measured':>10}")
+    for name, value in measured.items():
+        print(f"{name:<24} {AUTO_THRESHOLDS.get(name, '-'):>10} {value:>10}")
+    print("\nPaste into lsf/engines.py:")
+    print("AUTO_THRESHOLDS = {")
+    for name, value in measured.items():
+        print(f'    "{name}": {value},')
+    print("}")
+
+
+if __name__ == "__main__":
+    main()
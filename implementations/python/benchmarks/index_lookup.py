@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+LSF Index Lookup Benchmark
+
+This script measures point-lookup latency for one object of a large LSF file
+through the sidecar index (``IndexedLSFFile``) against decoding the whole
+file with ``decode_file``, along with the cost of building, saving and
+refreshing the index.
+
+Usage:
+    python -m benchmarks.index_lookup [size_in_MB]
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable
+
+from lsf.buffer_decoder import decode_file
+from lsf.index import INDEX_SUFFIX, IndexedLSFFile, LSFIndex
+
+LOOKUPS = 1000
+
+
+def write_objects(f, first: int, size: int) -> int:
+    """Write uniquely named objects until size bytes are written; return the next number."""
+    written = 0
+    i = first
+    while written < size:
+        record = (
+            f"$o~user{i}$r~$f~name$f~Üser {i}$r~$t~int$f~id$f~{i}$r~"
+            f"$f~tags$f~a$l~b$l~c$r~$f~bio$f~{'x' * 120}$r~$t~float$f~score$f~{i * 0.25}$r~\n"
+        )
+        f.write(record)
+        written += len(record.encode("utf-8"))
+        i += 1
+    return i
+
+
+def timed(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    size = int(float(sys.argv[1]) * 1024 * 1024) if len(sys.argv) > 1 else 50 * 1024 * 1024
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "data.lsf")
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            objects = write_objects(f, 0, size)
+        names = [f"user{random.randrange(objects)}" for _ in range(LOOKUPS)]
+
+        print("LSF Index Lookup Benchmark")
+        print("==========================\n")
+        print(f"File: {os.path.getsize(path) / 1024 / 1024:.1f} MB, {objects} objects\n")
+
+        build = timed(lambda: LSFIndex.build(path).save())
+        print(f"Build and save index:       {build:8.3f} s "
+              f"({os.path.getsize(path + INDEX_SUFFIX) / 1024 / 1024:.1f} MB index)")
+        reopen = timed(lambda: IndexedLSFFile(path).close())
+        print(f"Open with a fresh index:    {reopen * 1000:8.1f} ms")
+
+        for use_mmap, label in ((True, "mmap"), (False, "seek + read")):
+            with IndexedLSFFile(path, use_mmap=use_mmap) as data:
+                elapsed = timed(lambda: [data[name] for name in names])
+            print(f"Indexed lookup ({label}):{' ' * (11 - len(label))}{elapsed / LOOKUPS * 1e6:8.1f} µs per object")
+
+        full = timed(lambda: decode_file(path)[names[0]])
+        print(f"Without index (decode_file): {full * 1000:7.1f} ms per object "
+              f"({full / (elapsed / LOOKUPS):,.0f}x slower)\n")
+
+        with open(path, "a", encoding="utf-8") as f:
+            write_objects(f, objects, size // 100)
+        refresh = timed(lambda: IndexedLSFFile(path).close())
+        print(f"Open after appending 1%:    {refresh * 1000:8.1f} ms (incremental refresh)")
+        rebuild = timed(lambda: LSFIndex.build(path))
+        print(f"Full rebuild for comparison: {rebuild * 1000:7.1f} ms")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
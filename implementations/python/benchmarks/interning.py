@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+LSF Interning Benchmark
+
+This script decodes the users, products and transactions of the ``large``
+data set, flattened into top-level objects, many times over while keeping
+every result, as when a batch of logged responses is loaded. It compares
+BulkLSFDecoder with InterningLSFDecoder sharing keys and object names, and
+also low-cardinality values, reporting decode time, memory held by the
+results, memory saved and the table's hit rates. A last run gives every
+response its own object names, as ids used once would, to check that they
+do not crowd keys out of the table.
+
+Usage:
+    python -m benchmarks.interning [decodes]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from typing import Callable, List
+
+from lsf import BulkLSFDecoder, to_lsf
+from lsf.intern import InternTable, InterningLSFDecoder
+
+from .scenarios import flat_records
+
+
+def run(make_decoder: Callable[[], BulkLSFDecoder], documents: List[str]) -> tuple:
+    """Return (best seconds, bytes held) for decoding every document, keeping the results."""
+    decoder = make_decoder()
+    best = float("inf")
+    for _ in range(3):
+        gc.collect()
+        start = time.perf_counter()
+        results = [decoder.decode(document) for document in documents]
+        best = min(best, time.perf_counter() - start)
+        del results
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    results = [decoder.decode(document) for document in documents]
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del results
+    return best, held
+
+
+def main() -> None:
+    decodes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    lsf_str = to_lsf(flat_records())
+
+    print("LSF Interning Benchmark")
+    print("=======================\n")
+    print(f"{decodes} decodes of {len(lsf_str) / 1024:.0f} KB (flattened 'large' data set), results kept\n")
+
+    # A fresh copy per decode, as each logged response is its own string
+    documents = [lsf_str[:1] + lsf_str[1:] for _ in range(decodes)]
+    renamed = [lsf_str.replace("$o~", f"$o~r{i}_") for i in range(decodes)]
+    baseline, baseline_held = run(BulkLSFDecoder, documents)
+    keys_table = InternTable()
+    values_table = InternTable()
+    renamed_table = InternTable()
+    rows = [
+        ("BulkLSFDecoder", baseline, baseline_held, None),
+        ("keys and names", *run(lambda: InterningLSFDecoder(keys_table), documents), keys_table),
+        ("keys, names and values", *run(lambda: InterningLSFDecoder(values_table, intern_values=True),
+                                        documents), values_table),
+        ("keys and names, new names per response", *run(lambda: InterningLSFDecoder(renamed_table), renamed),
+         renamed_table),
+    ]
+
+    print("| Decoder | Time (s) | Held (MB) | Saved | Key hit rate | Name hit rate | Value hit rate |")
+    print("|---------|----------|-----------|-------|--------------|---------------|----------------|")
+    for label, elapsed, held, table in rows:
+        saved = 1 - held / baseline_held
+        if table is None:
+            rates = "| - | - | - |"
+        else:
+            stats = table.stats()
+            value_rate = f"{stats.value_hit_rate:.1%}" if stats.value_lookups else "-"
+            rates = f"| {stats.hit_rate:.1%} | {stats.name_hit_rate:.1%} | {value_rate} |"
+        print(f"| {label} | {elapsed:8.2f} | {held / 1024 / 1024:9.1f} | {saved:5.1%} {rates}")
+    for label, table in (("Table", values_table), ("New names table", renamed_table)):
+        stats = table.stats()
+        print(f"\n{label}: {stats.size} keys, {stats.names} names, {stats.value_keys} keys with interned values")
+
+
+if __name__ == "__main__":
+    main()
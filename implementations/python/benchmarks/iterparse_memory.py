@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""
+LSF iterparse Memory Benchmark
+
+This script measures peak memory and throughput of ``lsf.iterparse`` on
+synthetic LSF streams from 10 MB up to 10 GB, next to ``from_lsf`` on the
+sizes where loading the whole document is still practical.
+
+Each measurement runs in a fresh subprocess so the reported peak RSS belongs
+to that input size alone. The synthetic input is generated on the fly, so no
+disk space is needed.
+
+Usage:
+    python -m benchmarks.iterparse_memory
+    python -m benchmarks.iterparse_memory --sizes 10MB,100MB --from-lsf-max 100MB
+"""
+
+import argparse
+import io
+import json
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from lsf import from_lsf, iterparse
+
+DEFAULT_SIZES = "10MB,100MB,1GB,10GB"
+UNITS = {"KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().upper()
+    for unit, factor in UNITS.items():
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * factor)
+    return int(text)
+
+
+def format_size(size: int) -> str:
+    for unit in ("GB", "MB", "KB"):
+        if size >= UNITS[unit]:
+            return f"{size / UNITS[unit]:g} {unit}"
+    return f"{size} B"
+
+
+def make_block(block_size: int = 1024 * 1024) -> bytes:
+    """Build a block of complete LSF objects roughly block_size bytes long."""
+    records = []
+    total = 0
+    i = 0
+    while total < block_size:
+        record = (
+            f"$o~tx{i}$r~$f~id$f~TX-{10000 + i}$r~$t~int$f~user_id$f~{i % 100}$r~"
+            f"$t~float$f~amount$f~{9.99 + i % 20}$r~$f~status$f~completed$r~"
+            f"$f~tags$f~a$l~b$l~c$r~\n"
+        )
+        records.append(record)
+        total += len(record)
+        i += 1
+    return "".join(records).encode("utf-8")
+
+
+class SyntheticLSF(io.RawIOBase):
+    """Read-only binary stream repeating a block of LSF objects up to `size` bytes."""
+
+    def __init__(self, size: int):
+        self._block = make_block()
+        self._remaining = size
+        self._offset = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._remaining <= 0:
+            return 0
+        block = self._block
+        count = min(len(buffer), self._remaining, len(block) - self._offset)
+        buffer[:count] = block[self._offset:self._offset + count]
+        self._offset = (self._offset + count) % len(block)
+        self._remaining -= count
+        return count
+
+
+def peak_rss_bytes() -> int:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_child(mode: str, size: int, chunk_size: int) -> Dict[str, float]:
+    """Decode one synthetic input in this process and report the measurements."""
+    baseline = peak_rss_bytes()
+    start = time.perf_counter()
+    objects = 0
+    if mode == "iterparse":
+        stream = io.BufferedReader(SyntheticLSF(size), buffer_size=chunk_size)
+        for _ in iterparse(stream, chunk_size=chunk_size):
+            objects += 1
+    else:
+        text = SyntheticLSF(size).read().decode("utf-8")
+        objects = len(from_lsf(text))
+    elapsed = time.perf_counter() - start
+    return {
+        "objects": objects,
+        "seconds": elapsed,
+        "baseline_rss": baseline,
+        "peak_rss": peak_rss_bytes(),
+    }
+
+
+def measure(mode: str, size: int, chunk_size: int) -> Dict[str, float]:
+    output = subprocess.check_output(
+        [sys.executable, "-m", "benchmarks.iterparse_memory",
+         "--child", mode, "--sizes", str(size), "--chunk-size", str(chunk_size)],
+    )
+    return json.loads(output)
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated input sizes (default: %(default)s)")
+    parser.add_argument("--chunk-size", type=int, default=64 * 1024, help="iterparse read size in bytes")
+    parser.add_argument("--from-lsf-max", default="100MB", help="largest size also decoded with from_lsf")
+    parser.add_argument("--child", choices=["iterparse", "from_lsf"], help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+    if args.child:
+        print(json.dumps(run_child(args.child, sizes[0], args.chunk_size)))
+        return
+
+    from_lsf_max = parse_size(args.from_lsf_max)
+    print("LSF iterparse Memory Benchmark")
+    print("==============================\n")
+    print("| Input      | Mode      |   Objects | Time (s) |   MB/s | Peak RSS (MB) | Above start (MB) |")
+    print("|------------|-----------|-----------|----------|--------|---------------|------------------|")
+    for size in sizes:
+        modes = ["iterparse"] + (["from_lsf"] if size <= from_lsf_max else [])
+        for mode in modes:
+            result = measure(mode, size, args.chunk_size)
+            growth = result["peak_rss"] - result["baseline_rss"]
+            print(
+                f"| {format_size(size):<10} | {mode:<9} | {result['objects']:>9} | "
+                f"{result['seconds']:>8.2f} | {size / UNITS['MB'] / result['seconds']:>6.1f} | "
+                f"{result['peak_rss'] / UNITS['MB']:>13.1f} | {growth / UNITS['MB']:>16.1f} |"
+            )
+    print("\nfrom_lsf counts distinct object names; iterparse counts every object.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+LSF to JSON Streaming Benchmark
+
+This script compares ``lsf_to_json`` (decode to dictionaries, then
+``json.dumps``) with the streaming ``iter_lsf_to_json`` and
+``dump_lsf_to_json`` on the same document, reporting time and peak
+Python memory for compact and indented output.
+
+Usage:
+    python -m benchmarks.json_streaming [objects]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+from lsf import to_lsf
+from lsf.conversion import lsf_to_json
+from lsf.json_stream import dump_lsf_to_json, iter_lsf_to_json
+
+ITERATIONS = 3
+
+
+def make_document(objects: int) -> str:
+    return to_lsf({
+        f"tx{i}": {
+            "id": f"TX-{10000 + i}",
+            "user_id": i % 100,
+            "amount": 9.99 + i % 20,
+            "status": "pending" if i % 10 == 0 else "completed",
+            "note": f"Payment for order {i} – ünïcode",
+            "tags": ["card", "online", "eu"],
+        }
+        for i in range(objects)
+    })
+
+
+def measure(func: Callable[[], object]) -> Tuple[float, int]:
+    """Best untraced time of several runs, then peak memory of a traced run."""
+    best = float("inf")
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def file_to_file(path: str, indent) -> None:
+    with open(path, "rb") as source, open(os.devnull, "w") as sink:
+        dump_lsf_to_json(source, sink, indent=indent)
+
+
+def main() -> None:
+    objects = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    document = make_document(objects)
+    fd, path = tempfile.mkstemp(suffix=".lsf")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(document)
+
+    try:
+        print("LSF to JSON Streaming Benchmark")
+        print("===============================\n")
+        print(f"Document: {len(document) / 1024 / 1024:.1f} MB, {objects} objects\n")
+        print("| Output   | Method                    | Time (s) | Speedup | Peak memory (MB) |")
+        print("|----------|---------------------------|----------|---------|------------------|")
+        for label, indent in (("compact", None), ("indent=2", 2)):
+            baseline, _ = measure(lambda: lsf_to_json(document, indent=indent))
+            for method, func in (
+                ("lsf_to_json", lambda: lsf_to_json(document, indent=indent)),
+                ("iter_lsf_to_json (str)", lambda: "".join(iter_lsf_to_json(document, indent=indent))),
+                ("dump_lsf_to_json (file)", lambda: file_to_file(path, indent)),
+            ):
+                elapsed, peak = measure(func)
+                print(
+                    f"| {label:<8} | {method:<25} | {elapsed:>8.3f} | {baseline / elapsed:>6.2f}x | "
+                    f"{peak / 1024 / 1024:>16.1f} |"
+                )
+        print("\nThe str variant joins the chunks, so its peak includes the whole JSON output;")
+        print("file-to-file conversion holds one chunk and one object at a time.")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""
+LSF Lazy Decoding Benchmark
+
+This script compares eager ``from_lsf`` with ``from_lsf(lazy=True)`` when a
+consumer reads only one or two named objects out of a response holding
+dozens of them.
+
+Usage:
+    python -m benchmarks.lazy_decoding
+"""
+
+import time
+from typing import Callable
+
+from lsf import from_lsf, to_lsf
+
+ITERATIONS = 50
+
+
+def make_response(objects: int, fields: int) -> str:
+    return to_lsf({
+        f"object{i}": {
+            **{f"field{j}": f"value {i}-{j}" for j in range(fields)},
+            **{f"count{j}": i * j for j in range(fields // 2)},
+            "tags": ["a", "b", "c"],
+        }
+        for i in range(objects)
+    })
+
+
+def average_time(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        func()
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+def read_two(data) -> None:
+    data["object0"]["field0"]
+    data["object7"]["count1"]
+
+
+def main() -> None:
+    print("LSF Lazy Decoding Benchmark")
+    print("===========================\n")
+    print("| Objects | Fields/object | Size (KB) | Eager, read 2 (ms) | Lazy, read 2 (ms) | Lazy, read all (ms) | Speedup |")
+    print("|---------|---------------|-----------|--------------------|-------------------|---------------------|---------|")
+    for objects, fields in ((24, 20), (48, 50), (96, 100)):
+        lsf_str = make_response(objects, fields)
+        eager = average_time(lambda: read_two(from_lsf(lsf_str)))
+        lazy = average_time(lambda: read_two(from_lsf(lsf_str, lazy=True)))
+        lazy_all = average_time(lambda: dict(from_lsf(lsf_str, lazy=True)))
+        print(
+            f"| {objects:>7} | {fields * 3 // 2 + 1:>13} | {len(lsf_str) / 1024:>9.1f} | {eager * 1000:>18.3f} | "
+            f"{lazy * 1000:>17.3f} | {lazy_all * 1000:>19.3f} | {eager / lazy:>6.1f}x |"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""
+LSF Parallel File Decoding Benchmark
+
+This script decodes one large LSF file with ``decode_file`` and with
+``decode_file_parallel`` on 1 to N worker processes, checking that the
+results are equal and reporting time and speedup. About a tenth of the
+objects repeat an earlier name, so the last-one-wins merge is exercised.
+
+Usage:
+    python -m benchmarks.parallel_file [size_in_MB] [max_workers]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from lsf.buffer_decoder import decode_file
+from lsf.parallel import decode_file_parallel
+
+
+def write_file(path: str, size: int) -> int:
+    """Write objects until size bytes are written; return the object count."""
+    written = 0
+    i = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < size:
+            name = f"user{i // 10}" if i % 10 == 9 else f"user{i}"
+            record = (
+                f"$o~{name}$r~$f~name$f~Üser {i}$r~$t~int$f~id$f~{i}$r~"
+                f"$f~tags$f~a$l~b$l~c$r~$f~bio$f~{'x' * 120}$r~$t~float$f~score$f~{i * 0.25}$r~\n"
+            )
+            f.write(record)
+            written += len(record.encode("utf-8"))
+            i += 1
+    return i
+
+
+def main() -> None:
+    size = int(float(sys.argv[1]) * 1024 * 1024) if len(sys.argv) > 1 else 100 * 1024 * 1024
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+
+    print("LSF Parallel File Decoding Benchmark")
+    print("====================================\n")
+
+    fd, path = tempfile.mkstemp(suffix=".lsf")
+    os.close(fd)
+    try:
+        count = write_file(path, size)
+        print(f"{count:,} objects, {size / 1024 / 1024:.0f} MB, {os.cpu_count()} CPUs\n")
+
+        start = time.perf_counter()
+        expected = decode_file(path)
+        baseline = time.perf_counter() - start
+
+        print("| Mode | Time (s) | MB/s | Speedup |")
+        print("|------|----------|------|---------|")
+        print(f"| decode_file | {baseline:8.2f} | {size / 1024 / 1024 / baseline:4.0f} | {1:6.2f}x |")
+        counts = sorted({2, max_workers, *(1 << i for i in range(max_workers.bit_length()) if 1 << i < max_workers)})
+        for workers in counts:
+            start = time.perf_counter()
+            result = decode_file_parallel(path, workers=workers)
+            elapsed = time.perf_counter() - start
+            assert result == expected and list(result) == list(expected)
+            del result
+            print(f"| decode_file_parallel workers={workers} | {elapsed:8.2f} | "
+                  f"{size / 1024 / 1024 / elapsed:4.0f} | {baseline / elapsed:6.2f}x |")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
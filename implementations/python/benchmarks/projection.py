@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+LSF Field Projection Benchmark
+
+This script compares a full ``from_lsf`` decode with
+``from_lsf(s, fields=...)`` selecting a growing share of each object's
+fields, on records that mix strings, lists, typed values and ``bin``
+payloads, and on the ``large`` data set flattened into top-level objects.
+
+Usage:
+    python -m benchmarks.projection [copies]
+"""
+
+import base64
+import sys
+import time
+from typing import Callable, Dict, List
+
+from lsf import from_lsf, to_lsf
+
+from .scenarios import flat_records
+
+OBJECTS = 5000
+FIELDS = 20
+ITERATIONS = 5
+
+
+def make_document() -> str:
+    records = []
+    blob = base64.b64encode(bytes(range(256)) * 4).decode("ascii")
+    for i in range(OBJECTS):
+        records.append(f"$o~item{i}$r~")
+        for j in range(FIELDS):
+            kind = j % 4
+            if kind == 0:
+                records.append(f"$f~text{j}$f~Some text value {i}-{j}$r~")
+            elif kind == 1:
+                records.append(f"$t~int$f~count{j}$f~{i * j}$r~")
+            elif kind == 2:
+                records.append(f"$f~tags{j}$f~alpha$l~beta$l~gamma$l~{i}$r~")
+            else:
+                records.append(f"$t~bin$f~blob{j}$f~{blob}$r~")
+    return "".join(records)
+
+
+def average_time(func: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(label: str, lsf_str: str, keys: Dict[str, List[str]]) -> None:
+    """Print projection times selecting the first fields of every object."""
+    width = max(map(len, keys.values()))
+    print(f"{label}: {len(keys)} objects, up to {width} fields, {len(lsf_str) / 1024 / 1024:.1f} MB\n")
+    full = average_time(lambda: from_lsf(lsf_str))
+    print("| Fields selected | Time (ms) | Share of full decode |")
+    print("|-----------------|-----------|----------------------|")
+    print(f"| all (no projection) | {full * 1000:9.1f} | {100:19.0f}% |")
+    for count in sorted({1, 2, width // 4, width // 2, width} - {0}):
+        # One list per distinct set of fields, shared by its objects
+        prefixes = {tuple(names): names[:count] for names in keys.values()}
+        selection = {name: prefixes[tuple(names)] for name, names in keys.items()}
+        elapsed = average_time(lambda: from_lsf(lsf_str, fields=selection))
+        print(f"| {count:>2}/{width} ({count * 100 // width:>3}%) | {elapsed * 1000:9.1f} "
+              f"| {elapsed / full * 100:19.0f}% |")
+
+    second = {names[1] for names in keys.values()}
+    predicate = lambda name, key: key in second
+    elapsed = average_time(lambda: from_lsf(lsf_str, fields=predicate))
+    print(f"| predicate, 1/{width} | {elapsed * 1000:9.1f} | {elapsed / full * 100:19.0f}% |\n")
+
+
+def main() -> None:
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    print("LSF Field Projection Benchmark")
+    print("==============================\n")
+    lsf_str = make_document()
+    fields = [f"{('text', 'count', 'tags', 'blob')[j % 4]}{j}" for j in range(FIELDS)]
+    report("Records with bin payloads", lsf_str, {f"item{i}": fields for i in range(OBJECTS)})
+
+    data = flat_records(copies)
+    report(f"large x{copies}", to_lsf(data), {name: list(values) for name, values in data.items()})
+
+
+if __name__ == "__main__":
+    main()
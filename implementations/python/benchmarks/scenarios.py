@@ -6,7 +6,9 @@ This module provides common test data scenarios for benchmarking LSF.
 """
 
 import datetime
-from typing import Dict, Any, List
+import json
+import random
+from typing import Dict, Any, List, Tuple
 
 # Sample scenarios that represent common use cases
 SCENARIOS = [
@@ -297,6 +299,88 @@ DATA_SETS = {
     })()
 }
 
+# Record groups of DATA_SETS["large"] whose objects share one shape
+RECORD_GROUPS = ("users", "products", "transactions")
+
+
+def flat_records(copies: int = 1) -> Dict[str, Dict[str, Any]]:
+    """
+    Flatten the record groups of DATA_SETS["large"] into top-level objects
+
+    Objects keep their names ("user1", "product3", "tx7", ...), so the object
+    type is the name without its trailing digits. Each copy renumbers the
+    names to stay unique.
+    """
+    data = DATA_SETS["large"]
+    records = {}
+    for copy in range(copies):
+        for group in RECORD_GROUPS:
+            size = len(data[group])
+            for name, fields in data[group].items():
+                prefix = name.rstrip("0123456789")
+                records[f"{prefix}{int(name[len(prefix):]) + copy * size}"] = fields
+    return records
+
+
+LIPSUM = (
+    "Lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua"
+).split()
+
+
+def v3_value(value: Any) -> str:
+    """Encode one value as LSF 3.0 $v~ tokens with a type hint, like the C# LSFEncoder."""
+    if value is None:
+        return "$v~$t~z"
+    if isinstance(value, bool):
+        return f"$v~{'true' if value else 'false'}$t~b"
+    if isinstance(value, (int, float)):
+        return f"$v~{value!r}$t~n"
+    if isinstance(value, list):
+        return "".join(v3_value(item) for item in value)
+    return f"$v~{value}"
+
+
+def v3_document(objects: Dict[str, Dict[str, Any]]) -> bytes:
+    """Encode flat objects as an LSF 3.0 document in UTF-8."""
+    parts = []
+    for name, fields in objects.items():
+        parts.append(f"$o~{name}")
+        for key, value in fields.items():
+            parts.append(f"$f~{key}")
+            parts.append(v3_value(value))
+    return "".join(parts).encode("utf-8")
+
+
+def v3_dataset(objects: int = 1000, fields: int = 10, seed: int = 42) -> Tuple[bytes, bytes]:
+    """
+    Build a flat data set in the shape of the C# benchmark's medium data set
+
+    Returns:
+        The same objects as (LSF 3.0 bytes, JSON bytes)
+    """
+    rng = random.Random(seed)
+    data = {}
+    for i in range(objects):
+        record = {}
+        for j in range(fields):
+            kind = j % 6
+            if kind == 0:
+                record[f"Index_{j}"] = i * fields + j
+            elif kind == 1:
+                record[f"Value_{j}"] = rng.random() * 1000
+            elif kind == 2:
+                record[f"IsEnabled_{j}"] = (i + j) % 2 == 0
+            elif kind == 3:
+                record[f"Notes_{j}"] = f"Note for item {i}: " + " ".join(rng.sample(LIPSUM, 10))
+            elif kind == 4:
+                record[f"SubItems_{j}"] = [rng.randrange(10000) for _ in range(5)] + [None, rng.choice(LIPSUM)]
+            else:
+                record[f"Missing_{j}"] = None
+        data[f"item{i}"] = record
+    return v3_document(data), json.dumps(data).encode("utf-8")
+
+
 # Token estimation function (common utility for benchmarks)
 def estimate_tokens(text: str) -> int:
     """Estimate the number of tokens in a string (roughly 4 chars = 1 token)."""
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+LSF Schema Decoding Benchmark
+
+This script compares the generic dict-building decoders with
+``SchemaLSFDecoder`` building slotted record classes or tuples, on the
+users, products and transactions of the ``large`` data set flattened into
+top-level objects. It reports decode time and the memory held per record.
+
+Usage:
+    python -m benchmarks.schema_decoding [copies]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+from lsf import BulkLSFDecoder, from_lsf, to_lsf
+from lsf.schema import SchemaLSFDecoder
+
+from .scenarios import flat_records
+
+ITERATIONS = 20
+
+SCHEMAS = {
+    "user": {
+        "id": "int", "name": "str", "email": "str", "active": "bool",
+        "created_at": "str", "last_login": "str", "permissions": "list",
+    },
+    "product": {
+        "id": "int", "name": "str", "price": "float", "stock": "int",
+        "categories": "list", "features": "list",
+    },
+    "tx": {
+        "id": "str", "user_id": "int", "product_id": "int", "amount": "float",
+        "date": "str", "status": "str",
+    },
+}
+
+
+def schema_decoder(as_tuple: bool) -> SchemaLSFDecoder:
+    decoder = SchemaLSFDecoder(type_of=lambda name: name.rstrip("0123456789"))
+    for object_type, fields in SCHEMAS.items():
+        decoder.register(object_type, fields, as_tuple=as_tuple)
+    return decoder
+
+
+def measure(decode: Callable[[], dict]) -> Tuple[float, int]:
+    """Return the best decode time and the bytes held by the result."""
+    best = float("inf")
+    for _ in range(ITERATIONS):
+        gc.collect()
+        start = time.perf_counter()
+        decode()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    result = decode()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best, held
+
+
+def main() -> None:
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    lsf_str = to_lsf(flat_records(copies))
+    records = lsf_str.count("$o~")
+    slots = schema_decoder(as_tuple=False)
+    tuples = schema_decoder(as_tuple=True)
+    bulk = BulkLSFDecoder()
+
+    print("LSF Schema Decoding Benchmark")
+    print("=============================\n")
+    print(f"{records} records, {len(lsf_str) / 1024 / 1024:.1f} MB\n")
+    print("| Decoder | Time (ms) | Speedup | Bytes per record | Memory saved |")
+    print("|---------|-----------|---------|------------------|--------------|")
+    rows = (
+        ("from_lsf (dicts)", lambda: from_lsf(lsf_str)),
+        ("BulkLSFDecoder (dicts)", lambda: bulk.decode(lsf_str)),
+        ("SchemaLSFDecoder (slots)", lambda: slots.decode(lsf_str)),
+        ("SchemaLSFDecoder (tuples)", lambda: tuples.decode(lsf_str)),
+    )
+    baseline = None
+    for label, decode in rows:
+        elapsed, held = measure(decode)
+        if baseline is None:
+            baseline = (elapsed, held)
+        print(
+            f"| {label} | {elapsed * 1000:9.1f} | {baseline[0] / elapsed:6.2f}x | "
+            f"{held / records:16.0f} | {(1 - held / baseline[1]) * 100:11.0f}% |"
+        )
+
+
+if __name__ == "__main__":
+    main()
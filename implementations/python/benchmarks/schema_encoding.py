@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""
+LSF Schema Encoding Benchmark
+
+This script encodes the users, products and transactions of the ``large``
+data set, flattened into top-level objects, with ``to_lsf`` and with a
+``SchemaLSFEncoder`` holding the same schemas as the schema decoding
+benchmark, checks that both write the same text and reports encode time
+and throughput.
+
+Usage:
+    python -m benchmarks.schema_encoding [copies]
+"""
+
+import gc
+import sys
+import time
+from typing import Callable
+
+from lsf import to_lsf
+from lsf.schema import SchemaLSFEncoder
+
+from .scenarios import flat_records
+from .schema_decoding import SCHEMAS
+
+ITERATIONS = 20
+
+
+def measure(encode: Callable[[], str]) -> float:
+    """Return the best encode time."""
+    best = float("inf")
+    for _ in range(ITERATIONS):
+        gc.collect()
+        start = time.perf_counter()
+        encode()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    data = flat_records(copies)
+    encoder = SchemaLSFEncoder(type_of=lambda name: name.rstrip("0123456789"))
+    for object_type, fields in SCHEMAS.items():
+        encoder.register(object_type, fields)
+    lsf_str = to_lsf(data)
+    assert encoder.encode(data) == lsf_str
+
+    print("LSF Schema Encoding Benchmark")
+    print("=============================\n")
+    print(f"{len(data)} records, {len(lsf_str) / 1024 / 1024:.1f} MB\n")
+    print("| Encoder | Time (ms) | MB/s | Speedup |")
+    print("|---------|-----------|------|---------|")
+    baseline = None
+    for label, encode in (
+        ("to_lsf", lambda: to_lsf(data)),
+        ("SchemaLSFEncoder", lambda: encoder.encode(data)),
+    ):
+        elapsed = measure(encode)
+        if baseline is None:
+            baseline = elapsed
+        print(f"| {label} | {elapsed * 1000:9.1f} | {len(lsf_str) / 1024 / 1024 / elapsed:4.0f} "
+              f"| {baseline / elapsed:6.2f}x |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+LSF Streaming Encoder Benchmark
+
+This script encodes generated transaction objects to a file of growing
+size, once by building the whole document with ``to_string()`` and
+writing it, and once with ``LSFEncoder(sink=f)`` writing through as it
+goes, committing a transaction every 1000 objects. It reports the best
+time of three runs and, from a separate run, peak traced memory for each,
+which stays flat for the sink-bound encoder.
+
+Usage:
+    python -m benchmarks.streaming_encoder [sizes_in_MB]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+from lsf import LSFEncoder
+
+# Bytes of LSF text written per object, roughly
+OBJECT_SIZE = 150
+
+
+def encode(encoder: LSFEncoder, objects: int) -> LSFEncoder:
+    for i in range(objects):
+        (encoder.start_object(f"tx{i}")
+         .add_field("id", f"TX-{i:08d}")
+         .add_typed_field("amount", i * 0.25, "float")
+         .add_typed_field("settled", i % 3 == 0, "bool")
+         .add_field("currency", "EUR")
+         .add_list("tags", ["card", "online"]))
+        if i % 1000 == 999:
+            encoder.end_transaction()
+    return encoder.end_transaction()
+
+
+def measure(func: Callable[[], None]) -> tuple:
+    """Return (best seconds, peak bytes); tracing is kept out of the timed runs."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def main() -> None:
+    sizes = [float(size) for size in sys.argv[1].split(",")] if len(sys.argv) > 1 else [10, 50, 100]
+    fd, path = tempfile.mkstemp(suffix=".lsf")
+    os.close(fd)
+
+    def to_string(objects: int) -> None:
+        text = encode(LSFEncoder(), objects).to_string()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def to_sink(objects: int) -> None:
+        with open(path, "wb") as f:
+            encode(LSFEncoder(sink=f), objects)
+
+    print("LSF Streaming Encoder Benchmark")
+    print("===============================\n")
+    print("| Output (MB) | to_string() (s) | Peak (MB) | sink (s) | Peak (MB) |")
+    print("|-------------|-----------------|-----------|----------|-----------|")
+    try:
+        for size in sizes:
+            objects = int(size * 1024 * 1024 / OBJECT_SIZE)
+            whole, whole_peak = measure(lambda: to_string(objects))
+            written = os.path.getsize(path)
+            streamed, streamed_peak = measure(lambda: to_sink(objects))
+            assert os.path.getsize(path) == written
+            print(f"| {written / 1024 / 1024:11.0f} | {whole:15.2f} | {whole_peak / 1024 / 1024:9.1f} "
+                  f"| {streamed:8.2f} | {streamed_peak / 1024 / 1024:9.2f} |")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+LSF 3.0 TokenScanner Benchmark
+
+This script measures the throughput of ``lsf.v3.TokenScanner`` in MB/s on
+flat LSF 3.0 data sets, next to ``json.loads`` on the same objects encoded
+as JSON.
+
+Usage:
+    python -m benchmarks.token_scanner [objects]
+"""
+
+import json
+import sys
+import time
+from typing import Callable
+
+from lsf.v3 import TokenScanner
+from benchmarks.scenarios import v3_dataset
+
+ITERATIONS = 5
+
+
+def best_time(func: Callable[[], object], iterations: int = ITERATIONS) -> float:
+    best = float("inf")
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    sizes = [int(sys.argv[1])] if len(sys.argv) > 1 else [100, 10000, 100000]
+    scanner = TokenScanner()
+
+    print("LSF 3.0 TokenScanner Benchmark")
+    print("==============================\n")
+    print("| Objects | LSF size (MB) | Tokens    | Scan (MB/s) | JSON size (MB) | json.loads (MB/s) | Bytes/token |")
+    print("|---------|---------------|-----------|-------------|----------------|-------------------|-------------|")
+    for objects in sizes:
+        lsf_bytes, json_bytes = v3_dataset(objects)
+        result = scanner.scan(lsf_bytes)
+        table_bytes = (result.types.itemsize + result.positions.itemsize) * result.count
+        scan_time = best_time(lambda: scanner.scan(lsf_bytes))
+        json_time = best_time(lambda: json.loads(json_bytes))
+        lsf_mb = len(lsf_bytes) / 1024 / 1024
+        json_mb = len(json_bytes) / 1024 / 1024
+        print(
+            f"| {objects:>7} | {lsf_mb:>13.2f} | {result.count:>9} | {lsf_mb / scan_time:>11.1f} | "
+            f"{json_mb:>14.2f} | {json_mb / json_time:>17.1f} | {table_bytes / result.count:>11.1f} |"
+        )
+    print("\nThe scanner only locates tokens; json.loads also builds the Python objects.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+LSF Typed List Benchmark
+
+This script encodes and decodes numeric lists of 100,000 elements as string
+lists (``add_list(key, values)`` followed by a per-element conversion) and
+as typed lists (``add_list(key, values, type_hint=...)``, decoded in one
+bulk conversion to ``array('d')`` or ``array('q')``). When NumPy is
+installed it also times wrapping the decoded array with
+``numpy.frombuffer``. "Held" is the memory taken by the decoded list.
+
+Usage:
+    python -m benchmarks.typed_lists [elements]
+"""
+
+import random
+import sys
+import tracemalloc
+import time
+from typing import Callable
+
+from lsf import LSFEncoder, from_lsf
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+ITERATIONS = 5
+
+
+def best_of(func: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def held(func: Callable[[], object]) -> int:
+    """Bytes still allocated by the value func returns."""
+    tracemalloc.start()
+    value = func()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del value
+    return size
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = random.Random(42)
+    lists = {
+        "float": [rng.gauss(0, 1) for _ in range(count)],
+        "int": [rng.randrange(-10**12, 10**12) for _ in range(count)],
+    }
+
+    print("LSF Typed List Benchmark")
+    print("========================\n")
+    print(f"{count:,} elements per list, best of {ITERATIONS}\n")
+    print("| List | Mode | Encode (ms) | Decode (ms) | Size (KB) | Held (KB) |")
+    print("|------|------|-------------|-------------|-----------|-----------|")
+
+    for type_hint, values in lists.items():
+        convert = float if type_hint == "float" else int
+
+        def encode_untyped() -> str:
+            return LSFEncoder().start_object("v").add_list("x", values).to_string()
+
+        def encode_typed() -> str:
+            return LSFEncoder().start_object("v").add_list("x", values, type_hint=type_hint).to_string()
+
+        untyped = encode_untyped()
+        typed = encode_typed()
+        decoded = from_lsf(typed)["v"]["x"]
+        assert list(decoded) == [convert(x) for x in from_lsf(untyped)["v"]["x"]] == values
+
+        rows = [
+            ("strings + per-element conversion", encode_untyped,
+             lambda: [convert(x) for x in from_lsf(untyped)["v"]["x"]], untyped),
+            (f"typed ({decoded.typecode} array)", encode_typed, lambda: from_lsf(typed)["v"]["x"], typed),
+        ]
+        if numpy is not None:
+            dtype = numpy.float64 if type_hint == "float" else numpy.int64
+            rows.append(("typed + numpy.frombuffer", encode_typed,
+                         lambda: numpy.frombuffer(from_lsf(typed)["v"]["x"], dtype=dtype), typed))
+        for label, encode, decode, text in rows:
+            print(f"| {type_hint} | {label} | {best_of(encode) * 1000:11.1f} | {best_of(decode) * 1000:11.1f} | "
+                  f"{len(text.encode('utf-8')) / 1024:9.0f} | {held(decode) / 1024:9.0f} |")
+
+
+if __name__ == "__main__":
+    main()
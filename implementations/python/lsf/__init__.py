@@ -5,18 +5,88 @@ A structured, flat serialization format designed specifically for maximum
 reliability when used with Large Language Models (LLMs).
 """
 
+import importlib
+
 from .encoder import LSFEncoder
 from .decoder import LSFDecoder
-from .simple import to_lsf, from_lsf
+from .bulk_decoder import BulkLSFDecoder
+from .binary import LazyBinary, decode_base64_into, iter_base64
+from .buffer_decoder import BufferLSFDecoder, decode_buffer, decode_file
+from .incremental import IncrementalLSFDecoder, LSFEvent, iterparse
+from .engines import available_engines, register_engine
+from .lazy import LazyLSFMapping
+from .schema import SchemaLSFDecoder, SchemaLSFEncoder, make_record_class
+from .columnar import ColumnarLSFDecoder, LSFTable, decode_columns
+from .intern import InternTable, InterningLSFDecoder
+from .index import IndexedLSFFile, LSFIndex
+from .simple import to_lsf, from_lsf, iter_encode, encode_to_bytes
 from .conversion import lsf_to_json, lsf_to_json_pretty
+from .json_stream import dump_lsf_to_json, iter_lsf_to_json
 
 __version__ = "1.2.0"
 
+# Names whose modules import asyncio or concurrent.futures, which take
+# longer to import than the rest of the package; they are imported on first
+# access instead
+_LAZY_NAMES = {
+    "aiter_objects": ".aio",
+    "DecodeResult": ".parallel",
+    "decode_many": ".parallel",
+    "decode_file_parallel": ".parallel",
+    "iter_decode_many": ".parallel",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_NAMES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_NAMES))
+
+
 __all__ = [
     "LSFEncoder", 
     "LSFDecoder", 
-    "to_lsf", 
+    "BulkLSFDecoder",
+    "BufferLSFDecoder",
+    "decode_buffer",
+    "decode_file",
+    "LazyBinary",
+    "iter_base64",
+    "decode_base64_into",
+    "IncrementalLSFDecoder",
+    "LSFEvent",
+    "iterparse",
+    "aiter_objects",
+    "available_engines",
+    "register_engine",
+    "LazyLSFMapping",
+    "SchemaLSFDecoder",
+    "SchemaLSFEncoder",
+    "make_record_class",
+    "ColumnarLSFDecoder",
+    "LSFTable",
+    "decode_columns",
+    "InternTable",
+    "InterningLSFDecoder",
+    "LSFIndex",
+    "IndexedLSFFile",
+    "to_lsf",
+    "iter_encode",
+    "encode_to_bytes",
     "from_lsf",
+    "DecodeResult",
+    "decode_many",
+    "decode_file_parallel",
+    "iter_decode_many",
     "lsf_to_json",
-    "lsf_to_json_pretty"
+    "lsf_to_json_pretty",
+    "iter_lsf_to_json",
+    "dump_lsf_to_json"
 ] 
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Asyncio LSF decoding
+
+This module decodes LSF (LLM-Safe Format) arriving on an asyncio stream,
+such as the body of a chunked HTTP response, yielding each object as soon as
+it is complete without holding up the event loop on large chunks.
+"""
+
+import asyncio
+import codecs
+from concurrent.futures import Executor
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from .incremental import DEFAULT_CHUNK_SIZE, IncrementalLSFDecoder, LSFEvent
+
+# Most characters (or bytes) parsed before control returns to the event loop
+DEFAULT_SLICE_SIZE = 64 * 1024
+
+# Chunks at least this large are parsed in the executor, when one is given
+DEFAULT_OFFLOAD_SIZE = 1024 * 1024
+
+# Events yielded from an offloaded chunk between returns to the event loop
+_EVENTS_PER_SLICE = 1024
+
+Chunk = Union[str, bytes]
+
+
+async def _read_chunks(source: Any, read_size: int) -> AsyncIterator[Chunk]:
+    if hasattr(source, "read"):
+        # StreamReader iterates over lines, which may be unbounded; read
+        # fixed-size chunks instead
+        while True:
+            chunk = await source.read(read_size)
+            if not chunk:
+                return
+            yield chunk
+    elif hasattr(source, "__aiter__"):
+        async for chunk in source:
+            yield chunk
+    else:
+        raise TypeError("source must be an asyncio.StreamReader or an async iterable of str or bytes")
+
+
+def _feed(decoder: IncrementalLSFDecoder, text_decoder: Optional[codecs.IncrementalDecoder],
+          chunk: Chunk) -> List[LSFEvent]:
+    if text_decoder is not None:
+        chunk = text_decoder.decode(chunk)
+    return decoder.feed(chunk) if chunk else []
+
+
+def _feed_slices(decoder: IncrementalLSFDecoder, text_decoder: Optional[codecs.IncrementalDecoder],
+                 chunk: Chunk, slice_size: int) -> List[LSFEvent]:
+    # Short calls into C let the interpreter switch back to the event loop's
+    # thread, which one long str.split() over the whole chunk would not
+    events = []
+    for start in range(0, len(chunk), slice_size):
+        events += _feed(decoder, text_decoder, chunk[start:start + slice_size])
+    return events
+
+
+async def aiter_objects(
+    source: Union[asyncio.StreamReader, AsyncIterable[Chunk]],
+    slice_size: int = DEFAULT_SLICE_SIZE,
+    encoding: str = "utf-8",
+    executor: Optional[Executor] = None,
+    offload_size: int = DEFAULT_OFFLOAD_SIZE,
+    read_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Iterate over the objects of an asynchronous LSF stream
+
+    Each object is yielded as soon as the next ``$o~`` record (or the end of
+    the stream) shows it is complete, then forgotten, with the same rules as
+    iterparse(). Chunks longer than ``slice_size`` are parsed one slice at a
+    time, returning to the event loop between slices. With an ``executor``,
+    chunks of at least ``offload_size`` are parsed there instead, up to
+    ``offload_size`` per call; it must be a thread pool, as the decoder state
+    stays in this process.
+
+    Args:
+        source: An asyncio.StreamReader, read ``read_size`` bytes at a time,
+            or an async iterable of str or bytes chunks
+        slice_size: Most characters (or bytes) parsed between returns to the
+            event loop
+        encoding: Encoding used to decode bytes
+        executor: Thread pool for parsing very large chunks (default: parse
+            every chunk on the event loop, in slices)
+        offload_size: Smallest chunk parsed in the executor
+        read_size: Number of bytes requested per StreamReader.read()
+
+    Returns:
+        Async iterator of (object_name, fields_dict) pairs in document order
+
+    Raises:
+        ValueError: If slice_size or read_size is not positive
+        TypeError: If source is neither a StreamReader nor an async iterable
+
+    Example:
+        >>> reader, writer = await asyncio.open_connection(host, port)
+        >>> async for name, fields in aiter_objects(reader):
+        ...     await handle(name, fields)
+    """
+    if slice_size <= 0:
+        raise ValueError("slice_size must be positive")
+    if read_size <= 0:
+        raise ValueError("read_size must be positive")
+    loop = asyncio.get_running_loop()
+    decoder = IncrementalLSFDecoder(keep_result=False)
+    text_decoder = None
+
+    async for chunk in _read_chunks(source, read_size):
+        if text_decoder is None and not isinstance(chunk, str):
+            text_decoder = codecs.getincrementaldecoder(encoding)()
+        size = len(chunk)
+        if executor is not None and size >= offload_size:
+            # Hand over offload_size at a time so the events waiting to be
+            # yielded stay bounded
+            for start in range(0, size, offload_size):
+                events = await loop.run_in_executor(
+                    executor, _feed_slices, decoder, text_decoder, chunk[start:start + offload_size], slice_size)
+                for position, event in enumerate(events, 1):
+                    if event.kind == "object":
+                        yield event.object, event.value
+                    if position % _EVENTS_PER_SLICE == 0:
+                        await asyncio.sleep(0)
+            continue
+
+        for start in range(0, size, slice_size):
+            if start:
+                await asyncio.sleep(0)
+            for event in _feed(decoder, text_decoder, chunk[start:start + slice_size]):
+                if event.kind == "object":
+                    yield event.object, event.value
+
+    events = []
+    if text_decoder is not None:
+        events = _feed(decoder, None, text_decoder.decode(b"", final=True))
+    events += decoder.close()
+    for event in events:
+        if event.kind == "object":
+            yield event.object, event.value
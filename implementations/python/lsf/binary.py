@@ -0,0 +1,236 @@
+"""
+Streaming base64 for LSF bin fields
+
+This module encodes and decodes the base64 payload of LSF (LLM-Safe Format)
+``bin`` fields in fixed-size chunks, between byte buffers or files and a
+sink, so that a large attachment is never held as one base64 string and one
+decoded copy at the same time.
+"""
+
+import binascii
+import mmap
+import re
+from contextlib import contextmanager
+from typing import IO, Any, Iterator, Optional, Union
+
+# Raw bytes per chunk; a multiple of 3 so chunks concatenate to the same
+# base64 as the whole payload (1 MiB of base64 text)
+BIN_CHUNK_SIZE = 3 * 256 * 1024
+
+# Base64 as written by b64encode: no line breaks, padding only at the end
+_CANONICAL = re.compile(r"[A-Za-z0-9+/]*={0,2}")
+_CANONICAL_BYTES = re.compile(rb"[A-Za-z0-9+/]*={0,2}")
+
+BinarySource = Union[bytes, bytearray, memoryview, IO[bytes]]
+BinarySink = Union[bytearray, memoryview, IO[bytes]]
+
+
+def iter_base64(source: BinarySource, chunk_size: int = BIN_CHUNK_SIZE,
+                binary: bool = False) -> Iterator[Union[str, bytes]]:
+    """
+    Base64-encode bytes or a binary file in chunks
+
+    The chunks joined together equal ``base64.b64encode(data).decode()``.
+
+    Args:
+        source: A bytes-like object, or a binary file object read in chunks
+        chunk_size: Raw bytes encoded per chunk, rounded down to a multiple of 3
+        binary: Yield the chunks as bytes rather than str
+
+    Returns:
+        Iterator of ASCII str chunks, or bytes chunks with ``binary=True``
+    """
+    step = max(chunk_size - chunk_size % 3, 3)
+    if binary:
+        encode = _b2a_base64
+    else:
+        encode = _b2a_base64_str
+    if hasattr(source, "read"):
+        carry = b""
+        while True:
+            data = source.read(step)
+            if not data:
+                break
+            if carry:
+                data = carry + data
+            # Reads may come back short; keep whole groups of 3 bytes
+            cut = len(data) - len(data) % 3
+            carry = data[cut:]
+            if cut:
+                with memoryview(data) as view:
+                    yield encode(view[:cut])
+        if carry:
+            yield encode(carry)
+        return
+
+    with memoryview(source) as view:
+        if view.ndim != 1 or view.itemsize != 1:
+            view = view.cast("B")
+        for start in range(0, len(view), step):
+            yield encode(view[start:start + step])
+
+
+def _b2a_base64(data: Union[bytes, memoryview]) -> bytes:
+    return binascii.b2a_base64(data, newline=False)
+
+
+def _b2a_base64_str(data: Union[bytes, memoryview]) -> str:
+    return binascii.b2a_base64(data, newline=False).decode("ascii")
+
+
+def _is_canonical(encoded: Union[str, bytes, memoryview]) -> bool:
+    pattern = _CANONICAL if isinstance(encoded, str) else _CANONICAL_BYTES
+    return len(encoded) % 4 == 0 and pattern.fullmatch(encoded) is not None
+
+
+def _write(sink: BinarySink, offset: int, data: bytes) -> int:
+    if isinstance(sink, bytearray):
+        sink += data
+    elif isinstance(sink, memoryview):
+        if offset + len(data) > len(sink):
+            raise ValueError("memoryview sink is too small for the decoded data")
+        sink[offset:offset + len(data)] = data
+    else:
+        sink.write(data)
+    return len(data)
+
+
+def decode_base64_into(encoded: Union[str, bytes, memoryview], sink: BinarySink,
+                       chunk_size: int = BIN_CHUNK_SIZE) -> int:
+    """
+    Base64-decode into a sink in chunks
+
+    Base64 as written by the encoder is decoded one chunk at a time; any
+    other input (line breaks, stray characters) is decoded in one call, so
+    the result and errors always match ``base64.b64decode``.
+
+    Args:
+        encoded: ASCII str or bytes-like object holding base64
+        sink: A bytearray to append to, a writable memoryview to fill from
+            its start, or a binary file object to write to
+        chunk_size: Base64 characters decoded per chunk, rounded down to a
+            multiple of 4
+
+    Returns:
+        Number of bytes written
+
+    Raises:
+        binascii.Error: If the input is not valid base64
+        ValueError: If the input is a non-ASCII str or a memoryview sink is
+            too small
+    """
+    if not _is_canonical(encoded):
+        return _write(sink, 0, binascii.a2b_base64(encoded))
+    step = max(chunk_size - chunk_size % 4, 4)
+    written = 0
+    for start in range(0, len(encoded), step):
+        written += _write(sink, written, binascii.a2b_base64(encoded[start:start + step]))
+    return written
+
+
+class LazyBinary:
+    """
+    Value of a bin field that is base64-decoded on first access
+
+    It holds the base64 text, or only the position of the text in a file,
+    and decodes it when ``value`` (or ``bytes()``) is first read; the result
+    is cached. ``write_to()`` streams the decoded bytes to a sink without
+    caching them. Invalid base64 raises on access rather than while
+    decoding the document.
+
+    Example:
+        >>> data = decode_file("mail.lsf", lazy_bin=True)
+        >>> with open("attachment.pdf", "wb") as f:
+        ...     data["mail"]["attachment"].write_to(f)
+    """
+
+    __slots__ = ("_encoded", "_path", "_start", "_end", "_value")
+
+    def __init__(self, encoded: Union[str, bytes]):
+        """
+        Args:
+            encoded: The base64 text of the field
+        """
+        self._encoded = encoded
+        self._path: Optional[str] = None
+        self._start = 0
+        self._end = len(encoded)
+        self._value: Optional[bytes] = None
+
+    @classmethod
+    def from_file(cls, path: str, start: int, end: int) -> "LazyBinary":
+        """
+        Refer to base64 text stored in a file, which is mapped on access
+
+        Args:
+            path: Path of the file
+            start: Offset of the first base64 byte
+            end: Offset just past the last base64 byte
+        """
+        lazy = cls(b"")
+        lazy._encoded = None
+        lazy._path = path
+        lazy._start = start
+        lazy._end = end
+        return lazy
+
+    @contextmanager
+    def _open(self) -> Iterator[Union[str, bytes, memoryview]]:
+        if self._path is None:
+            yield self._encoded
+            return
+        if self._start == self._end:
+            yield b""
+            return
+        with open(self._path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view, view[self._start:self._end] as encoded:
+                    yield encoded
+
+    @property
+    def value(self) -> bytes:
+        """The decoded bytes."""
+        if self._value is None:
+            with self._open() as encoded:
+                self._value = binascii.a2b_base64(encoded)
+        return self._value
+
+    def write_to(self, sink: BinarySink, chunk_size: int = BIN_CHUNK_SIZE) -> int:
+        """
+        Decode into a sink in chunks (see decode_base64_into)
+
+        Returns:
+            Number of bytes written
+        """
+        if self._value is not None:
+            return _write(sink, 0, self._value)
+        with self._open() as encoded:
+            return decode_base64_into(encoded, sink, chunk_size)
+
+    def __len__(self) -> int:
+        if self._value is None:
+            with self._open() as encoded:
+                if _is_canonical(encoded):
+                    padding = 0
+                    if encoded[-2:] in ("==", b"=="):
+                        padding = 2
+                    elif encoded[-1:] in ("=", b"="):
+                        padding = 1
+                    return len(encoded) // 4 * 3 - padding
+        return len(self.value)
+
+    def __bytes__(self) -> bytes:
+        return self.value
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyBinary):
+            return self.value == other.value
+        if isinstance(other, (bytes, bytearray, memoryview)):
+            return self.value == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        state = "decoded" if self._value is not None else "not decoded"
+        return f"<{type(self).__name__} of {self._end - self._start} base64 characters, {state}>"
@@ -0,0 +1,253 @@
+"""
+Buffer LSF Decoder for Python
+
+This module provides a decoder for LSF (LLM-Safe Format) that works directly
+on ``bytes``, ``bytearray``, ``memoryview`` and ``mmap`` objects holding
+UTF-8 text, without first decoding the whole input to a ``str``.
+"""
+
+import binascii
+import mmap
+import os
+import re
+from typing import Any, Dict, Optional, Union
+
+from .binary import LazyBinary
+from .bulk_decoder import BulkLSFDecoder, TYPE_CONVERTERS
+
+
+# One UTF-8 encoded character that str.isspace() accepts: the ASCII
+# whitespace, U+001C-U+001F, U+0085, U+00A0, U+1680, U+2000-U+200A, U+2028,
+# U+2029, U+202F, U+205F and U+3000 (checked against str.isspace() by the
+# tests, so a new Unicode version cannot change it unnoticed)
+_WS = (
+    rb"(?:[\t\n\x0b\x0c\r\x1c-\x1f ]|\xc2[\x85\xa0]|\xe1\x9a\x80"
+    rb"|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]|\xe2\x81\x9f|\xe3\x80\x80)"
+)
+# A record terminator together with the whitespace skipped after it
+_RECORD_END = re.compile(rb"\$r~" + _WS + b"*")
+_LEADING_WS = re.compile(_WS)
+_FIELD_SEP = re.compile(rb"\$f~")
+# Bytes copied at a time when checking that a bin value is ASCII
+_ASCII_CHECK_SIZE = 1 << 20
+
+_DOLLAR = ord("$")
+_TILDE = ord("~")
+_TAG_FIELD = ord("f")
+_TAG_TYPED = ord("t")
+_TAG_OBJECT = ord("o")
+_TAG_ERROR = ord("e")
+
+BufferLike = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+def _is_ascii(view: memoryview, start: int, end: int) -> bool:
+    # bytes.isascii() on bounded copies is several times faster than a
+    # regex search for a non-ASCII byte
+    for pos in range(start, end, _ASCII_CHECK_SIZE):
+        if not bytes(view[pos:min(pos + _ASCII_CHECK_SIZE, end)]).isascii():
+            return False
+    return True
+
+_LAZY_TYPE_CONVERTERS = {**TYPE_CONVERTERS, "bin": LazyBinary}
+
+
+class BufferLSFDecoder(BulkLSFDecoder):
+    """
+    Decoder for LSF (LLM-Safe Format) held in a byte buffer
+
+    Markers are located with byte-level regex searches directly on the
+    buffer, and only the object names, keys and values that end up in the
+    result are decoded from UTF-8. ``bin`` payloads are base64-decoded
+    straight from the buffer. Peak memory is therefore close to the size of
+    the decoded objects, even for memory-mapped files far larger than RAM.
+
+    ``str`` input is decoded exactly like BulkLSFDecoder. For UTF-8 input the
+    result and errors are identical to ``LSFDecoder.decode(data.decode())``.
+
+    With ``lazy_bin``, ``bin`` fields are returned as LazyBinary values that
+    are only base64-decoded when accessed, and invalid base64 is reported
+    then instead of in get_errors().
+    """
+
+    def __init__(self, errors: str = "strict", lazy_bin: bool = False):
+        """
+        Args:
+            errors: How to handle invalid UTF-8 in decoded slices, as for
+                ``bytes.decode``
+            lazy_bin: Return bin fields as LazyBinary instead of bytes
+        """
+        super().__init__()
+        self._unicode_errors = errors
+        self._lazy_bin = lazy_bin
+        # Set by decode_file() so lazy values refer to the file, not a copy
+        self._path: Optional[str] = None
+        if lazy_bin:
+            self._converters = _LAZY_TYPE_CONVERTERS
+
+    def decode(self, data: Union[str, BufferLike]) -> Dict[str, Dict[str, Any]]:
+        """
+        Decode LSF from a string or a UTF-8 byte buffer
+
+        Args:
+            data: str, bytes, bytearray, memoryview or mmap holding LSF
+
+        Returns:
+            Dictionary representing the parsed data
+
+        Example:
+            >>> decoder = BufferLSFDecoder()
+            >>> decoder.decode(b"$o~user$r~$f~id$f~123$r~$f~name$f~John$r~")
+            {'user': {'id': '123', 'name': 'John'}}
+        """
+        if isinstance(data, str):
+            return super().decode(data)
+        with memoryview(data) as view:
+            if view.ndim != 1 or view.itemsize != 1:
+                view = view.cast("B")
+            try:
+                return self._decode_view(view)
+            finally:
+                view.release()
+
+    def _decode_view(self, view: memoryview) -> Dict[str, Dict[str, Any]]:
+        self._errors = errors = []
+        result = {}
+        fields = None
+        unicode_errors = self._unicode_errors
+        converters = self._converters
+        lazy_bin = self._lazy_bin
+        path = self._path
+        field_sep = _FIELD_SEP.search
+
+        def text(start: int, end: int) -> str:
+            return str(view[start:end], "utf-8", unicode_errors)
+
+        start = 0
+        if _LEADING_WS.match(view):
+            # Whitespace is only skipped after a terminator, so a document
+            # that starts with whitespace has an unrecognised first record.
+            match = _RECORD_END.search(view)
+            if match is None:
+                return result
+            start = match.end()
+
+        record_end = _RECORD_END.search
+        length = len(view)
+        while True:
+            match = record_end(view, start)
+            if match is None:
+                end = next_start = length
+            else:
+                end = match.start()
+                next_start = match.end()
+
+            if end - start >= 3 and view[start] == _DOLLAR and view[start + 2] == _TILDE:
+                tag = view[start + 1]
+
+                if tag == _TAG_FIELD:
+                    # Regular field or list: exactly one more $f~ allowed
+                    if fields is not None:
+                        sep = field_sep(view, start + 3, end)
+                        if sep is not None and field_sep(view, sep.end(), end) is None:
+                            value = text(sep.end(), end)
+                            if "$l~" in value:
+                                value = value.split("$l~")
+                            fields[text(start + 3, sep.start())] = value
+
+                elif tag == _TAG_TYPED:
+                    if fields is not None:
+                        first = field_sep(view, start + 3, end)
+                        second = first and field_sep(view, first.end(), end)
+                        if second is not None:
+                            type_hint = text(start + 3, first.start())
+                            value_start = second.end()
+                            try:
+                                if type_hint == "null":
+                                    value = None
+                                elif type_hint == "bin" and _is_ascii(view, value_start, end):
+                                    if not lazy_bin:
+                                        # Decoded straight from the buffer, without a bytes copy
+                                        value = binascii.a2b_base64(view[value_start:end])
+                                    elif path is not None:
+                                        value = LazyBinary.from_file(path, value_start, end)
+                                    else:
+                                        value = LazyBinary(bytes(view[value_start:end]))
+                                else:
+                                    convert = converters.get(type_hint)
+                                    raw = text(value_start, end)
+                                    if convert is None:
+                                        value = self._convert_typed_value(type_hint, raw)
+                                    else:
+                                        value = convert(raw)
+                            except Exception as e:
+                                errors.append(f"Error parsing typed field {text(start, end)}: {str(e)}")
+                            else:
+                                fields[text(first.end(), second.start())] = value
+
+                elif tag == _TAG_OBJECT:
+                    # New object; an empty name opens an object that accepts no fields
+                    name = text(start + 3, end)
+                    fields = result[name] = {}
+                    if not name:
+                        fields = None
+
+                elif tag == _TAG_ERROR:
+                    errors.append(text(start + 3, end))
+
+                # We ignore transaction markers ($x~) during decoding
+
+            if match is None:
+                break
+            start = next_start
+
+        return result
+
+
+def decode_buffer(data: BufferLike, errors: str = "strict", lazy_bin: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    Decode LSF held in a bytes-like object or mmap
+
+    Args:
+        data: bytes, bytearray, memoryview or mmap holding UTF-8 LSF
+        errors: How to handle invalid UTF-8, as for ``bytes.decode``
+        lazy_bin: Return bin fields as LazyBinary, holding a copy of their
+            base64 text, instead of decoding them
+
+    Returns:
+        Dictionary representing the parsed data
+
+    Example:
+        >>> decode_buffer(b'$o~user$r~$t~int$f~id$f~123$r~')
+        {'user': {'id': 123}}
+    """
+    return BufferLSFDecoder(errors=errors, lazy_bin=lazy_bin).decode(data)
+
+
+def decode_file(path: str, errors: str = "strict", lazy_bin: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    Decode an LSF file by memory-mapping it
+
+    The file is never read into a single Python object; only the decoded
+    names, keys and values are materialized.
+
+    Args:
+        path: Path of a UTF-8 encoded LSF file
+        errors: How to handle invalid UTF-8, as for ``bytes.decode``
+        lazy_bin: Return bin fields as LazyBinary values that remember
+            where their base64 text is in the file and map it again when
+            accessed; the file must not change while they are in use
+
+    Returns:
+        Dictionary representing the parsed data
+    """
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return {}
+        with mapped:
+            decoder = BufferLSFDecoder(errors=errors, lazy_bin=lazy_bin)
+            decoder._path = os.path.abspath(path)
+            return decoder.decode(mapped)
@@ -0,0 +1,246 @@
+"""
+Bulk LSF Decoder for Python
+
+This module provides a single-pass decode engine for LSF (LLM-Safe Format)
+that locates record markers in bulk instead of walking the input one
+character at a time.
+"""
+
+import binascii
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from .decoder import FieldSelection, LSFDecoder, _field_selector, _select_none
+
+
+def _to_bool(value: str) -> bool:
+    return value.lower() == "true"
+
+
+def _to_null(value: str) -> None:
+    return None
+
+
+def _to_int_array(value: str) -> array:
+    # One pass over the split list in C instead of a Python loop per item
+    return array("q", map(int, value.split("$l~"))) if value else array("q")
+
+
+def _to_float_array(value: str) -> array:
+    return array("d", map(float, value.split("$l~"))) if value else array("d")
+
+
+# Converters for the known type hints. Unknown hints are routed through
+# LSFDecoder._convert_typed_value so the error messages stay identical.
+TYPE_CONVERTERS = {
+    "int": int,
+    "float": float,
+    "bool": _to_bool,
+    "null": _to_null,
+    # Same result and errors as base64.b64decode, without first copying
+    # str input to bytes
+    "bin": binascii.a2b_base64,
+    "str": str,
+    "int[]": _to_int_array,
+    "float[]": _to_float_array,
+}
+
+
+class BulkLSFDecoder(LSFDecoder):
+    """
+    Bulk decoder for LSF (LLM-Safe Format)
+
+    Produces exactly the same output and errors as LSFDecoder, but splits the
+    input on ``$r~`` in one C-level pass and dispatches each record on its
+    three-character prefix. Whitespace following a ``$r~`` is dropped with
+    ``str.lstrip``, which uses the same definition of whitespace as the
+    ``str.isspace`` check in the reference decoder.
+    """
+
+    # Converters for typed fields, keyed by type hint
+    _converters = TYPE_CONVERTERS
+
+    def decode(self, lsf_str: str, fields: Optional[FieldSelection] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Decode an LSF string to a Python dictionary
+
+        Args:
+            lsf_str: The LSF formatted string
+            fields: Only decode these fields (see _decode_projected)
+
+        Returns:
+            Dictionary representing the parsed data
+
+        Example:
+            >>> decoder = BulkLSFDecoder()
+            >>> decoder.decode("$o~user$r~$f~id$f~123$r~$f~name$f~John$r~")
+            {'user': {'id': '123', 'name': 'John'}}
+        """
+        if fields is not None:
+            return self._decode_projected(lsf_str, fields)
+        return self._decode_records(self._records(lsf_str))
+
+    def _decode_projected(self, lsf_str: str, fields: FieldSelection) -> Dict[str, Dict[str, Any]]:
+        """
+        Decode only the selected fields of an LSF string
+
+        The records of the selected fields go through _decode_records()
+        like those of a full decode; the others are never sliced, split or
+        converted (see _projected_records), so their conversion errors are
+        not reported either. Every object keeps its position in the result,
+        with only the selected fields.
+
+        Args:
+            lsf_str: The LSF formatted string
+            fields: Mapping of object name to the field names to keep (None
+                keeps every field; unlisted objects get none), or a predicate
+                called with (object name, field name)
+
+        Returns:
+            The result of a full decode without the fields not selected
+        """
+        return self._decode_records(self._projected_records(lsf_str, _field_selector(fields)))
+
+    def _projected_records(self, lsf_str: str,
+                           select: Callable[[str], Optional[Callable[[str], bool]]]) -> Iterator[str]:
+        """
+        Yield the object and error records and the records of selected fields
+
+        Records are located with ``str.find`` in the input itself. The key of
+        a field is read first, and a record is only sliced out once its key
+        is selected, so the values of other fields are never copied.
+
+        Args:
+            lsf_str: The LSF formatted string
+            select: Maps an object name to a test for its field names, or to
+                None to keep every field
+
+        Returns:
+            Iterator of record strings in document order
+        """
+        find = lsf_str.find
+        length = len(lsf_str)
+        wanted = _select_none
+        pos = 0
+        # Whitespace is only skipped after a record terminator, so a document
+        # that starts with whitespace has an unrecognised first record.
+        skip = lsf_str[:1].isspace()
+
+        while True:
+            end = find("$r~", pos)
+            if end == -1:
+                end = length
+            if skip:
+                skip = False
+            else:
+                tag = lsf_str[pos:pos + 3]
+
+                if tag == "$f~":
+                    if wanted is None:
+                        yield lsf_str[pos:end]
+                    else:
+                        key_end = find("$f~", pos + 3, end)
+                        if key_end != -1 and wanted(lsf_str[pos + 3:key_end]):
+                            yield lsf_str[pos:end]
+
+                elif tag == "$t~":
+                    if wanted is None:
+                        yield lsf_str[pos:end]
+                    else:
+                        hint_end = find("$f~", pos + 3, end)
+                        key_end = -1 if hint_end == -1 else find("$f~", hint_end + 3, end)
+                        if key_end != -1 and wanted(lsf_str[hint_end + 3:key_end]):
+                            yield lsf_str[pos:end]
+
+                elif tag == "$o~":
+                    # An empty name opens an object that accepts no fields
+                    name = lsf_str[pos + 3:end]
+                    wanted = select(name) if name else _select_none
+                    yield lsf_str[pos:end]
+
+                elif tag == "$e~":
+                    yield lsf_str[pos:end]
+
+            if end == length:
+                return
+            pos = end + 3
+            while pos < length and lsf_str[pos].isspace():
+                pos += 1
+
+    def _records(self, lsf_str: str) -> Iterable[str]:
+        """
+        Split the input into records with the whitespace after each ``$r~``
+        already removed
+
+        Args:
+            lsf_str: The LSF formatted string
+
+        Returns:
+            Iterable of record strings in document order
+        """
+        records = lsf_str.split("$r~")
+        # Whitespace is only skipped *after* a record terminator, so a
+        # document that starts with whitespace has an unrecognised first record.
+        if records[0][:1].isspace():
+            records[0] = ""
+        return map(str.lstrip, records)
+
+    def _decode_records(self, records: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Build the result from an iterable of records
+
+        Args:
+            records: Records as produced by _records()
+
+        Returns:
+            Dictionary representing the parsed data
+        """
+        self._errors = errors = []
+        result = {}
+        fields = None
+        converters = self._converters
+
+        for record in records:
+            if not record:
+                continue
+            tag = record[:3]
+
+            if tag == "$f~":
+                # Regular field or list (most common record)
+                if fields is not None:
+                    parts = record.split("$f~")
+                    if len(parts) == 3:
+                        value = parts[2]
+                        if "$l~" in value:
+                            value = value.split("$l~")
+                        fields[parts[1]] = value
+
+            elif tag == "$t~":
+                # Typed field
+                if fields is not None:
+                    parts = record.split("$f~", 2)
+                    if len(parts) == 3:
+                        type_hint = parts[0][3:]
+                        convert = converters.get(type_hint)
+                        try:
+                            if convert is None:
+                                fields[parts[1]] = self._convert_typed_value(type_hint, parts[2])
+                            else:
+                                fields[parts[1]] = convert(parts[2])
+                        except Exception as e:
+                            errors.append(f"Error parsing typed field {record}: {str(e)}")
+
+            elif tag == "$o~":
+                # New object; an empty name opens an object that accepts no fields
+                name = record[3:]
+                fields = result[name] = {}
+                if not name:
+                    fields = None
+
+            elif tag == "$e~":
+                # Error marker
+                errors.append(record[3:])
+
+            # We ignore transaction markers ($x~) during decoding
+
+        return result
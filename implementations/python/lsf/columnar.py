@@ -0,0 +1,321 @@
+"""
+Columnar LSF decoding
+
+This module decodes many same-shaped LSF (LLM-Safe Format) objects straight
+into columns: ``array('q')`` and ``array('d')`` for typed int and float
+fields, lists for everything else, and NumPy arrays when NumPy is installed.
+No dictionary is built per object.
+"""
+
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from .bulk_decoder import TYPE_CONVERTERS, BulkLSFDecoder
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - exercised when NumPy is missing
+    numpy = None
+
+# Column kinds: array typecodes for numeric columns, "o" for a list, "n"
+# for a column that has only held nulls and takes the kind of its first value
+_INT = "q"
+_FLOAT = "d"
+_OBJECT = "o"
+_NULL = "n"
+
+# Missing marker passed to _Column.set() for null values
+_MISSING = object()
+
+
+class _Column:
+    """
+    One column being filled row by row
+
+    The validity mask is only allocated once a row is missing; until then
+    ``valid`` is None and every row is present.
+    """
+
+    __slots__ = ("kind", "data", "valid")
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.data: Union[array, List[Any]] = [] if kind in (_OBJECT, _NULL) else array(kind)
+        self.valid: Optional[bytearray] = None
+
+    def mask(self) -> bytearray:
+        """Return the validity mask, allocating it if every row is present."""
+        if self.valid is None:
+            self.valid = bytearray(b"\x01") * len(self.data)
+        return self.valid
+
+    def pad(self, rows: int) -> None:
+        """Mark rows up to (excluding) rows as missing."""
+        missing = rows - len(self.data)
+        if missing > 0:
+            self.mask().extend(bytes(missing))
+            if self.kind in (_OBJECT, _NULL):
+                self.data.extend([None] * missing)
+            else:
+                self.data.frombytes(bytes(8 * missing))
+
+    def promote(self, kind: str) -> None:
+        """Widen the column: int to float, or any numeric column to a list."""
+        if kind == _FLOAT:
+            self.data = array(_FLOAT, self.data)
+        elif self.valid is None:
+            self.data = list(self.data)
+        else:
+            self.data = [value if valid else None for value, valid in zip(self.data, self.valid)]
+        self.kind = kind
+
+    def set(self, row: int, kind: str, value: Any) -> None:
+        """Store the value of a row, widening the column if needed."""
+        self.pad(row)
+        repeated = len(self.data) > row
+        if value is _MISSING:
+            if repeated:
+                # A null after a value of the same key clears it to 0 or None
+                self.mask()[row] = 0
+                self.data[row] = None if self.kind in (_OBJECT, _NULL) else 0
+            else:
+                self.pad(row + 1)
+            return
+        if self.kind == _NULL:
+            # The first value decides the kind; the null rows hold 0 or None
+            if kind != _OBJECT:
+                self.data = array(kind, bytes(8 * len(self.data)))
+            self.kind = kind
+        elif kind != self.kind and self.kind != _OBJECT and not (self.kind == _FLOAT and kind == _INT):
+            self.promote(_FLOAT if self.kind == _INT and kind == _FLOAT else _OBJECT)
+        if repeated:
+            # Repeated key within one object: the last value wins
+            try:
+                self.data[row] = value
+            except OverflowError:
+                # Numbers outside the array's range keep their exact value
+                self.promote(_OBJECT)
+                self.data[row] = value
+            if self.valid is not None:
+                self.valid[row] = 1
+        else:
+            try:
+                self.data.append(value)
+            except OverflowError:
+                self.promote(_OBJECT)
+                self.data.append(value)
+            if self.valid is not None:
+                self.valid.append(1)
+
+
+class LSFTable:
+    """
+    Columns of objects of one type
+
+    ``names`` holds the object name of every row. ``columns`` maps each
+    field to an ``array('q')`` (int), ``array('d')`` (float) or list, or to
+    NumPy arrays when enabled. ``valid`` maps each field to a mask that is
+    1 (True with NumPy) where the row has the field; missing fields and
+    null values are 0 and hold 0 (numeric) or None (list).
+
+    Example:
+        >>> table = decode_columns("$o~a$r~$t~int$f~x$f~1$r~$o~b$r~$t~int$f~x$f~2$r~", use_numpy=False)[""]
+        >>> table.columns["x"]
+        array('q', [1, 2])
+    """
+
+    def __init__(self, names: List[str], columns: Dict[str, Any], valid: Dict[str, Any]):
+        self.names = names
+        self.columns = columns
+        self.valid = valid
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Rebuild each row as a dictionary of its present fields."""
+        columns = [(key, self.columns[key], self.valid[key]) for key in self.columns]
+        for row in range(len(self.names)):
+            yield {key: column[row] for key, column, valid in columns if valid[row]}
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} with {len(self)} rows and columns {list(self.columns)}>"
+
+
+class ColumnarLSFDecoder(BulkLSFDecoder):
+    """
+    Decoder that writes fields straight into columns
+
+    Objects are grouped into tables by ``type_of(name)``; every object
+    becomes one row, so a repeated object name adds a row instead of
+    replacing the earlier object. Fields are converted with the same rules
+    and errors as LSFDecoder. A column holding ints that later receives a
+    float becomes a float column, and any other mix of kinds, or an int
+    outside the int64 range, turns it into a list. Nulls do not decide a
+    column's kind: a column whose first values are null takes the kind of
+    its first other value, as if the field were missing from those rows.
+    """
+
+    def __init__(self, type_of: Optional[Callable[[str], str]] = None,
+                 use_numpy: Optional[bool] = None):
+        """
+        Args:
+            type_of: Maps an object name to its table name (default: every
+                object goes into the table "")
+            use_numpy: Return NumPy arrays for numeric columns and masks;
+                None uses NumPy when it is installed
+
+        Raises:
+            ImportError: If use_numpy is True and NumPy is not installed
+        """
+        super().__init__()
+        if use_numpy and numpy is None:
+            raise ImportError("use_numpy=True requires NumPy")
+        self._type_of = type_of
+        self._use_numpy = numpy is not None if use_numpy is None else use_numpy
+
+    def decode(self, lsf_str: str, fields: None = None) -> Dict[str, LSFTable]:
+        """
+        Decode an LSF string into tables of columns
+
+        Args:
+            lsf_str: The LSF formatted string
+            fields: Not supported
+
+        Returns:
+            Dictionary mapping table names to LSFTable
+
+        Raises:
+            ValueError: If fields is given
+        """
+        if fields is not None:
+            raise ValueError("ColumnarLSFDecoder does not support field projection")
+        return self._decode_records(self._records(lsf_str))
+
+    def _decode_records(self, records: Iterable[str]) -> Dict[str, LSFTable]:
+        self._errors = errors = []
+        # Per table: (row names, columns)
+        tables: Dict[str, Any] = {}
+        converters = TYPE_CONVERTERS
+        type_of = self._type_of
+        columns = None
+        row = -1
+
+        for record in records:
+            if not record:
+                continue
+            tag = record[:3]
+
+            if tag == "$f~":
+                if columns is not None:
+                    parts = record.split("$f~")
+                    if len(parts) == 3:
+                        value = parts[2]
+                        if "$l~" in value:
+                            value = value.split("$l~")
+                        column = columns.get(parts[1])
+                        if column is None:
+                            column = columns[parts[1]] = _Column(_OBJECT)
+                        data = column.data
+                        if column.kind == _OBJECT and len(data) == row and column.valid is None:
+                            # Fast path: the next row of a dense list column
+                            data.append(value)
+                        else:
+                            column.set(row, _OBJECT, value)
+
+            elif tag == "$t~":
+                if columns is not None:
+                    parts = record.split("$f~", 2)
+                    if len(parts) == 3:
+                        type_hint = parts[0][3:]
+                        convert = converters.get(type_hint)
+                        try:
+                            if convert is None:
+                                value = self._convert_typed_value(type_hint, parts[2])
+                            else:
+                                value = convert(parts[2])
+                        except Exception as e:
+                            errors.append(f"Error parsing typed field {record}: {str(e)}")
+                            continue
+                        if type_hint == "int":
+                            kind = _INT
+                        elif type_hint == "float":
+                            kind = _FLOAT
+                        else:
+                            kind = _OBJECT
+                            if value is None:
+                                value = _MISSING
+                        column = columns.get(parts[1])
+                        if column is None:
+                            column = columns[parts[1]] = _Column(_NULL if value is _MISSING else kind)
+                        data = column.data
+                        if column.kind == kind and len(data) == row and column.valid is None and value is not _MISSING:
+                            # Fast path: the next row of a dense column of the same kind
+                            try:
+                                data.append(value)
+                            except OverflowError:
+                                column.set(row, kind, value)
+                        else:
+                            column.set(row, kind, value)
+
+            elif tag == "$o~":
+                name = record[3:]
+                table_name = type_of(name) if type_of is not None else ""
+                table = tables.get(table_name)
+                if table is None:
+                    table = tables[table_name] = ([], {})
+                names, columns = table
+                row = len(names)
+                names.append(name)
+                if not name:
+                    # An empty name opens an object that accepts no fields
+                    columns = None
+
+            elif tag == "$e~":
+                errors.append(record[3:])
+
+            # We ignore transaction markers ($x~) during decoding
+
+        return {table_name: self._finish(names, columns) for table_name, (names, columns) in tables.items()}
+
+    def _finish(self, names: List[str], columns: Dict[str, _Column]) -> LSFTable:
+        rows = len(names)
+        data = {}
+        valid = {}
+        for key, column in columns.items():
+            column.pad(rows)
+            column.mask()
+            if column.kind == _NULL:
+                column.kind = _OBJECT
+            if self._use_numpy:
+                if column.kind == _OBJECT:
+                    data[key] = column.data
+                else:
+                    data[key] = numpy.frombuffer(column.data, dtype=numpy.int64 if column.kind == _INT else numpy.float64)
+                valid[key] = numpy.frombuffer(column.valid, dtype=numpy.bool_)
+            else:
+                data[key] = column.data
+                valid[key] = column.valid
+        return LSFTable(names, data, valid)
+
+
+def decode_columns(lsf_str: str, type_of: Optional[Callable[[str], str]] = None,
+                   use_numpy: Optional[bool] = None) -> Dict[str, LSFTable]:
+    """
+    Decode LSF objects into columns, one table per object type
+
+    Args:
+        lsf_str: LSF formatted string
+        type_of: Maps an object name to its table name, e.g.
+            ``lambda name: name.rstrip("0123456789")`` for objects named
+            "tx1", "tx2", ... (default: a single table named "")
+        use_numpy: Return NumPy arrays; None uses NumPy when it is installed
+
+    Returns:
+        Dictionary mapping table names to LSFTable
+
+    Example:
+        >>> tables = decode_columns(lsf_str, type_of=lambda name: name.rstrip("0123456789"))
+        >>> sum(tables["tx"].columns["amount"])
+    """
+    return ColumnarLSFDecoder(type_of, use_numpy).decode(lsf_str)
@@ -5,9 +5,17 @@ This module provides functions to convert between LSF and JSON formats.
 """
 
 import json
+from array import array
 from typing import Any, Dict, Optional, Union
 
-from .decoder import LSFDecoder
+from .bulk_decoder import BulkLSFDecoder
+
+
+def _json_default(value: Any) -> Any:
+    # Typed lists decode to arrays, which JSON writes as lists
+    if isinstance(value, array):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
 
 
 def lsf_to_json(
@@ -38,11 +46,11 @@ def lsf_to_json(
         }'
     """
     # First decode LSF to Python objects
-    decoder = LSFDecoder()
+    decoder = BulkLSFDecoder()
     data = decoder.decode(lsf_string)
     
     # Convert to JSON
-    return json.dumps(data, indent=indent, sort_keys=sort_keys)
+    return json.dumps(data, indent=indent, sort_keys=sort_keys, default=_json_default)
 
 
 def lsf_to_json_pretty(lsf_string: str) -> str:
@@ -5,7 +5,37 @@ This module provides the decoder component for LSF (LLM-Safe Format).
 """
 
 import base64
-from typing import Any, Dict, List, Optional, Tuple
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+# Fields to keep when decoding: object name -> field names (None keeps every
+# field of that object), or a predicate called with (object name, field name)
+FieldSelection = Union[Mapping[str, Optional[Iterable[str]]], Callable[[str, str], bool]]
+
+
+def _select_none(key: str) -> bool:
+    return False
+
+
+def _field_selector(fields: FieldSelection) -> Callable[[str], Optional[Callable[[str], bool]]]:
+    """
+    Return a function mapping an object name to a test for its field names,
+    or to None when every field of the object is kept
+    """
+    if callable(fields):
+        predicate = fields
+        return lambda name: lambda key: predicate(name, key)
+    selection = {}
+    # Objects of one type usually share one list of field names
+    tests = {}
+    for name, keys in fields.items():
+        if keys is not None:
+            test = tests.get(id(keys))
+            if test is None:
+                test = tests[id(keys)] = frozenset(keys).__contains__
+            keys = test
+        selection[name] = keys
+    return lambda name: selection.get(name, _select_none)
 
 
 class LSFDecoder:
@@ -18,12 +48,13 @@ class LSFDecoder:
     def __init__(self):
         self._errors = []
     
-    def decode(self, lsf_str: str) -> Dict[str, Dict[str, Any]]:
+    def decode(self, lsf_str: str, fields: Optional[FieldSelection] = None) -> Dict[str, Dict[str, Any]]:
         """
         Decode an LSF string to a Python dictionary
         
         Args:
             lsf_str: The LSF formatted string
+            fields: Only decode these fields (see _decode_projected)
             
         Returns:
             Dictionary representing the parsed data
@@ -32,7 +63,11 @@ class LSFDecoder:
             >>> decoder = LSFDecoder()
             >>> decoder.decode("$o~user$r~$f~id$f~123$r~$f~name$f~John$r~")
             {'user': {'id': '123', 'name': 'John'}}
+            >>> decoder.decode("$o~user$r~$f~id$f~123$r~$f~name$f~John$r~", fields={"user": ["id"]})
+            {'user': {'id': '123'}}
         """
+        if fields is not None:
+            return self._decode_projected(lsf_str, fields)
         self._errors = []
         result = {}
         current_obj = None
@@ -103,6 +138,89 @@ class LSFDecoder:
                 
         return result
     
+    def _decode_projected(self, lsf_str: str, fields: FieldSelection) -> Dict[str, Dict[str, Any]]:
+        """
+        Decode only the selected fields of an LSF string
+
+        Records are located with ``str.find``. The key of each field is read
+        first, and a field that is not selected is skipped to the next
+        ``$r~`` without slicing its value, splitting its list or converting
+        it, so its conversion errors are not reported either. Every object
+        keeps its position in the result, with only the selected fields.
+
+        Args:
+            lsf_str: The LSF formatted string
+            fields: Mapping of object name to the field names to keep (None
+                keeps every field; unlisted objects get none), or a predicate
+                called with (object name, field name)
+
+        Returns:
+            The result of a full decode without the fields not selected
+        """
+        self._errors = errors = []
+        result = {}
+        obj_fields = None
+        wanted = None
+        select = _field_selector(fields)
+        find = lsf_str.find
+        convert = self._convert_typed_value
+        length = len(lsf_str)
+        pos = 0
+        # Whitespace is only skipped after a record terminator, so a document
+        # that starts with whitespace has an unrecognised first record.
+        skip = lsf_str[:1].isspace()
+
+        while True:
+            end = find("$r~", pos)
+            if end == -1:
+                end = length
+            if skip:
+                skip = False
+            else:
+                tag = lsf_str[pos:pos + 3]
+
+                if tag == "$f~":
+                    if obj_fields is not None:
+                        key_end = find("$f~", pos + 3, end)
+                        if key_end != -1:
+                            key = lsf_str[pos + 3:key_end]
+                            # A third $f~ makes the record invalid
+                            if (wanted is None or wanted(key)) and find("$f~", key_end + 3, end) == -1:
+                                value = lsf_str[key_end + 3:end]
+                                if "$l~" in value:
+                                    value = value.split("$l~")
+                                obj_fields[key] = value
+
+                elif tag == "$t~":
+                    if obj_fields is not None:
+                        hint_end = find("$f~", pos + 3, end)
+                        key_end = -1 if hint_end == -1 else find("$f~", hint_end + 3, end)
+                        if key_end != -1:
+                            key = lsf_str[hint_end + 3:key_end]
+                            if wanted is None or wanted(key):
+                                try:
+                                    obj_fields[key] = convert(lsf_str[pos + 3:hint_end], lsf_str[key_end + 3:end])
+                                except Exception as e:
+                                    errors.append(f"Error parsing typed field {lsf_str[pos:end]}: {str(e)}")
+
+                elif tag == "$o~":
+                    # An empty name opens an object that accepts no fields
+                    name = lsf_str[pos + 3:end]
+                    obj_fields = result[name] = {}
+                    if name:
+                        wanted = select(name)
+                    else:
+                        obj_fields = None
+
+                elif tag == "$e~":
+                    errors.append(lsf_str[pos + 3:end])
+
+            if end == length:
+                return result
+            pos = end + 3
+            while pos < length and lsf_str[pos].isspace():
+                pos += 1
+
     def _convert_typed_value(self, type_hint: str, value: str) -> Any:
         """
         Convert a value based on its type hint
@@ -129,6 +247,10 @@ class LSFDecoder:
             return base64.b64decode(value)
         elif type_hint == "str":
             return value
+        elif type_hint == "int[]":
+            return array("q", map(int, value.split("$l~"))) if value else array("q")
+        elif type_hint == "float[]":
+            return array("d", map(float, value.split("$l~"))) if value else array("d")
         else:
             raise ValueError(f"Unknown type hint: {type_hint}")
     
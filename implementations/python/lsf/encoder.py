@@ -4,8 +4,53 @@ LSF Encoder for Python
 This module provides the encoder component for LSF (LLM-Safe Format).
 """
 
-import base64
-from typing import Any, List, Optional, Union
+import codecs
+import io
+import string
+from array import array
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+from .binary import BIN_CHUNK_SIZE, BinarySource, iter_base64
+
+# Buffered output written to a sink at a time
+DEFAULT_FLUSH_THRESHOLD = 64 * 1024
+
+# Records collected as str before binary output encodes them into its buffer
+BINARY_RUN_RECORDS = 2048
+
+# Characters of the LSF markers and of base64
+_ASCII_PROBE = "$~" + string.ascii_letters + string.digits + "+/="
+
+# Array typecodes of typed lists, and how their items are written
+_LIST_TYPECODES = {"int": "q", "float": "d"}
+_ITEM_FORMATTERS = {"q": int.__repr__, "d": float.__repr__}
+
+
+def _text_encoder(encoding: str) -> Tuple[Callable[[str], bytes], bool]:
+    """
+    Return the encode function of one incremental encoder, so that pieces
+    of one output get at most one BOM, and whether ASCII text encodes to
+    the same bytes in this encoding.
+    """
+    encode = codecs.getincrementalencoder(encoding)().encode
+    return encode, _ASCII_PROBE.encode(encoding) == _ASCII_PROBE.encode("ascii")
+
+
+def _typed_list_record(key: str, values: Any, type_hint: str) -> str:
+    """Return the record of a typed list, converting the values to the type."""
+    typecode = _LIST_TYPECODES.get(type_hint)
+    if typecode is None:
+        raise ValueError(f"Invalid list type hint: {type_hint}")
+    if not isinstance(values, array) or values.typecode != typecode:
+        if hasattr(values, "tolist"):
+            # NumPy arrays convert faster through a list
+            values = values.tolist()
+        try:
+            values = array(typecode, values)
+        except (TypeError, OverflowError) as e:
+            raise ValueError(f"Invalid {type_hint} list for {key}: {e}") from None
+    items = "$l~".join(map(_ITEM_FORMATTERS[typecode], values))
+    return f"$t~{type_hint}[]$f~{key}$f~{items}$r~"
 
 
 class LSFEncoder:
@@ -13,11 +58,66 @@ class LSFEncoder:
     Encoder for LSF (LLM-Safe Format)
     
     This class provides a fluent API for encoding data to LSF format.
+    
+    Bound to a sink, the encoder writes its output through instead of
+    keeping it: once ``flush_threshold`` characters are buffered, and at
+    every ``end_transaction()``, the buffer is written out and emptied, so
+    memory stays the same however large the output grows. Text files get
+    str; binary files, sockets and any other writer get bytes in
+    ``encoding``.
+    
+    With ``binary=True`` the output is built as bytes: records are encoded
+    into a ``bytearray`` a run at a time by one incremental encoder, the
+    base64 of bin fields goes into it directly (in encodings that write
+    ASCII as ASCII), and to_bytes() returns that buffer without encoding
+    or copying the whole document again. The document is never held as str,
+    but each record still goes through the fluent API, so this is not faster
+    than ``to_lsf(data).encode()``; encode_to_bytes() is.
+    
+    Example:
+        >>> with open("out.lsf", "wb") as f:
+        ...     encoder = LSFEncoder(sink=f)
+        ...     for name, amount in rows:
+        ...         encoder.start_object(name).add_field("amount", amount)
+        ...     encoder.end_transaction()
     """
     
-    def __init__(self):
+    def __init__(self, sink: Optional[Any] = None, flush_threshold: int = DEFAULT_FLUSH_THRESHOLD,
+                 encoding: str = "utf-8", binary: bool = False):
+        """
+        Args:
+            sink: A text or binary file object, a socket, or any object with
+                ``write()``; None keeps the output for to_string()
+            flush_threshold: Buffered characters (bytes for ASCII text) that
+                trigger a write to the sink
+            encoding: Encoding of the bytes written to non-text sinks and
+                of binary output
+            binary: Build the output as bytes for to_bytes()
+            
+        Raises:
+            ValueError: If both sink and binary are given, or flush_threshold
+                is not positive
+        """
         self._buffer = []
         self._current_object = None
+        self._sink = sink
+        self._encoding = encoding
+        # Encoded output of a binary encoder
+        self._output: Optional[bytearray] = None
+        if binary:
+            if sink is not None:
+                raise ValueError("binary=True builds the output in memory; sinks already receive bytes")
+            self._output = bytearray()
+            self._encode, self._raw_base64 = _text_encoder(encoding)
+        if sink is not None:
+            if flush_threshold < 1:
+                raise ValueError("flush_threshold must be positive")
+            self._flush_threshold = flush_threshold
+            self._write = _sink_writer(sink, encoding)
+            self._size = 0
+            self._append = self._append_and_flush
+        else:
+            self._append = self._buffer.append
     
     def start_object(self, name: str) -> 'LSFEncoder':
         """
@@ -29,7 +129,9 @@ class LSFEncoder:
         Returns:
             self for chaining
         """
-        self._buffer.append(f"$o~{name}$r~")
+        if self._output is not None and len(self._buffer) >= BINARY_RUN_RECORDS:
+            self._encode_run()
+        self._append(f"$o~{name}$r~")
         self._current_object = name
         return self
     
@@ -50,7 +152,7 @@ class LSFEncoder:
         if self._current_object is None:
             raise ValueError("No object started. Call start_object() first.")
         
-        self._buffer.append(f"$f~{key}$f~{str(value)}$r~")
+        self._append(f"$f~{key}$f~{str(value)}$r~")
         return self
     
     def add_typed_field(self, key: str, value: Any, type_hint: str) -> 'LSFEncoder':
@@ -76,38 +178,80 @@ class LSFEncoder:
         
         # Handle binary data with base64 encoding
         if type_hint == "bin" and value is not None:
-            value = base64.b64encode(value).decode('ascii')
+            return self.add_binary(key, value)
         
         # Handle None for null type
         if type_hint == "null":
             value = ""
         
-        self._buffer.append(f"$t~{type_hint}$f~{key}$f~{str(value)}$r~")
+        self._append(f"$t~{type_hint}$f~{key}$f~{str(value)}$r~")
         return self
     
-    def add_list(self, key: str, values: List[Any]) -> 'LSFEncoder':
+    def add_binary(self, key: str, data: BinarySource, chunk_size: int = BIN_CHUNK_SIZE) -> 'LSFEncoder':
+        """
+        Add a bin field, base64-encoding the data in chunks
+        
+        The payload is never encoded as one string, so a large attachment
+        read from a file costs about its base64 size in the output, or only
+        about ``flush_threshold`` plus one chunk when writing to a sink.
+        
+        Args:
+            key: The field key
+            data: bytes-like object, or a binary file object read in chunks
+            chunk_size: Raw bytes encoded per chunk
+            
+        Returns:
+            self for chaining
+            
+        Raises:
+            ValueError: If no object has been started
+        """
+        if self._current_object is None:
+            raise ValueError("No object started. Call start_object() first.")
+        
+        self._append(f"$t~bin$f~{key}$f~")
+        if self._output is not None and self._raw_base64:
+            # Base64 goes into the output buffer without passing through str
+            self._encode_run()
+            for chunk in iter_base64(data, chunk_size, binary=True):
+                self._output += chunk
+        elif self._sink is None:
+            self._buffer.extend(iter_base64(data, chunk_size))
+        else:
+            for chunk in iter_base64(data, chunk_size):
+                self._append(chunk)
+        self._append("$r~")
+        return self
+    
+    def add_list(self, key: str, values: List[Any], type_hint: Optional[str] = None) -> 'LSFEncoder':
         """
         Add a list field to the current object
         
         Args:
             key: The field key
             values: List of values
+            type_hint: "int" or "float" to write a typed list, which decodes
+                to an ``array('q')`` or ``array('d')``; None writes the items
+                as strings
             
         Returns:
             self for chaining
             
         Raises:
-            ValueError: If no object has been started
+            ValueError: If no object has been started, type_hint is invalid
+                or a value does not fit the type
         """
         if self._current_object is None:
             raise ValueError("No object started. Call start_object() first.")
         
-        if not values:
+        if type_hint is not None:
+            self._append(_typed_list_record(key, values, type_hint))
+        elif not values:
             # Empty list
-            self._buffer.append(f"$f~{key}$f~$r~")
+            self._append(f"$f~{key}$f~$r~")
         else:
             items = "$l~".join(str(v) for v in values)
-            self._buffer.append(f"$f~{key}$f~{items}$r~")
+            self._append(f"$f~{key}$f~{items}$r~")
         
         return self
     
@@ -121,24 +265,120 @@ class LSFEncoder:
         Returns:
             self for chaining
         """
-        self._buffer.append(f"$e~{message}$r~")
+        self._append(f"$e~{message}$r~")
         return self
     
     def end_transaction(self) -> 'LSFEncoder':
         """
         End the current transaction
         
+        With a sink, everything up to and including the transaction marker
+        is written and the sink is flushed.
+        
         Returns:
             self for chaining
         """
-        self._buffer.append("$x~$r~")
+        self._append("$x~$r~")
+        if self._sink is not None:
+            self.flush()
         return self
     
+    def flush(self) -> 'LSFEncoder':
+        """
+        Write the buffered output to the sink and flush the sink
+        
+        Returns:
+            self for chaining
+            
+        Raises:
+            ValueError: If the encoder has no sink
+        """
+        if self._sink is None:
+            raise ValueError("No sink to flush. Pass sink= to LSFEncoder().")
+        self._write_buffer()
+        flush = getattr(self._sink, "flush", None)
+        if flush is not None:
+            flush()
+        return self
+    
+    def _encode_run(self) -> None:
+        self._output += self._encode("".join(self._buffer))
+        self._buffer.clear()
+    
+    def _append_and_flush(self, text: str) -> None:
+        self._buffer.append(text)
+        self._size += len(text)
+        if self._size >= self._flush_threshold:
+            self._write_buffer()
+    
+    def _write_buffer(self) -> None:
+        if self._buffer:
+            self._write("".join(self._buffer))
+            self._buffer.clear()
+        self._size = 0
+    
     def to_string(self) -> str:
         """
         Convert the buffer to an LSF string
         
         Returns:
             The LSF formatted string
+            
+        Raises:
+            ValueError: If the encoder writes to a sink
+        """
+        if self._sink is not None:
+            raise ValueError("Output was written to the sink. Call flush() instead of to_string().")
+        if self._output is not None:
+            return self.to_bytes().decode(self._encoding)
+        return "".join(self._buffer)
+    
+    def to_bytes(self) -> bytearray:
+        """
+        Return the output of a binary encoder
+        
+        The encoder's own buffer is returned without copying, so this
+        closes the encoder: adding records afterwards raises ValueError
+        instead of changing the returned bytearray. to_bytes() and
+        to_string() can still be called.
+        
+        Returns:
+            The LSF formatted bytes in the encoder's encoding
+            
+        Raises:
+            ValueError: If the encoder was not created with binary=True
         """
-        return "".join(self._buffer) 
\ No newline at end of file
+        if self._output is None:
+            raise ValueError("Not a binary encoder. Pass binary=True to LSFEncoder(), or use to_string().")
+        if self._buffer:
+            self._encode_run()
+        self._append = self._append_after_to_bytes
+        return self._output
+    
+    def _append_after_to_bytes(self, text: str) -> None:
+        raise ValueError("to_bytes() closed the encoder. Create a new LSFEncoder for more records.")
+
+
+def _sink_writer(sink: Any, encoding: str):
+    """Return a function writing one str to the sink."""
+    if isinstance(sink, io.TextIOBase):
+        return sink.write
+    encode = _text_encoder(encoding)[0]
+    sendall = getattr(sink, "sendall", None)
+    if sendall is not None:
+        # Sockets
+        return lambda text: sendall(encode(text))
+    write = getattr(sink, "write", None)
+    if write is None:
+        raise TypeError(f"Cannot write LSF to {type(sink).__name__}: expected a file object or socket")
+    
+    def write_bytes(text: str) -> None:
+        data = encode(text)
+        written = write(data)
+        if written is not None and written < len(data):
+            # Raw files may write only part of the data
+            with memoryview(data) as view:
+                while written < len(data):
+                    written += write(view[written:])
+    
+    return write_bytes
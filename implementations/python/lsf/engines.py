@@ -0,0 +1,156 @@
+"""
+LSF decode engine registry
+
+This module provides the pluggable decode engines behind ``from_lsf`` and the
+size-based ``auto`` selection between them. Every engine produces the same
+output and errors as the reference LSFDecoder.
+"""
+
+import re
+from typing import Callable, Dict, Iterator, List
+
+from .decoder import LSFDecoder
+from .bulk_decoder import BulkLSFDecoder
+
+
+_RECORD_END = re.compile(r"\$r~\s*")
+
+
+class RegexLSFDecoder(BulkLSFDecoder):
+    """
+    Decode engine that finds record boundaries with a compiled regex
+
+    The pattern consumes ``$r~`` together with the whitespace that follows
+    it, so records never need to be stripped afterwards.
+    """
+
+    def _records(self, lsf_str: str) -> Iterator[str]:
+        start = 0
+        if lsf_str[:1].isspace():
+            # Leading whitespace makes the first record unrecognisable
+            match = _RECORD_END.search(lsf_str)
+            if match is None:
+                return
+            start = match.end()
+        for match in _RECORD_END.finditer(lsf_str, start):
+            yield lsf_str[start:match.start()]
+            start = match.end()
+        yield lsf_str[start:]
+
+
+class ScanLSFDecoder(BulkLSFDecoder):
+    """
+    Decode engine that walks the input with ``str.find``
+
+    Only one record is materialized at a time, so peak memory stays close to
+    the size of the decoded result rather than twice the input size.
+    """
+
+    def _records(self, lsf_str: str) -> Iterator[str]:
+        find = lsf_str.find
+        length = len(lsf_str)
+        pos = 0
+        skip = lsf_str[:1].isspace()
+        while True:
+            end = find("$r~", pos)
+            if end == -1:
+                if not skip:
+                    yield lsf_str[pos:]
+                return
+            if skip:
+                skip = False
+            else:
+                yield lsf_str[pos:end]
+            pos = end + 3
+            if pos < length and lsf_str[pos].isspace():
+                while pos < length and lsf_str[pos].isspace():
+                    pos += 1
+
+
+# Registered engine factories, keyed by name
+_ENGINES: Dict[str, Callable[[], LSFDecoder]] = {
+    "reference": LSFDecoder,
+    "bulk": BulkLSFDecoder,
+    "regex": RegexLSFDecoder,
+    "scan": ScanLSFDecoder,
+}
+
+# Thresholds used by the "auto" engine, as measured by
+#     python -m benchmarks.engine_calibration
+# Re-run the calibration after changing an engine or on very different hardware.
+AUTO_THRESHOLDS = {
+    # Inputs shorter than this are always decoded with "bulk"
+    "min_probe_size": 16384,
+    # Inputs whose records average at least this many characters are decoded
+    # with "regex"; everything else uses "bulk".
+    "regex_min_record_size": 2048,
+}
+
+
+def register_engine(name: str, factory: Callable[[], LSFDecoder]) -> None:
+    """
+    Register a decode engine
+
+    Args:
+        name: The engine name used with ``from_lsf(..., engine=name)``
+        factory: Callable returning a fresh decoder with a ``decode`` method
+
+    Raises:
+        ValueError: If the name is reserved or already registered
+    """
+    if name == "auto":
+        raise ValueError("Engine name 'auto' is reserved")
+    if name in _ENGINES:
+        raise ValueError(f"Engine already registered: {name}")
+    _ENGINES[name] = factory
+
+
+def available_engines() -> List[str]:
+    """
+    Get the names of all registered engines
+
+    Returns:
+        List of engine names, not including "auto"
+    """
+    return list(_ENGINES)
+
+
+def select_engine(lsf_str: str) -> str:
+    """
+    Choose the fastest engine for an input based on its size and shape
+
+    Args:
+        lsf_str: The LSF formatted string
+
+    Returns:
+        Name of a registered engine
+    """
+    size = len(lsf_str)
+    if size >= AUTO_THRESHOLDS["min_probe_size"]:
+        record_size = size / (lsf_str.count("$r~") + 1)
+        if record_size >= AUTO_THRESHOLDS["regex_min_record_size"]:
+            return "regex"
+    return "bulk"
+
+
+def get_decoder(engine: str = "auto", lsf_str: str = "") -> LSFDecoder:
+    """
+    Create a decoder for the given engine
+
+    Args:
+        engine: A registered engine name or "auto"
+        lsf_str: The input to be decoded, used by "auto" to pick an engine
+
+    Returns:
+        A fresh decoder instance
+
+    Raises:
+        ValueError: If the engine is not registered
+    """
+    if engine == "auto":
+        engine = select_engine(lsf_str)
+    try:
+        factory = _ENGINES[engine]
+    except KeyError:
+        raise ValueError(f"Unknown decode engine: {engine}") from None
+    return factory()
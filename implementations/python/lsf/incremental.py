@@ -0,0 +1,325 @@
+"""
+Incremental LSF Decoder for Python
+
+This module provides a push-style decoder for LSF (LLM-Safe Format) that
+accepts the input in arbitrary chunks, as produced by an LLM token stream.
+"""
+
+import codecs
+from typing import IO, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .decoder import LSFDecoder
+from .bulk_decoder import TYPE_CONVERTERS
+
+
+# Builds events without the Python-level NamedTuple.__new__ call
+_new_event = tuple.__new__
+
+
+# Default number of characters (or bytes) read per call by iterparse()
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class LSFEvent(NamedTuple):
+    """
+    A decode event emitted by IncrementalLSFDecoder
+
+    kind is one of:
+        "field": a field record completed; key and value are set
+        "object": an object completed; value is its fields dictionary
+        "error": an error record or conversion error; value is the message
+    """
+    kind: str
+    object: Optional[str]
+    key: Optional[str]
+    value: Any
+
+
+class IncrementalLSFDecoder(LSFDecoder):
+    """
+    Push-style decoder for LSF (LLM-Safe Format)
+
+    Feed text with feed() as it arrives and call close() at the end. Each
+    field is reported as soon as its ``$r~`` arrives, and each object once the
+    next ``$o~`` record (or close()) shows it is complete. Only the unfinished
+    tail of the input is buffered, and every character is scanned once, so
+    the total work is linear in the input size however it is chunked.
+
+    Feeding a whole document and calling close() yields the same result and
+    errors as LSFDecoder.decode().
+
+    Example:
+        >>> decoder = IncrementalLSFDecoder()
+        >>> decoder.feed("$o~user$r~$f~na")
+        []
+        >>> decoder.feed("me$f~John$r")
+        []
+        >>> decoder.feed("~")
+        [LSFEvent(kind='field', object='user', key='name', value='John')]
+        >>> decoder.close()
+        [LSFEvent(kind='object', object='user', key=None, value={'name': 'John'})]
+    """
+
+    def __init__(self, keep_result: bool = True):
+        """
+        Args:
+            keep_result: Keep every decoded object in ``result``. Pass False
+                to only hold the object currently being decoded.
+        """
+        super().__init__()
+        self._keep_result = keep_result
+        self._result: Dict[str, Dict[str, Any]] = {}
+        self._object: Optional[str] = None
+        self._current: Optional[Dict[str, Any]] = None
+        self._fields: Optional[Dict[str, Any]] = None
+        self._pending: List[str] = []
+        self._tail = ""
+        self._skip_ws = False
+        self._closed = False
+        self._events: List[LSFEvent] = []
+
+    @property
+    def result(self) -> Dict[str, Dict[str, Any]]:
+        """Objects decoded so far, as LSFDecoder.decode() would return them."""
+        return self._result
+
+    def feed(self, chunk: str) -> List[LSFEvent]:
+        """
+        Feed the next piece of input
+
+        Args:
+            chunk: The next piece of the LSF string; may split markers
+
+        Returns:
+            Events completed by this chunk, in document order
+
+        Raises:
+            ValueError: If the decoder has already been closed
+        """
+        if self._closed:
+            raise ValueError("Cannot feed a closed decoder")
+        self._events = events = []
+        pending = self._pending
+
+        if self._skip_ws:
+            chunk = chunk.lstrip()
+            if not chunk:
+                return events
+            self._skip_ws = False
+        elif self._tail:
+            # A terminator may be split between the buffered tail and this chunk
+            tail = self._tail
+            start = (tail + chunk[:2]).find("$r~")
+            if start != -1 and start < len(tail):
+                overlap = len(tail) - start
+                record = "".join(pending)[:-overlap]
+                pending.clear()
+                self._tail = ""
+                self._complete_records((record,))
+                chunk = chunk[3 - overlap:].lstrip()
+                if not chunk:
+                    self._skip_ws = True
+                    return events
+        if not chunk:
+            return events
+
+        parts = chunk.split("$r~")
+        if len(parts) == 1:
+            self._tail = (self._tail + chunk)[-2:] if pending else chunk[-2:]
+            pending.append(chunk)
+            return events
+
+        first = parts[0]
+        if pending:
+            pending.append(first)
+            first = "".join(pending)
+            pending.clear()
+        parts[0] = first
+        rest = parts.pop().lstrip()
+        self._complete_records(parts)
+
+        if rest:
+            pending.append(rest)
+            self._tail = rest[-2:]
+        else:
+            # The chunk ended inside (or right at) the whitespace after $r~
+            self._skip_ws = True
+            self._tail = ""
+        return events
+
+    def close(self) -> List[LSFEvent]:
+        """
+        Signal the end of input and flush the final record and object
+
+        Returns:
+            Events completed by the end of input
+        """
+        self._events = events = []
+        if self._closed:
+            return events
+        self._closed = True
+        if self._pending:
+            record = "".join(self._pending)
+            self._pending.clear()
+            self._tail = ""
+            self._complete_records((record,))
+        if self._object is not None:
+            events.append(_new_event(LSFEvent, ("object", self._object, None, self._current)))
+            self._object = None
+        return events
+
+    def _complete_records(self, records: List[str]) -> None:
+        """
+        Apply complete records, mirroring LSFDecoder.decode()
+
+        Every record except the first must already have the whitespace after
+        its preceding ``$r~`` removed; the first record is stripped here when
+        it follows a terminator.
+        """
+        emit = self._events.append
+        errors = self._errors
+        converters = TYPE_CONVERTERS
+        name = self._object
+        current = self._current
+        fields = self._fields
+        strip = False
+
+        for record in records:
+            if strip:
+                record = record.lstrip()
+            strip = True
+            if not record:
+                continue
+            tag = record[:3]
+
+            if tag == "$f~":
+                if fields is not None:
+                    parts = record.split("$f~")
+                    if len(parts) == 3:
+                        value = parts[2]
+                        if "$l~" in value:
+                            value = value.split("$l~")
+                        fields[parts[1]] = value
+                        emit(_new_event(LSFEvent, ("field", name, parts[1], value)))
+
+            elif tag == "$t~":
+                if fields is not None:
+                    parts = record.split("$f~", 2)
+                    if len(parts) == 3:
+                        type_hint = parts[0][3:]
+                        convert = converters.get(type_hint)
+                        try:
+                            if convert is None:
+                                value = self._convert_typed_value(type_hint, parts[2])
+                            else:
+                                value = convert(parts[2])
+                        except Exception as e:
+                            message = f"Error parsing typed field {record}: {str(e)}"
+                            errors.append(message)
+                            emit(_new_event(LSFEvent, ("error", name, None, message)))
+                        else:
+                            fields[parts[1]] = value
+                            emit(_new_event(LSFEvent, ("field", name, parts[1], value)))
+
+            elif tag == "$o~":
+                if name is not None:
+                    emit(_new_event(LSFEvent, ("object", name, None, current)))
+                name = record[3:]
+                current = {}
+                if self._keep_result:
+                    self._result[name] = current
+                # An empty name opens an object that accepts no fields
+                fields = current if name else None
+
+            elif tag == "$e~":
+                message = record[3:]
+                errors.append(message)
+                emit(_new_event(LSFEvent, ("error", name, None, message)))
+
+            # We ignore transaction markers ($x~) during decoding
+
+        self._object = name
+        self._current = current
+        self._fields = fields
+
+
+def iterparse(
+    fileobj: IO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8",
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Iterate over the objects of an LSF file without loading it whole
+
+    The file is read in chunks and each object is yielded as soon as it is
+    complete, then forgotten, so peak memory depends on the largest object
+    rather than on the file size. Objects are yielded once per ``$o~``
+    record; a repeated name is yielded again rather than replacing the
+    earlier object as from_lsf() does. Error records are skipped.
+
+    Args:
+        fileobj: A text or binary file object opened for reading
+        chunk_size: Number of characters (or bytes) to read per call
+        encoding: Encoding used to decode binary files
+
+    Returns:
+        Iterator of (object_name, fields_dict) pairs in document order
+
+    Example:
+        >>> import io
+        >>> list(iterparse(io.StringIO("$o~a$r~$f~k$f~v$r~$o~b$r~")))
+        [('a', {'k': 'v'}), ('b', {})]
+    """
+    decoder = IncrementalLSFDecoder(keep_result=False)
+    for chunk in read_text(fileobj, chunk_size, encoding):
+        for event in decoder.feed(chunk):
+            if event.kind == "object":
+                yield event.object, event.value
+    for event in decoder.close():
+        if event.kind == "object":
+            yield event.object, event.value
+
+
+def read_text(
+    source: Union[str, IO, Iterable[Union[str, bytes]]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8",
+) -> Iterator[str]:
+    """
+    Iterate over the text of an LSF source in chunks
+
+    Bytes are decoded incrementally, so a multi-byte character split between
+    two chunks is decoded correctly.
+
+    Args:
+        source: A str, a text or binary file object, or an iterable of str
+            or bytes chunks
+        chunk_size: Number of characters (or bytes) per chunk when reading a
+            str or a file object
+        encoding: Encoding used to decode bytes
+
+    Returns:
+        Iterator of str chunks
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    if isinstance(source, str):
+        chunks = (source[start:start + chunk_size] for start in range(0, len(source), chunk_size))
+    elif hasattr(source, "read"):
+        read = source.read
+        chunks = iter(lambda: read(chunk_size), source.read(0))
+    else:
+        chunks = source
+
+    text_decoder = None
+    for chunk in chunks:
+        if not isinstance(chunk, str):
+            if text_decoder is None:
+                text_decoder = codecs.getincrementaldecoder(encoding)()
+            chunk = text_decoder.decode(chunk)
+        if chunk:
+            yield chunk
+    if text_decoder is not None:
+        chunk = text_decoder.decode(b"", final=True)
+        if chunk:
+            yield chunk
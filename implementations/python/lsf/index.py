@@ -0,0 +1,434 @@
+"""
+Sidecar object index for LSF files
+
+This module builds a compact on-disk index of the objects in an LSF
+(LLM-Safe Format) file, mapping each object name to the byte range of its
+last occurrence, and reads single objects through that index with ``seek``
+or ``mmap`` instead of decoding the whole file.
+
+It can also be run as a tool::
+
+    python -m lsf.index build export.lsf
+    python -m lsf.index status export.lsf
+    python -m lsf.index get export.lsf user42
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .buffer_decoder import _WS, BufferLSFDecoder
+
+# A $o~ record that follows a terminator and the whitespace skipped after it
+_OBJECT_START = re.compile(rb"\$r~" + _WS + rb"*(?=\$o~)")
+_TERMINATOR = re.compile(rb"\$r~")
+
+INDEX_SUFFIX = ".lsfidx"
+
+# Bytes hashed at each end of the indexed region to fingerprint the file
+FINGERPRINT_SAMPLE = 64 * 1024
+
+_MAGIC = b"LSFIDX\x00\x02"
+_HEADER = struct.Struct("<8sQQ32s32sqQ")
+_BIG_ENDIAN = sys.byteorder == "big"
+_NO_OBJECT = (1 << 64) - 1
+
+# Index states reported by LSFIndex.status()
+FRESH = "fresh"
+APPENDED = "appended"
+STALE = "stale"
+
+
+def _fingerprint(view, size: int) -> Tuple[bytes, bytes]:
+    """Hash the first and last FINGERPRINT_SAMPLE bytes of view[:size]."""
+    # Imported here: hashlib loads OpenSSL, which only index files need
+    import hashlib
+    head = hashlib.sha256(view[:min(size, FINGERPRINT_SAMPLE)]).digest()
+    tail = hashlib.sha256(view[max(0, size - FINGERPRINT_SAMPLE):size]).digest()
+    return head, tail
+
+
+def _map_file(f) -> Optional[mmap.mmap]:
+    try:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # Empty files cannot be mapped
+        return None
+
+
+class LSFIndex:
+    """
+    Object name to byte range index of an LSF file
+
+    Entries map each object name to the ``(offset, length)`` of its last
+    occurrence and keep the order of first occurrences, matching the keys
+    of ``decode_file()``. The index also stores the indexed file size, its
+    modification time and a fingerprint of the first and last 64 KiB of the
+    indexed bytes, which tell unchanged, appended and rewritten files apart
+    without rereading them. A file of the indexed size is only fresh if its
+    modification time is unchanged too, so an edit between the sampled ends
+    that keeps the size is caught.
+
+    Example:
+        >>> index = LSFIndex.build("export.lsf")
+        >>> index.save()
+        >>> LSFIndex.load("export.lsf.lsfidx").entries["user42"]
+        (1048576, 212)
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Path of the indexed LSF file
+        """
+        self.path = path
+        self.entries: Dict[str, Tuple[int, int]] = {}
+        self.file_size = 0
+        self.head_digest = b"\x00" * 32
+        self.tail_digest = b"\x00" * 32
+        # st_mtime_ns of the file when it was indexed
+        self.mtime_ns = 0
+        # Offset of the last object, which appended data may extend
+        self.last_start: Optional[int] = None
+
+    @classmethod
+    def build(cls, path: str) -> "LSFIndex":
+        """Index a file in one pass over its bytes."""
+        index = cls(path)
+        index._scan(None)
+        return index
+
+    @classmethod
+    def load(cls, index_path: str, path: Optional[str] = None) -> "LSFIndex":
+        """
+        Load an index written by save()
+
+        Args:
+            index_path: Path of the index file
+            path: Path of the indexed LSF file; defaults to index_path
+                without its suffix
+
+        Raises:
+            ValueError: If the file is not a valid LSF index
+        """
+        if path is None:
+            if not index_path.endswith(INDEX_SUFFIX):
+                raise ValueError("path is required when the index has no .lsfidx suffix")
+            path = index_path[:-len(INDEX_SUFFIX)]
+        index = cls(path)
+        with open(index_path, "rb") as f:
+            data = f.read()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"Not an LSF index: {index_path}")
+        magic, index.file_size, last_start, index.head_digest, index.tail_digest, index.mtime_ns, count = (
+            _HEADER.unpack_from(data)
+        )
+        if magic != _MAGIC:
+            raise ValueError(f"Not an LSF index: {index_path}")
+        index.last_start = None if last_start == _NO_OBJECT else last_start
+
+        # Three little-endian uint64 columns (offset, length and name length
+        # in characters) are followed by all names as one UTF-8 string
+        columns = []
+        pos = _HEADER.size
+        for _ in range(3):
+            column = array("Q")
+            column.frombytes(data[pos:pos + count * 8])
+            if len(column) != count:
+                raise ValueError(f"Corrupt LSF index {index_path}")
+            if _BIG_ENDIAN:
+                column.byteswap()
+            columns.append(column)
+            pos += count * 8
+        offsets, lengths, name_lengths = columns
+        try:
+            names = data[pos:].decode("utf-8")
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Corrupt LSF index {index_path}: {e}") from None
+        ends = list(accumulate(name_lengths))
+        if (ends[-1] if ends else 0) != len(names):
+            raise ValueError(f"Corrupt LSF index {index_path}")
+        keys = [names[end - size:end] for end, size in zip(ends, name_lengths)]
+        index.entries = dict(zip(keys, zip(offsets, lengths)))
+        return index
+
+    def save(self, index_path: Optional[str] = None) -> str:
+        """
+        Write the index next to the LSF file, or to index_path
+
+        Returns:
+            Path of the written index file
+        """
+        if index_path is None:
+            index_path = self.path + INDEX_SUFFIX
+        parts: List[bytes] = [_HEADER.pack(
+            _MAGIC, self.file_size,
+            _NO_OBJECT if self.last_start is None else self.last_start,
+            self.head_digest, self.tail_digest, self.mtime_ns, len(self.entries),
+        )]
+        entries = self.entries
+        columns = (
+            array("Q", [offset for offset, _ in entries.values()]),
+            array("Q", [length for _, length in entries.values()]),
+            array("Q", map(len, entries)),
+        )
+        for column in columns:
+            if _BIG_ENDIAN:
+                column.byteswap()
+            parts.append(column.tobytes())
+        parts.append("".join(entries).encode("utf-8"))
+        # Write atomically so readers never see a partial index
+        temp_path = index_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(b"".join(parts))
+        os.replace(temp_path, index_path)
+        return index_path
+
+    def status(self) -> str:
+        """
+        Compare the index with the file on disk
+
+        Returns:
+            FRESH if the file is unchanged, APPENDED if data was only added
+            at the end, STALE if indexed bytes changed, the file shrank, or
+            it was modified without changing size
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return STALE
+        size = stat.st_size
+        if size < self.file_size or (size == self.file_size and stat.st_mtime_ns != self.mtime_ns):
+            return STALE
+        with open(self.path, "rb") as f:
+            mapped = _map_file(f)
+            if mapped is None:
+                return FRESH if self.file_size == 0 else STALE
+            with mapped:
+                digests = _fingerprint(mapped, self.file_size)
+        if digests != (self.head_digest, self.tail_digest):
+            return STALE
+        return FRESH if size == self.file_size else APPENDED
+
+    def refresh(self) -> str:
+        """
+        Bring the index up to date with the file on disk
+
+        Appended data is indexed by rescanning from the start of the last
+        object, which the new data may extend. A stale index is rebuilt.
+
+        Returns:
+            The status before refreshing
+        """
+        state = self.status()
+        if state == APPENDED:
+            self._drop_partial_last()
+            self._scan(self.last_start)
+        elif state == STALE:
+            self.entries = {}
+            self.last_start = None
+            self._scan(None)
+        return state
+
+    def _drop_partial_last(self) -> None:
+        """
+        Forget the last object if its name record was cut off by the end of
+        the indexed data, so the appended data cannot leave a truncated name
+        behind. An earlier occurrence of that name becomes its entry again.
+        """
+        last_start = self.last_start
+        if last_start is None:
+            return
+        with open(self.path, "rb") as f:
+            mapped = _map_file(f)
+            if mapped is None:
+                return
+            with mapped:
+                if _TERMINATOR.search(mapped, last_start, self.file_size) is not None:
+                    # The name is complete; rescanning only extends the object
+                    return
+                name = next((name for name, (offset, _) in self.entries.items() if offset == last_start), None)
+                if name is None:
+                    return
+                previous = None
+                for other, start, end in self._objects(mapped, None, self.file_size):
+                    if start >= last_start:
+                        break
+                    if other == name:
+                        previous = (start, end - start)
+        if previous is None:
+            del self.entries[name]
+        else:
+            self.entries[name] = previous
+
+    def _scan(self, first_start: Optional[int]) -> None:
+        """Index objects from first_start, or from the start of the file."""
+        entries = self.entries
+        with open(self.path, "rb") as f:
+            self.mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+            mapped = _map_file(f)
+            if mapped is None:
+                self.file_size = 0
+                self.head_digest, self.tail_digest = _fingerprint(b"", 0)
+                return
+            with mapped:
+                size = len(mapped)
+                for name, start, end in self._objects(mapped, first_start, size):
+                    entries[name] = (start, end - start)
+                    self.last_start = start
+                self.file_size = size
+                self.head_digest, self.tail_digest = _fingerprint(mapped, size)
+
+    def _objects(self, mapped, first_start: Optional[int], end: int) -> Iterator[Tuple[str, int, int]]:
+        """Yield (name, start, end) of the objects from first_start up to end."""
+        if first_start is None:
+            # Leading whitespace makes the first record unrecognised
+            start = 0 if mapped[:3] == b"$o~" else None
+            pos = 0
+        else:
+            start = pos = first_start
+        search = _OBJECT_START.search
+        terminator = _TERMINATOR.search
+        decode_name = self._decode_name
+
+        def named(start: int, end: int) -> Tuple[str, int, int]:
+            match = terminator(mapped, start, end)
+            return decode_name(mapped[start + 3:match.start() if match else end]), start, end
+
+        while True:
+            match = search(mapped, pos, end)
+            if match is None:
+                break
+            if start is not None:
+                yield named(start, match.start())
+            start = pos = match.end()
+        if start is not None:
+            yield named(start, end)
+
+    @staticmethod
+    def _decode_name(raw: bytes) -> str:
+        return raw.decode("utf-8")
+
+
+class IndexedLSFFile(Mapping):
+    """
+    Read-only mapping over an LSF file that decodes objects through an index
+
+    The sidecar index is loaded (or built and saved) on open and refreshed
+    when the file has changed. Looking up a name reads and decodes only that
+    object, through ``mmap`` or with ``seek`` and ``read``.
+
+    Example:
+        >>> with IndexedLSFFile("export.lsf") as data:
+        ...     user = data["user42"]
+    """
+
+    def __init__(self, path: str, index_path: Optional[str] = None,
+                 use_mmap: bool = True, save_index: bool = True):
+        """
+        Args:
+            path: Path of the LSF file
+            index_path: Path of the sidecar index (default: path + ".lsfidx")
+            use_mmap: Read objects through mmap instead of seek and read
+            save_index: Write the index back when it was built or refreshed
+        """
+        if index_path is None:
+            index_path = path + INDEX_SUFFIX
+        if os.path.exists(index_path):
+            try:
+                index = LSFIndex.load(index_path, path)
+                changed = index.refresh() != FRESH
+            except ValueError:
+                index, changed = LSFIndex.build(path), True
+        else:
+            index, changed = LSFIndex.build(path), True
+        if changed and save_index:
+            index.save(index_path)
+        self.index = index
+
+        self._file = open(path, "rb")
+        self._mapped = _map_file(self._file) if use_mmap else None
+        self._decoder = BufferLSFDecoder()
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        offset, length = self.index.entries[name]
+        if self._mapped is not None:
+            data = self._mapped[offset:offset + length]
+        else:
+            self._file.seek(offset)
+            data = self._file.read(length)
+        return self._decoder.decode(data)[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index.entries)
+
+    def __len__(self) -> int:
+        return len(self.index.entries)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.index.entries
+
+    def close(self) -> None:
+        """Release the file and its mapping."""
+        if self._mapped is not None:
+            self._mapped.close()
+            self._mapped = None
+        self._file.close()
+
+    def __enter__(self) -> "IndexedLSFFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point: build, check or query a sidecar index."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m lsf.index", description="Sidecar object index for LSF files")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="build or refresh the index of a file")
+    build.add_argument("file")
+    build.add_argument("--rebuild", action="store_true", help="ignore an existing index")
+    status = commands.add_parser("status", help="report whether the index is fresh, appended or stale")
+    status.add_argument("file")
+    get = commands.add_parser("get", help="print one object as JSON")
+    get.add_argument("file")
+    get.add_argument("name")
+    args = parser.parse_args(argv)
+
+    index_path = args.file + INDEX_SUFFIX
+    if args.command == "build":
+        if args.rebuild or not os.path.exists(index_path):
+            index = LSFIndex.build(args.file)
+            state = "built"
+        else:
+            index = LSFIndex.load(index_path, args.file)
+            state = {FRESH: "up to date", APPENDED: "refreshed", STALE: "rebuilt"}[index.refresh()]
+        index.save(index_path)
+        print(f"{index_path}: {len(index.entries)} objects, {state}")
+    elif args.command == "status":
+        if not os.path.exists(index_path):
+            print("missing")
+            return 1
+        state = LSFIndex.load(index_path, args.file).status()
+        print(state)
+        return 0 if state == FRESH else 1
+    else:
+        with IndexedLSFFile(args.file) as data:
+            if args.name not in data:
+                print(f"No object named {args.name!r}", file=sys.stderr)
+                return 1
+            print(json.dumps(data[args.name], indent=2, ensure_ascii=False, default=repr))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+"""
+String interning for LSF decoding
+
+This module provides bounded tables that map each key and object name to
+one shared ``str`` object, and a decoder that uses them, so that keys such
+as ``id`` or ``status`` repeated across millions of objects and many decode
+calls are held once. Low-cardinality field values can be shared the same way.
+"""
+
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Set
+
+from .bulk_decoder import BulkLSFDecoder
+
+# Most keys held by a table
+DEFAULT_MAX_SIZE = 10_000
+
+# Most object names held by a table, and names remembered as seen once
+DEFAULT_MAX_NAMES = 10_000
+
+# Most distinct values of one key before its values stop being interned
+DEFAULT_VALUE_CARDINALITY = 64
+
+# Longer values are never interned
+DEFAULT_MAX_VALUE_LENGTH = 64
+
+# Marks a key whose values have not been seen yet
+_NEW: Dict[str, str] = {}
+
+
+class InternStats(NamedTuple):
+    """
+    Lookup counts of an InternTable
+
+    ``size`` is the number of interned keys, ``names`` the number of
+    interned object names, and ``value_keys`` the number of keys whose
+    values are still being interned.
+    """
+
+    lookups: int
+    hits: int
+    value_lookups: int
+    value_hits: int
+    size: int
+    value_keys: int
+    name_lookups: int
+    name_hits: int
+    names: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of key lookups answered by the table."""
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    @property
+    def name_hit_rate(self) -> float:
+        """Share of object name lookups answered by the table."""
+        return self.name_hits / self.name_lookups if self.name_lookups else 0.0
+
+    @property
+    def value_hit_rate(self) -> float:
+        """Share of value lookups answered by the table."""
+        return self.value_hits / self.value_lookups if self.value_lookups else 0.0
+
+
+class InternTable:
+    """
+    Bounded table of shared strings for keys, object names and values
+
+    Once ``max_size`` keys are held, new keys are returned unchanged
+    instead of being added. Object names are held apart, up to
+    ``max_names``, and only added when seen a second time, so names used
+    once, such as ``tx1`` ... ``txN``, neither fill the table nor crowd out
+    keys. Values are interned per key: a key that shows more than
+    ``value_cardinality`` distinct values, such as an id, is dropped from
+    value interning for good, while keys like ``status`` keep sharing their
+    few values. A table can be shared by any number of decoders and decode
+    calls.
+
+    Example:
+        >>> table = InternTable()
+        >>> a = table.intern("".join(["st", "atus"]))
+        >>> a is table.intern("".join(["sta", "tus"]))
+        True
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE,
+                 value_cardinality: int = DEFAULT_VALUE_CARDINALITY,
+                 max_value_length: int = DEFAULT_MAX_VALUE_LENGTH,
+                 max_names: int = DEFAULT_MAX_NAMES):
+        """
+        Args:
+            max_size: Most keys to hold
+            value_cardinality: Most distinct values held per key
+            max_value_length: Longest value that is interned
+            max_names: Most object names to hold, and to remember as seen
+                once before they are added
+        """
+        self.max_size = max_size
+        self.value_cardinality = value_cardinality
+        self.max_value_length = max_value_length
+        self.max_names = max_names
+        self._strings: Dict[str, str] = {}
+        self._names: Dict[str, str] = {}
+        # Names seen once since the set was last emptied
+        self._seen_names: Set[str] = set()
+        # Key -> its values, or None once it has too many distinct values
+        self._values: Dict[str, Optional[Dict[str, str]]] = {}
+        self._lookups = self._misses = 0
+        self._value_lookups = self._value_misses = 0
+        self._name_lookups = self._name_misses = 0
+
+    def intern(self, s: str) -> str:
+        """Return the shared copy of a key."""
+        self._lookups += 1
+        interned = self._strings.get(s)
+        if interned is None:
+            self._misses += 1
+            interned = self._add(s)
+        return interned
+
+    def intern_name(self, name: str) -> str:
+        """Return the shared copy of an object name, if it is interned."""
+        self._name_lookups += 1
+        interned = self._names.get(name)
+        if interned is None:
+            self._name_misses += 1
+            interned = self._add_name(name)
+        return interned
+
+    def intern_value(self, key: str, value: str) -> str:
+        """Return the shared copy of a value of the given key, if it is interned."""
+        if len(value) > self.max_value_length:
+            return value
+        values = self._values.get(key, _NEW)
+        if values is None:
+            return value
+        self._value_lookups += 1
+        interned = values.get(value)
+        if interned is None:
+            self._value_misses += 1
+            interned = self._add_value(key, values, value)
+        return interned
+
+    def _add(self, s: str) -> str:
+        if len(self._strings) < self.max_size:
+            self._strings[s] = s
+        return s
+
+    def _add_name(self, name: str) -> str:
+        seen = self._seen_names
+        if name in seen:
+            if len(self._names) < self.max_names:
+                seen.discard(name)
+                self._names[name] = name
+        else:
+            if len(seen) >= self.max_names:
+                # Forget the names seen once so far rather than growing
+                seen.clear()
+            seen.add(name)
+        return name
+
+    def _add_value(self, key: str, values: Optional[Dict[str, str]], value: str) -> str:
+        if values is _NEW:
+            if len(self._values) >= self.max_size:
+                return value
+            values = self._values[key] = {}
+        if len(values) < self.value_cardinality:
+            values[value] = value
+        else:
+            # Too many distinct values: stop interning this key's values
+            self._values[key] = None
+        return value
+
+    def _count(self, lookups: int, misses: int, value_lookups: int, value_misses: int,
+               name_lookups: int, name_misses: int) -> None:
+        self._lookups += lookups
+        self._misses += misses
+        self._value_lookups += value_lookups
+        self._value_misses += value_misses
+        self._name_lookups += name_lookups
+        self._name_misses += name_misses
+
+    def stats(self) -> InternStats:
+        """Return the lookup counts since creation or the last clear()."""
+        return InternStats(
+            lookups=self._lookups,
+            hits=self._lookups - self._misses,
+            value_lookups=self._value_lookups,
+            value_hits=self._value_lookups - self._value_misses,
+            size=len(self._strings),
+            value_keys=sum(values is not None for values in self._values.values()),
+            name_lookups=self._name_lookups,
+            name_hits=self._name_lookups - self._name_misses,
+            names=len(self._names),
+        )
+
+    def clear(self) -> None:
+        """Forget every interned string and reset the counts."""
+        self._strings.clear()
+        self._names.clear()
+        self._seen_names.clear()
+        self._values.clear()
+        self._lookups = self._misses = 0
+        self._value_lookups = self._value_misses = 0
+        self._name_lookups = self._name_misses = 0
+
+
+# Table used by InterningLSFDecoder unless it is given its own
+shared_table = InternTable()
+
+
+class InterningLSFDecoder(BulkLSFDecoder):
+    """
+    Decoder that shares key and object name strings through an InternTable
+
+    The result and errors are identical to BulkLSFDecoder; only the identity
+    of equal strings differs. With ``intern_values``, untyped string values
+    (not lists) are shared too, for keys with few distinct values.
+
+    Example:
+        >>> decoder = InterningLSFDecoder(intern_values=True)
+        >>> decoder.decode("$o~tx1$r~$f~status$f~completed$r~")
+        {'tx1': {'status': 'completed'}}
+    """
+
+    def __init__(self, table: Optional[InternTable] = None, intern_values: bool = False):
+        """
+        Args:
+            table: Table to use (default: the per-process shared_table)
+            intern_values: Also intern low-cardinality string values
+        """
+        super().__init__()
+        self._table = shared_table if table is None else table
+        self._intern_values = intern_values
+
+    def _decode_records(self, records: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        self._errors = errors = []
+        result = {}
+        fields = None
+        converters = self._converters
+        table = self._table
+        strings = table._strings
+        add = table._add
+        value_tables = table._values if self._intern_values else None
+        add_value = table._add_value
+        max_value_length = table.max_value_length
+        names = table._names
+        add_name = table._add_name
+        lookups = misses = value_lookups = value_misses = name_lookups = name_misses = 0
+
+        for record in records:
+            if not record:
+                continue
+            tag = record[:3]
+
+            if tag == "$f~":
+                if fields is not None:
+                    parts = record.split("$f~")
+                    if len(parts) == 3:
+                        key = parts[1]
+                        lookups += 1
+                        interned = strings.get(key)
+                        if interned is None:
+                            misses += 1
+                            interned = add(key)
+                        value = parts[2]
+                        if "$l~" in value:
+                            value = value.split("$l~")
+                        elif value_tables is not None and len(value) <= max_value_length:
+                            values = value_tables.get(interned, _NEW)
+                            if values is not None:
+                                value_lookups += 1
+                                shared = values.get(value)
+                                if shared is None:
+                                    value_misses += 1
+                                    shared = add_value(interned, values, value)
+                                value = shared
+                        fields[interned] = value
+
+            elif tag == "$t~":
+                if fields is not None:
+                    parts = record.split("$f~", 2)
+                    if len(parts) == 3:
+                        type_hint = parts[0][3:]
+                        convert = converters.get(type_hint)
+                        try:
+                            if convert is None:
+                                value = self._convert_typed_value(type_hint, parts[2])
+                            else:
+                                value = convert(parts[2])
+                        except Exception as e:
+                            errors.append(f"Error parsing typed field {record}: {str(e)}")
+                        else:
+                            key = parts[1]
+                            lookups += 1
+                            interned = strings.get(key)
+                            if interned is None:
+                                misses += 1
+                                interned = add(key)
+                            fields[interned] = value
+
+            elif tag == "$o~":
+                name = record[3:]
+                name_lookups += 1
+                interned = names.get(name)
+                if interned is None:
+                    name_misses += 1
+                    interned = add_name(name)
+                fields = result[interned] = {}
+                if not name:
+                    fields = None
+
+            elif tag == "$e~":
+                errors.append(record[3:])
+
+            # We ignore transaction markers ($x~) during decoding
+
+        table._count(lookups, misses, value_lookups, value_misses, name_lookups, name_misses)
+        return result
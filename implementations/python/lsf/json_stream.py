@@ -0,0 +1,294 @@
+"""
+Streaming LSF to JSON conversion
+
+This module converts LSF (LLM-Safe Format) straight to JSON text, one
+object at a time, without building the decoded dictionary first.
+"""
+
+import base64
+import io
+from json.encoder import encode_basestring_ascii
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+from .bulk_decoder import TYPE_CONVERTERS
+from .incremental import DEFAULT_CHUNK_SIZE, IncrementalLSFDecoder, read_text
+
+# Marks a bin field, which json.dumps() cannot serialize either
+_BYTES = object()
+
+_INFINITY = float("inf")
+
+
+def _float_json(value: float) -> str:
+    # Same spelling as json.dumps(), including its non-finite extensions
+    if value != value:
+        return "NaN"
+    if value == _INFINITY:
+        return "Infinity"
+    if value == -_INFINITY:
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+class _JSONEmitter(IncrementalLSFDecoder):
+    """
+    Incremental decoder that renders each object as JSON text
+
+    Records are parsed with the same rules as LSFDecoder, but each field is
+    rendered to its JSON member text as soon as it is read. A repeated key
+    replaces the earlier member in place, as in a dictionary. Objects are
+    written as they end, so a repeated object name raises ValueError unless
+    sort_keys holds every object until the input ends.
+    """
+
+    def __init__(self, indent: Optional[Union[int, str]], sort_keys: bool):
+        super().__init__(keep_result=False)
+        self._sort_keys = sort_keys
+        if indent is None:
+            self._top = ("{", ", ", "}")
+            self._member_sep = ", "
+            self._object_open, self._object_close = "{", "}"
+            self._list_open, self._list_sep, self._list_close = "[", ", ", "]"
+        else:
+            if not isinstance(indent, str):
+                indent = " " * indent
+            self._top = ("{\n" + indent, ",\n" + indent, "\n}")
+            self._member_sep = ",\n" + indent * 2
+            self._object_open, self._object_close = "{\n" + indent * 2, "\n" + indent + "}"
+            self._list_open = "[\n" + indent * 3
+            self._list_sep = ",\n" + indent * 3
+            self._list_close = "\n" + indent * 2 + "]"
+        self._name: Optional[str] = None
+        self._members: Optional[Dict[str, object]] = None
+        self._has_bytes = False
+        self._output: List[str] = []
+        self._emitted = 0
+        # With sort_keys every object must be seen before the first is written
+        self._sorted: Optional[Dict[str, str]] = {} if sort_keys else None
+        # Names of the objects ended so far, to reject a repeated name
+        self._seen: Set[str] = set()
+        # First object with a bin field, reported once no repeated name can be
+        self._bytes_name: Optional[str] = None
+
+    def take_output(self) -> str:
+        """Return and clear the JSON text produced so far."""
+        output = "".join(self._output)
+        self._output.clear()
+        return output
+
+    def finish(self) -> str:
+        """Close the decoder and return the rest of the JSON text."""
+        self.close()
+        self._end_object()
+        output = self._output
+        if self._sorted is not None:
+            for name in sorted(self._sorted):
+                self._write_object(name, self._sorted[name])
+            self._sorted = None
+        elif self._bytes_name is not None:
+            raise TypeError("Object of type bytes is not JSON serializable")
+        output.append(self._top[2] if self._emitted else "{}")
+        return self.take_output()
+
+    def _write_object(self, name: str, text: str) -> None:
+        if text is _BYTES:
+            raise TypeError("Object of type bytes is not JSON serializable")
+        self._output.append(self._top[1] if self._emitted else self._top[0])
+        self._output.append(encode_basestring_ascii(name))
+        self._output.append(": ")
+        self._output.append(text)
+        self._emitted += 1
+
+    def _end_object(self) -> None:
+        name = self._name
+        if name is None:
+            return
+        self._name = None
+        members = self._members
+        if not members:
+            text = "{}"
+        elif self._has_bytes and any(member is _BYTES for member in members.values()):
+            # A later object with the same name may still replace this one
+            text = _BYTES
+        else:
+            values = members.values()
+            if self._sort_keys:
+                values = [members[key] for key in sorted(members)]
+            text = self._object_open + self._member_sep.join(values) + self._object_close
+        self._has_bytes = False
+        if self._sorted is not None:
+            self._sorted[name] = text
+            return
+        if name in self._seen:
+            raise ValueError(
+                f"Repeated object name {name!r}: its earlier JSON is already written. "
+                "Use sort_keys=True or lsf_to_json() to keep the last one."
+            )
+        self._seen.add(name)
+        if text is _BYTES:
+            if self._bytes_name is None:
+                self._bytes_name = name
+        else:
+            self._write_object(name, text)
+
+    def _complete_records(self, records: List[str]) -> None:
+        enc = encode_basestring_ascii
+        members = self._members
+        list_open = self._list_open
+        list_sep = self._list_sep
+        list_close = self._list_close
+        strip = False
+
+        for record in records:
+            if strip:
+                record = record.lstrip()
+            strip = True
+            if not record:
+                continue
+            tag = record[:3]
+
+            if tag == "$f~":
+                if members is not None:
+                    parts = record.split("$f~")
+                    if len(parts) == 3:
+                        key = parts[1]
+                        value = parts[2]
+                        if "$l~" in value:
+                            members[key] = enc(key) + ": " + list_open + list_sep.join(map(enc, value.split("$l~"))) + list_close
+                        else:
+                            members[key] = enc(key) + ": " + enc(value)
+
+            elif tag == "$t~":
+                if members is not None:
+                    parts = record.split("$f~", 2)
+                    if len(parts) == 3:
+                        type_hint = parts[0][3:]
+                        key = parts[1]
+                        value = parts[2]
+                        # Conversion errors drop the field, as in LSFDecoder
+                        try:
+                            if type_hint == "int":
+                                text = int.__repr__(int(value))
+                            elif type_hint == "float":
+                                text = _float_json(float(value))
+                            elif type_hint == "bool":
+                                text = "true" if value.lower() == "true" else "false"
+                            elif type_hint == "null":
+                                text = "null"
+                            elif type_hint == "str":
+                                text = enc(value)
+                            elif type_hint == "int[]" or type_hint == "float[]":
+                                items = TYPE_CONVERTERS[type_hint](value)
+                                if items:
+                                    render = int.__repr__ if type_hint == "int[]" else _float_json
+                                    text = list_open + list_sep.join(map(render, items)) + list_close
+                                else:
+                                    text = "[]"
+                            elif type_hint == "bin":
+                                base64.b64decode(value)
+                                members[key] = _BYTES
+                                self._has_bytes = True
+                                continue
+                            else:
+                                continue
+                        except Exception:
+                            continue
+                        members[key] = enc(key) + ": " + text
+
+            elif tag == "$o~":
+                self._end_object()
+                self._name = record[3:]
+                # An empty name opens an object that accepts no fields
+                members = self._members = {} if self._name else None
+
+            # Error ($e~) and transaction ($x~) records do not appear in JSON
+
+        self._members = members
+
+
+def iter_lsf_to_json(
+    source: Union[str, IO, Iterable[Union[str, bytes]]],
+    indent: Optional[Union[int, str]] = None,
+    sort_keys: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8",
+) -> Iterator[str]:
+    """
+    Convert LSF to JSON text incrementally
+
+    Each object is written as soon as it is complete, so memory depends on
+    the largest object rather than on the document size. For documents with
+    unique object names the concatenated output equals
+    ``lsf_to_json(source, indent, sort_keys)``.
+
+    An object is written when the next one starts, before a later object
+    can replace it, so a repeated object name raises ValueError; the names
+    seen so far are kept to detect it. With ``sort_keys=True`` objects are
+    only written at the end of the input, in sorted order with the last
+    object of each name as in ``lsf_to_json``, which holds all of the JSON
+    text in memory.
+
+    Args:
+        source: A str, a text or binary file object, or an iterable of str
+            or bytes chunks
+        indent: Indentation level for pretty-printing (None for compact)
+        sort_keys: Whether to sort dictionary keys in the output
+        chunk_size: Number of characters (or bytes) to read at a time
+        encoding: Encoding used to decode bytes
+
+    Returns:
+        Iterator of JSON text chunks
+
+    Raises:
+        ValueError: If an object name repeats and sort_keys is False
+        TypeError: If a bin field would appear in the output; without
+            sort_keys this is raised once the input ends
+
+    Example:
+        >>> "".join(iter_lsf_to_json("$o~user$r~$f~name$f~John$r~$t~int$f~age$f~30$r~"))
+        '{"user": {"name": "John", "age": 30}}'
+    """
+    emitter = _JSONEmitter(indent, sort_keys)
+    for chunk in read_text(source, chunk_size, encoding):
+        emitter.feed(chunk)
+        output = emitter.take_output()
+        if output:
+            yield output
+    yield emitter.finish()
+
+
+def dump_lsf_to_json(
+    source: Union[str, IO, Iterable[Union[str, bytes]]],
+    fp: IO,
+    indent: Optional[Union[int, str]] = None,
+    sort_keys: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8",
+) -> None:
+    """
+    Convert LSF to JSON and write it to a file object
+
+    Args:
+        source: A str, a text or binary file object, or an iterable of str
+            or bytes chunks
+        fp: A text or binary file object opened for writing; JSON is written
+            to binary files as ASCII
+        indent: Indentation level for pretty-printing (None for compact)
+        sort_keys: Whether to sort dictionary keys in the output
+        chunk_size: Number of characters (or bytes) to read at a time
+        encoding: Encoding used to decode bytes read from source
+
+    Raises:
+        ValueError: If an object name repeats and sort_keys is False, as
+            the earlier object is already written; output up to that
+            object has been written to fp
+        TypeError: If a bin field would appear in the output
+
+    Example:
+        >>> with open("data.json", "w") as out, open("data.lsf", "rb") as f:
+        ...     dump_lsf_to_json(f, out, indent=2)
+    """
+    binary = isinstance(fp, (io.RawIOBase, io.BufferedIOBase))
+    write = fp.write
+    for chunk in iter_lsf_to_json(source, indent, sort_keys, chunk_size, encoding):
+        write(chunk.encode("ascii") if binary else chunk)
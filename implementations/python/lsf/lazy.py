@@ -0,0 +1,115 @@
+"""
+Lazy LSF decoding
+
+This module provides a read-only mapping over an LSF (LLM-Safe Format)
+string that decodes each object only when it is first accessed.
+"""
+
+import re
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+from .decoder import FieldSelection
+from .engines import get_decoder
+
+# A $o~ record that follows a terminator and the whitespace skipped after it
+_OBJECT_RECORD = re.compile(r"\$r~\s*(?=\$o~)")
+
+
+def index_objects(lsf_str: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Find the object records of an LSF string without decoding any fields
+
+    Args:
+        lsf_str: LSF formatted string
+
+    Returns:
+        Dictionary mapping each object name to the (start, end) range of its
+        last occurrence, in order of first occurrence, matching the keys
+        LSFDecoder.decode() would produce
+
+    Example:
+        >>> index_objects("$o~a$r~$f~x$f~1$r~$o~b$r~")
+        {'a': (0, 15), 'b': (18, 25)}
+    """
+    index: Dict[str, Tuple[int, int]] = {}
+    # Each object runs from its $o~ record to the terminator before the next
+    # one. The first record is only an object if the document starts with
+    # one; leading whitespace makes the first record unrecognised.
+    starts = [0] if lsf_str.startswith("$o~") else []
+    ends = []
+    for match in _OBJECT_RECORD.finditer(lsf_str):
+        if starts:
+            ends.append(match.start())
+        starts.append(match.end())
+    ends.append(len(lsf_str))
+
+    find = lsf_str.find
+    for start, end in zip(starts, ends):
+        name_end = find("$r~", start, end)
+        if name_end == -1:
+            name_end = end
+        index[lsf_str[start + 3:name_end]] = (start, end)
+    return index
+
+
+class LazyLSFMapping(Mapping):
+    """
+    Read-only mapping of object names to fields, decoded on first access
+
+    Building the mapping only records where each object starts and ends.
+    Looking an object up decodes that object alone with the selected engine
+    and keeps the result. Keys, iteration order, values and equality are
+    those of the dictionary ``from_lsf()`` returns.
+
+    Example:
+        >>> data = LazyLSFMapping("$o~a$r~$t~int$f~x$f~1$r~$o~b$r~$f~y$f~2$r~")
+        >>> list(data)
+        ['a', 'b']
+        >>> data["a"]
+        {'x': 1}
+    """
+
+    def __init__(self, lsf_str: str, engine: str = "auto", fields: Optional[FieldSelection] = None):
+        """
+        Args:
+            lsf_str: LSF formatted string
+            engine: Decode engine used for each object
+            fields: Only decode these fields of each object, as for from_lsf()
+        """
+        self._source = lsf_str
+        self._engine = engine
+        self._fields = fields
+        self._index = index_objects(lsf_str)
+        self._decoded: Dict[str, Dict[str, Any]] = {}
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        try:
+            return self._decoded[name]
+        except KeyError:
+            pass
+        start, end = self._index[name]
+        text = self._source[start:end]
+        decoder = get_decoder(self._engine, text)
+        if self._fields is None:
+            fields = decoder.decode(text)[name]
+        else:
+            fields = decoder.decode(text, fields=self._fields)[name]
+        self._decoded[name] = fields
+        return fields
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    def is_decoded(self, name: str) -> bool:
+        """Return whether an object has already been decoded."""
+        return name in self._decoded
+
+    def __repr__(self) -> str:
+        decoded = len(self._decoded)
+        return f"<{type(self).__name__} with {len(self)} objects, {decoded} decoded>"
@@ -0,0 +1,251 @@
+"""
+Parallel LSF decoding
+
+This module decodes many independent LSF (LLM-Safe Format) documents in
+worker processes, sending them in batches so that each task amortizes the
+cost of pickling and scheduling, and decodes one large file in parallel by
+splitting it at object boundaries.
+"""
+
+import mmap
+import os
+import sys
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+from .buffer_decoder import BufferLSFDecoder, decode_buffer, decode_file
+from .engines import get_decoder
+from .index import _OBJECT_START
+
+# Documents sent to a worker per task by default
+DEFAULT_CHUNKSIZE = 64
+
+# Smallest part of a file worth decoding in a separate process
+MIN_PARTITION_SIZE = 1 << 20
+
+
+class DecodeResult(NamedTuple):
+    """
+    Outcome of decoding one document
+
+    ``data`` is the decoded dictionary and ``errors`` the decoder's error
+    list, as from ``get_errors()``. If decoding raised, ``data`` is None and
+    ``exception`` holds the exception.
+    """
+
+    data: Optional[Dict[str, Dict[str, Any]]]
+    errors: List[str]
+    exception: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the document was decoded without raising."""
+        return self.exception is None
+
+
+def _decode_one(document: Union[str, bytes], engine: str) -> DecodeResult:
+    try:
+        if isinstance(document, str):
+            decoder = get_decoder(engine, document)
+        else:
+            decoder = BufferLSFDecoder()
+        data = decoder.decode(document)
+    except Exception as e:
+        return DecodeResult(None, [], e)
+    return DecodeResult(data, decoder.get_errors())
+
+
+def _decode_batch(documents: List[Union[str, bytes]], engine: str) -> List[DecodeResult]:
+    return [_decode_one(document, engine) for document in documents]
+
+
+def iter_decode_many(
+    documents: Iterable[Union[str, bytes]],
+    workers: Optional[int] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    engine: str = "auto",
+    executor: Optional[Executor] = None,
+) -> Iterator[DecodeResult]:
+    """
+    Decode documents in worker processes, yielding results in input order
+
+    Documents are read lazily and sent in batches of ``chunksize``; at most
+    two batches per worker are in flight, so memory stays bounded for
+    unbounded inputs. A document that fails to decode yields a result with
+    its exception instead of stopping the others.
+
+    Args:
+        documents: LSF documents as str, or as UTF-8 bytes
+        workers: Number of worker processes (default: os.cpu_count());
+            1 decodes in the calling process. With an executor, sets how
+            many batches are kept in flight.
+        chunksize: Number of documents per task
+        engine: Decode engine for str documents (see from_lsf)
+        executor: An existing executor to reuse instead of starting a
+            process pool; it is not shut down
+
+    Returns:
+        Iterator of DecodeResult, one per document
+
+    Raises:
+        ValueError: If workers or chunksize is not positive
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be positive")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be positive")
+
+    iterator = iter(documents)
+    batches = iter(lambda: list(islice(iterator, chunksize)), [])
+    if executor is None and workers == 1:
+        for batch in batches:
+            yield from _decode_batch(batch, engine)
+        return
+
+    pool = executor if executor is not None else ProcessPoolExecutor(workers)
+    try:
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.submit(_decode_batch, batch, engine))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        if executor is None:
+            if sys.version_info >= (3, 9):
+                # Drop queued batches if the caller stopped iterating early
+                pool.shutdown(cancel_futures=True)
+            else:
+                pool.shutdown()
+
+
+def decode_many(
+    documents: Iterable[Union[str, bytes]],
+    workers: Optional[int] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    engine: str = "auto",
+    executor: Optional[Executor] = None,
+) -> List[DecodeResult]:
+    """
+    Decode many independent documents in parallel
+
+    Args:
+        documents: LSF documents as str, or as UTF-8 bytes
+        workers: Number of worker processes (default: os.cpu_count())
+        chunksize: Number of documents sent to a worker per task
+        engine: Decode engine for str documents (see from_lsf)
+        executor: An existing executor to reuse instead of starting a
+            process pool
+
+    Returns:
+        List of DecodeResult in input order
+
+    Example:
+        >>> results = decode_many(responses, workers=4)
+        >>> [r.data for r in results if r.ok]
+    """
+    return list(iter_decode_many(documents, workers, chunksize, engine, executor))
+
+
+def partition_offsets(data, parts: int) -> List[int]:
+    """
+    Find split points that start new objects near equal-sized offsets
+
+    Each split point is the start of a ``$o~`` record that follows a
+    terminator, so every part after the first begins with an object and
+    decodes independently.
+
+    Args:
+        data: bytes, memoryview or mmap holding UTF-8 LSF
+        parts: Number of parts wanted
+
+    Returns:
+        Sorted offsets, starting with 0 and ending with len(data); fewer
+        parts are returned when objects are larger than a part
+    """
+    size = len(data)
+    offsets = [0]
+    for part in range(1, parts):
+        target = max(size * part // parts, offsets[-1])
+        match = _OBJECT_START.search(data, target)
+        if match is None:
+            break
+        if match.end() > offsets[-1]:
+            offsets.append(match.end())
+    offsets.append(size)
+    return offsets
+
+
+def _decode_partition(path: str, start: int, end: int, errors: str) -> Dict[str, Dict[str, Any]]:
+    # Every worker maps the same file, so the pages are shared by the OS
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view, view[start:end] as part:
+                return decode_buffer(part, errors=errors)
+
+
+def decode_file_parallel(
+    path: str,
+    workers: Optional[int] = None,
+    errors: str = "strict",
+    executor: Optional[Executor] = None,
+    min_partition_size: int = MIN_PARTITION_SIZE,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Decode one large LSF file in parallel, split at object boundaries
+
+    The memory-mapped file is cut into parts at ``$o~`` records near equal
+    offsets, each worker process decodes its parts from its own mapping of
+    the file, and the results are merged in document order with
+    ``dict.update``, which keeps the first position and the last value of a
+    repeated object name. The result equals ``decode_file(path, errors)``.
+
+    Args:
+        path: Path of a UTF-8 encoded LSF file
+        workers: Number of worker processes (default: os.cpu_count())
+        errors: How to handle invalid UTF-8, as for ``bytes.decode``
+        executor: An existing executor to reuse instead of starting a
+            process pool
+        min_partition_size: Files are cut into parts of at least this many
+            bytes; smaller files are decoded in the calling process
+
+    Returns:
+        Dictionary representing the parsed data
+
+    Raises:
+        ValueError: If workers is not positive
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be positive")
+    size = os.path.getsize(path)
+    # A few parts per worker even out objects of uneven size
+    parts = min(4 * workers, size // max(min_partition_size, 1))
+    if parts < 2 or (workers == 1 and executor is None):
+        return decode_file(path, errors)
+
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            offsets = partition_offsets(mapped, parts)
+    if len(offsets) < 3:
+        return decode_file(path, errors)
+
+    pool = executor if executor is not None else ProcessPoolExecutor(workers)
+    try:
+        futures = [
+            pool.submit(_decode_partition, path, start, end, errors)
+            for start, end in zip(offsets, offsets[1:])
+        ]
+        result: Dict[str, Dict[str, Any]] = {}
+        for future in futures:
+            result.update(future.result())
+        return result
+    finally:
+        if executor is None:
+            pool.shutdown()
@@ -0,0 +1,433 @@
+"""
+Schema-compiled LSF decoding and encoding
+
+This module decodes objects whose field set and types are known in advance
+into instances of generated ``__slots__`` classes (or plain tuples) instead
+of dictionaries, with the converter for every field bound ahead of time.
+It also encodes such objects through a generated function per object type
+that writes the whole object with one string template.
+"""
+
+import binascii
+import keyword
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from .bulk_decoder import TYPE_CONVERTERS, BulkLSFDecoder
+from .encoder import _ITEM_FORMATTERS, _LIST_TYPECODES
+from .simple import _append_object
+
+
+def _to_list(value: str) -> List[str]:
+    return value.split("$l~") if value else []
+
+
+# Converters for the schema field types; None keeps the raw string
+SCHEMA_CONVERTERS: Dict[str, Optional[Callable[[str], Any]]] = {
+    **TYPE_CONVERTERS,
+    "str": None,
+    "list": _to_list,
+}
+
+FieldType = Union[str, Callable[[str], Any]]
+
+
+def make_record_class(class_name: str, field_names: Iterable[str]) -> type:
+    """
+    Create a class with ``__slots__`` for the given fields
+
+    Instances take the field values positionally, compare equal when their
+    values are equal, and provide ``_fields`` and ``_asdict()`` like a named
+    tuple.
+
+    Args:
+        class_name: Name of the generated class
+        field_names: Field names, which must be valid identifiers
+
+    Returns:
+        The generated class
+
+    Raises:
+        ValueError: If a field name is not a valid identifier or is repeated
+
+    Example:
+        >>> User = make_record_class("User", ["id", "name"])
+        >>> User(1, "Ann")
+        User(id=1, name='Ann')
+    """
+    field_names = tuple(field_names)
+    for name in field_names:
+        if not name.isidentifier() or keyword.iskeyword(name) or name.startswith("__"):
+            raise ValueError(f"Field name is not a valid identifier: {name!r}")
+    if len(set(field_names)) != len(field_names):
+        raise ValueError(f"Duplicate field name in {field_names!r}")
+
+    # A generated __init__ assigns each slot directly, which is much faster
+    # than setattr() in a loop
+    arguments = "".join(f", {name}" for name in field_names)
+    body = "".join(f"\n    self.{name} = {name}" for name in field_names) or "\n    pass"
+    namespace: Dict[str, Any] = {}
+    exec(f"def __init__(self{arguments}):{body}", namespace)
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in field_names)
+        return f"{class_name}({values})"
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in field_names)
+
+    def _asdict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in field_names}
+
+    return type(class_name, (), {
+        "__slots__": field_names,
+        "__init__": namespace["__init__"],
+        "__repr__": __repr__,
+        "__eq__": __eq__,
+        "__hash__": None,
+        "_fields": field_names,
+        "_asdict": _asdict,
+    })
+
+
+class _CompiledSchema(NamedTuple):
+    factory: Callable[..., Any]
+    index: Dict[str, int]
+    converters: Tuple[Optional[Callable[[str], Any]], ...]
+    defaults: Tuple[Any, ...]
+
+
+class SchemaLSFDecoder(BulkLSFDecoder):
+    """
+    Decoder that builds records for objects with a registered schema
+
+    A schema lists the fields of an object type and their types: one of the
+    LSF type hints ("str", "int", "float", "bool", "null", "bin", "int[]",
+    "float[]"), "list" for ``$l~`` lists (always a list, empty for an empty
+    value), or any callable converting the raw string. Values are converted by the schema
+    regardless of the record's own type hint, fields missing from a record
+    are None and fields not in the schema are ignored. A value the schema
+    type cannot convert is reported like a failed typed field and left as
+    None.
+
+    Objects without a schema are decoded into dictionaries exactly as by
+    BulkLSFDecoder.
+
+    Example:
+        >>> decoder = SchemaLSFDecoder()
+        >>> User = decoder.register("user", {"id": "int", "name": "str"})
+        >>> decoder.decode("$o~user$r~$t~int$f~id$f~7$r~$f~name$f~Ann$r~")
+        {'user': User(id=7, name='Ann')}
+    """
+
+    def __init__(self, type_of: Optional[Callable[[str], str]] = None):
+        """
+        Args:
+            type_of: Maps an object name to the name its schema is registered
+                under, e.g. ``lambda name: name.rstrip("0123456789")`` for
+                objects named "tx1", "tx2", ... (default: the name itself)
+        """
+        super().__init__()
+        self._schemas: Dict[str, _CompiledSchema] = {}
+        self._type_of = type_of
+
+    def register(self, object_type: str, fields: Mapping[str, FieldType],
+                 as_tuple: bool = False, class_name: Optional[str] = None) -> type:
+        """
+        Register the schema of an object type
+
+        Args:
+            object_type: Object name (or type, with type_of) the schema applies to
+            fields: Field names mapped to their types, in record order
+            as_tuple: Build plain tuples in field order instead of instances
+                of a generated class, which allows any field names
+            class_name: Name of the generated class (default: object_type
+                in CamelCase)
+
+        Returns:
+            The record class, or ``tuple`` when as_tuple is set
+
+        Raises:
+            ValueError: If a field type is unknown or a field name cannot be
+                used as an attribute
+        """
+        converters = []
+        for key, field_type in fields.items():
+            if callable(field_type):
+                converters.append(field_type)
+            elif field_type in SCHEMA_CONVERTERS:
+                converters.append(SCHEMA_CONVERTERS[field_type])
+            else:
+                raise ValueError(f"Unknown field type for {key!r}: {field_type!r}")
+
+        if as_tuple:
+            factory, record_class = (lambda *values: values), tuple
+        else:
+            if class_name is None:
+                class_name = "".join(part.capitalize() for part in object_type.split("_")) or "Record"
+                if not class_name.isidentifier():
+                    class_name = "Record"
+            factory = record_class = make_record_class(class_name, fields)
+
+        self._schemas[object_type] = _CompiledSchema(
+            factory=factory,
+            index={key: position for position, key in enumerate(fields)},
+            converters=tuple(converters),
+            defaults=(None,) * len(converters),
+        )
+        return record_class
+
+    def decode(self, lsf_str: str, fields: None = None) -> Dict[str, Any]:
+        """
+        Decode an LSF string, building records for registered object types
+
+        Args:
+            lsf_str: The LSF formatted string
+            fields: Not supported; schemas already select the fields
+
+        Returns:
+            Dictionary mapping object names to records or dictionaries
+
+        Raises:
+            ValueError: If fields is given
+        """
+        if fields is not None:
+            raise ValueError("SchemaLSFDecoder selects fields through its schemas")
+        return self._decode_records(self._records(lsf_str))
+
+    def _decode_records(self, records: Iterable[str]) -> Dict[str, Any]:
+        self._errors = errors = []
+        result: Dict[str, Any] = {}
+        fields = None
+        converters = TYPE_CONVERTERS
+        schemas = self._schemas
+        type_of = self._type_of
+        # State of the current schema object
+        name = None
+        schema = None
+        values = None
+        index = None
+        field_converters = None
+
+        for record in records:
+            if not record:
+                continue
+            tag = record[:3]
+
+            if values is not None and (tag == "$f~" or tag == "$t~"):
+                # Field of a schema object: look up its position and converter
+                if tag == "$f~":
+                    parts = record.split("$f~")
+                else:
+                    parts = record.split("$f~", 2)
+                if len(parts) == 3:
+                    position = index.get(parts[1])
+                    if position is not None:
+                        convert = field_converters[position]
+                        if convert is None:
+                            values[position] = parts[2]
+                        else:
+                            try:
+                                values[position] = convert(parts[2])
+                            except Exception as e:
+                                kind = "field" if tag == "$f~" else "typed field"
+                                errors.append(f"Error parsing {kind} {record}: {str(e)}")
+
+            elif tag == "$f~":
+                if fields is not None:
+                    parts = record.split("$f~")
+                    if len(parts) == 3:
+                        value = parts[2]
+                        if "$l~" in value:
+                            value = value.split("$l~")
+                        fields[parts[1]] = value
+
+            elif tag == "$t~":
+                if fields is not None:
+                    parts = record.split("$f~", 2)
+                    if len(parts) == 3:
+                        type_hint = parts[0][3:]
+                        convert = converters.get(type_hint)
+                        try:
+                            if convert is None:
+                                fields[parts[1]] = self._convert_typed_value(type_hint, parts[2])
+                            else:
+                                fields[parts[1]] = convert(parts[2])
+                        except Exception as e:
+                            errors.append(f"Error parsing typed field {record}: {str(e)}")
+
+            elif tag == "$o~":
+                if values is not None:
+                    result[name] = schema.factory(*values)
+                name = record[3:]
+                schema = schemas.get(type_of(name) if type_of is not None else name) if name else None
+                if schema is None:
+                    values = None
+                    # An empty name opens an object that accepts no fields
+                    fields = result[name] = {}
+                    if not name:
+                        fields = None
+                else:
+                    fields = None
+                    values = list(schema.defaults)
+                    index = schema.index
+                    field_converters = schema.converters
+                    # Reserve the position of the first occurrence
+                    result[name] = None
+
+            elif tag == "$e~":
+                errors.append(record[3:])
+
+            # We ignore transaction markers ($x~) during decoding
+
+        if values is not None:
+            result[name] = schema.factory(*values)
+        return result
+
+
+def _format_null(value: Any) -> str:
+    return ""
+
+
+def _format_list(values: Iterable[Any]) -> str:
+    return "$l~".join(map(str, values))
+
+
+def _format_bin(value: bytes) -> str:
+    return binascii.b2a_base64(value, newline=False).decode("ascii")
+
+
+def _typed_list_formatter(typecode: str) -> Callable[[Any], str]:
+    format_item = _ITEM_FORMATTERS[typecode]
+
+    def format_values(values: Any) -> str:
+        if not isinstance(values, array) or values.typecode != typecode:
+            values = array(typecode, values.tolist() if hasattr(values, "tolist") else values)
+        return "$l~".join(map(format_item, values))
+
+    return format_values
+
+
+# Record prefix and formatter of each schema field type; a formatter of
+# None writes str() of the value
+SCHEMA_FORMATTERS: Dict[str, Tuple[str, Optional[Callable[[Any], str]]]] = {
+    "str": ("$f~", None),
+    "int": ("$t~int$f~", None),
+    "float": ("$t~float$f~", None),
+    "bool": ("$t~bool$f~", None),
+    "null": ("$t~null$f~", _format_null),
+    "bin": ("$t~bin$f~", _format_bin),
+    "list": ("$f~", _format_list),
+    **{f"{hint}[]": (f"$t~{hint}[]$f~", _typed_list_formatter(typecode))
+       for hint, typecode in _LIST_TYPECODES.items()},
+}
+
+
+class _CompiledTemplate(NamedTuple):
+    encode: Callable[[str, Mapping[str, Any]], str]
+    size: int
+
+
+def _compile_template(fields: Mapping[str, FieldType]) -> _CompiledTemplate:
+    """Generate a function writing an object with these fields as one f-string."""
+    # Keys, prefixes and formatters are passed as globals rather than pasted
+    # into the source, so any key is safe
+    namespace: Dict[str, Any] = {}
+    pieces = ["$o~{name}$r~"]
+    for position, (key, field_type) in enumerate(fields.items()):
+        if callable(field_type):
+            kind, formatter = "$f~", field_type
+        elif field_type in SCHEMA_FORMATTERS:
+            kind, formatter = SCHEMA_FORMATTERS[field_type]
+        else:
+            raise ValueError(f"Unknown field type for {key!r}: {field_type!r}")
+        namespace[f"_k{position}"] = key
+        namespace[f"_p{position}"] = f"{kind}{key}$f~"
+        if formatter is None:
+            pieces.append(f"{{_p{position}}}{{obj[_k{position}]!s}}$r~")
+        else:
+            namespace[f"_f{position}"] = formatter
+            pieces.append(f"{{_p{position}}}{{_f{position}(obj[_k{position}])}}$r~")
+    exec(f"def encode(name, obj):\n    return f{''.join(pieces)!r}", namespace)
+    return _CompiledTemplate(encode=namespace["encode"], size=len(fields))
+
+
+class SchemaLSFEncoder:
+    """
+    Encoder that writes objects with a registered schema from a template
+
+    A schema lists the fields of an object type in output order with their
+    types: one of the LSF type hints ("str", "int", "float", "bool",
+    "null", "bin", "int[]", "float[]"), "list" for ``$l~`` lists, or a
+    callable returning the value as a string, written as an untyped field.
+    Each schema is compiled into one function that writes a whole object as
+    a single f-string, with no per-value type dispatch. Values are written
+    as the schema says, so they must match it: ``None`` is only written as
+    null by a "null" field.
+
+    Objects without a schema, or whose keys are not exactly the schema's,
+    are written as by to_lsf(). With schemas that match the values' types
+    in the same field order, the output equals to_lsf()'s.
+
+    Example:
+        >>> encoder = SchemaLSFEncoder()
+        >>> encoder.register("user", {"id": "int", "name": "str", "tags": "list"})
+        >>> encoder.encode({"user": {"id": 7, "name": "Ann", "tags": ["a", "b"]}})
+        '$o~user$r~$t~int$f~id$f~7$r~$f~name$f~Ann$r~$f~tags$f~a$l~b$r~'
+    """
+
+    def __init__(self, type_of: Optional[Callable[[str], str]] = None):
+        """
+        Args:
+            type_of: Maps an object name to the name its schema is registered
+                under, as for SchemaLSFDecoder (default: the name itself)
+        """
+        self._templates: Dict[str, _CompiledTemplate] = {}
+        self._type_of = type_of
+
+    def register(self, object_type: str, fields: Mapping[str, FieldType]) -> None:
+        """
+        Register the schema of an object type
+
+        Args:
+            object_type: Object name (or type, with type_of) the schema applies to
+            fields: Field names mapped to their types, in output order
+
+        Raises:
+            ValueError: If a field type is unknown
+        """
+        self._templates[object_type] = _compile_template(fields)
+
+    def encode(self, data: Union[Mapping[str, Mapping[str, Any]],
+                                 Iterable[Tuple[str, Mapping[str, Any]]]]) -> str:
+        """
+        Encode objects to an LSF string
+
+        Args:
+            data: Mapping of object name to fields, or an iterable of
+                (object name, fields) pairs
+
+        Returns:
+            LSF formatted string
+        """
+        if isinstance(data, Mapping):
+            data = data.items()
+        templates = self._templates
+        type_of = self._type_of
+        parts = []
+        append = parts.append
+
+        for name, fields in data:
+            template = templates.get(type_of(name) if type_of is not None else name) if name else None
+            if template is not None and len(fields) == template.size:
+                try:
+                    append(template.encode(name, fields))
+                    continue
+                except KeyError:
+                    # Same number of keys, but not the schema's
+                    pass
+            _append_object(append, name, fields)
+
+        return "".join(parts)
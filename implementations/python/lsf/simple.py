@@ -5,16 +5,46 @@ This module provides simple functions for common LSF operations.
 """
 
 import base64
-from typing import Any, Dict, List, Union
+from array import array
+from binascii import b2a_base64
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
 
-from .encoder import LSFEncoder
-from .decoder import LSFDecoder
+from .decoder import FieldSelection
+from .encoder import BINARY_RUN_RECORDS, _text_encoder, _typed_list_record
+from .engines import get_decoder
+from .lazy import LazyLSFMapping
+
+# Type hints of typed lists for array typecodes and NumPy dtype kinds
+_ARRAY_TYPE_HINTS = {
+    **dict.fromkeys("bBhHiIlLqQ", "int"),
+    **dict.fromkeys("fd", "float"),
+}
+_NUMPY_TYPE_HINTS = {"i": "int", "u": "int", "f": "float"}
+
+# Characters of LSF text per chunk yielded by iter_encode
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_LIST_SEPARATOR = "$l~"
+
+
+def _list_type_hint(value: Any) -> Optional[str]:
+    """Return the typed list hint for an array, or None."""
+    if isinstance(value, array):
+        return _ARRAY_TYPE_HINTS.get(value.typecode)
+    dtype = getattr(value, "dtype", None)
+    if dtype is not None and getattr(value, "ndim", None) == 1:
+        return _NUMPY_TYPE_HINTS.get(dtype.kind)
+    return None
 
 
 def to_lsf(data: Dict[str, Dict[str, Any]]) -> str:
     """
     Convert a nested dictionary to LSF format
     
+    Lists are written as string lists. ``array.array`` values and
+    one-dimensional NumPy arrays of integers or floats are written as typed
+    lists, which decode back to ``array('q')`` or ``array('d')``.
+    
     Args:
         data: Dictionary to convert (must have object names as top-level keys)
         
@@ -25,36 +55,246 @@ def to_lsf(data: Dict[str, Dict[str, Any]]) -> str:
         >>> to_lsf({"user": {"id": 123, "name": "John", "tags": ["admin", "user"]}})
         '$o~user$r~$f~id$f~123$r~$f~name$f~John$r~$f~tags$f~admin$l~user$r~'
     """
-    encoder = LSFEncoder()
+    parts: List[str] = []
+    append = parts.append
+    writers = _FIELD_WRITERS
     
+    # The loop of _append_object, inlined
     for obj_name, obj_data in data.items():
-        encoder.start_object(obj_name)
+        append(f"$o~{obj_name}$r~")
+        for key, value in obj_data.items():
+            cls = type(value)
+            if cls is str:
+                append(f"$f~{key}$f~{value}$r~")
+            else:
+                writer = writers.get(cls)
+                if writer is None:
+                    writer = _field_writer(cls)
+                append(writer(key, value))
+    
+    return "".join(parts)
+
+
+def encode_to_bytes(
+    data: Mapping[str, Mapping[str, Any]], chunks: bool = False, encoding: str = "utf-8",
+) -> Union[bytearray, List[bytes]]:
+    """
+    Convert a nested dictionary to LSF bytes
+    
+    Equal to ``to_lsf(data).encode(encoding)``, without holding the whole
+    document as str: records are encoded into the output a run at a time
+    by one incremental encoder, and in encodings that write ASCII as ASCII
+    the base64 of bytes values is added as bytes without being turned into
+    str and encoded back.
+    
+    Args:
+        data: Dictionary to convert (must have object names as top-level keys)
+        chunks: Return a list of bytes chunks, as taken by
+            ``socket.sendmsg`` or ``writelines``, instead of one bytearray
+        encoding: Encoding of the output
+        
+    Returns:
+        A bytearray, or a list of bytes with ``chunks=True``
         
+    Example:
+        >>> encode_to_bytes({"user": {"id": 1, "avatar": b"png"}})
+        bytearray(b'$o~user$r~$t~int$f~id$f~1$r~$t~bin$f~avatar$f~cG5n$r~')
+    """
+    output: Union[bytearray, List[bytes]] = [] if chunks else bytearray()
+    emit = output.append if chunks else output.extend
+    encode, raw_base64 = _text_encoder(encoding)
+    parts: List[str] = []
+    append = parts.append
+    writers = _FIELD_WRITERS
+    
+    # The loop of _append_object, with bin fields written as bytes
+    for obj_name, obj_data in data.items():
+        if len(parts) >= BINARY_RUN_RECORDS:
+            emit(encode("".join(parts)))
+            parts.clear()
+        append(f"$o~{obj_name}$r~")
         for key, value in obj_data.items():
-            if isinstance(value, list):
-                encoder.add_list(key, value)
-            elif isinstance(value, int) and not isinstance(value, bool):
-                encoder.add_typed_field(key, value, "int")
-            elif isinstance(value, float):
-                encoder.add_typed_field(key, value, "float")
-            elif isinstance(value, bool):
-                encoder.add_typed_field(key, value, "bool")
-            elif value is None:
-                encoder.add_typed_field(key, value, "null")
-            elif isinstance(value, bytes):
-                encoder.add_typed_field(key, value, "bin")
+            cls = type(value)
+            if cls is str:
+                append(f"$f~{key}$f~{value}$r~")
+                continue
+            writer = writers.get(cls)
+            if writer is None:
+                writer = _field_writer(cls)
+            if writer is _write_bin and raw_base64:
+                append(f"$t~bin$f~{key}$f~")
+                emit(encode("".join(parts)))
+                parts.clear()
+                emit(b2a_base64(value, newline=False))
+                append("$r~")
             else:
-                encoder.add_field(key, value)
+                append(writer(key, value))
+    
+    if parts:
+        emit(encode("".join(parts)))
+    return output
+
+
+def _write_list(key: str, value: List[Any]) -> str:
+    return f"$f~{key}$f~{_LIST_SEPARATOR.join(map(str, value))}$r~"
+
+
+def _write_int(key: str, value: int) -> str:
+    return f"$t~int$f~{key}$f~{value!s}$r~"
+
+
+def _write_float(key: str, value: float) -> str:
+    return f"$t~float$f~{key}$f~{value!s}$r~"
+
+
+def _write_bool(key: str, value: bool) -> str:
+    return f"$t~bool$f~{key}$f~{value!s}$r~"
+
+
+def _write_null(key: str, value: None) -> str:
+    return f"$t~null$f~{key}$f~$r~"
+
+
+def _write_bin(key: str, value: bytes) -> str:
+    return f"$t~bin$f~{key}$f~{b2a_base64(value, newline=False).decode('ascii')}$r~"
+
+
+def _write_text(key: str, value: Any) -> str:
+    return f"$f~{key}$f~{value!s}$r~"
+
+
+def _write_other(key: str, value: Any) -> str:
+    type_hint = _list_type_hint(value)
+    if type_hint is not None:
+        return _typed_list_record(key, value, type_hint)
+    return f"$f~{key}$f~{value!s}$r~"
+
+# Field writers of the types to_lsf treats specially; subclasses are
+# written as their base. str is missing so that str subclasses go through
+# str() like any other value.
+_BASE_WRITERS: Dict[type, Callable[[str, Any], str]] = {
+    list: _write_list,
+    int: _write_int,
+    float: _write_float,
+    bool: _write_bool,
+    type(None): _write_null,
+    bytes: _write_bin,
+}
+
+# Field writer of each value type seen so far (exact str is written inline).
+# Builtin containers cannot be arrays, so they skip the typed list check.
+_FIELD_WRITERS: Dict[type, Callable[[str, Any], str]] = {
+    **_BASE_WRITERS,
+    **dict.fromkeys((dict, tuple, set, frozenset, bytearray, complex), _write_text),
+}
+
+# Most value types remembered, in case classes are created on the fly
+_MAX_FIELD_WRITERS = 1000
+
+
+def _field_writer(cls: type) -> Callable[[str, Any], str]:
+    """Find the writer of a value type through its MRO and remember it."""
+    for base in cls.__mro__:
+        writer = _BASE_WRITERS.get(base)
+        if writer is not None:
+            break
+    else:
+        writer = _write_other
+    if len(_FIELD_WRITERS) < _MAX_FIELD_WRITERS:
+        _FIELD_WRITERS[cls] = writer
+    return writer
+
+
+def _append_object(append: Callable[[str], None], obj_name: str, obj_data: Mapping[str, Any]) -> None:
+    """Append the records of one object, choosing each field's type from its value."""
+    writers = _FIELD_WRITERS
+    append(f"$o~{obj_name}$r~")
+    
+    for key, value in obj_data.items():
+        cls = type(value)
+        if cls is str:
+            append(f"$f~{key}$f~{value}$r~")
+        else:
+            writer = writers.get(cls)
+            if writer is None:
+                writer = _field_writer(cls)
+            append(writer(key, value))
+
+
+def iter_encode(
+    records: Union[Iterable[Tuple[str, Mapping[str, Any]]], Mapping[str, Mapping[str, Any]]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE, binary: bool = False, encoding: str = "utf-8",
+) -> Iterator[Union[str, bytes]]:
+    """
+    Encode records to LSF lazily, yielding chunks of the output
+    
+    Records are pulled from the iterable only as chunks are consumed, so a
+    database cursor can feed a file or socket without the whole data set
+    or the whole document being held. Fields are typed as in to_lsf(), and
+    the chunks joined together equal ``to_lsf(dict(records))`` when the
+    object names are unique.
+    
+    Args:
+        records: Iterable of (object name, fields mapping) pairs, or a
+            mapping of object name to fields
+        chunk_size: Characters per chunk; a chunk can exceed it by at most
+            one field. Output is held until chunk_size characters are
+            pending, so up to chunk_size plus one object's output is held.
+        binary: Yield bytes in ``encoding`` instead of str
+        encoding: Encoding of the bytes chunks, applied by one incremental
+            encoder so a BOM is written only once
+        
+    Returns:
+        Iterator of str chunks, or bytes chunks with ``binary=True``
+        
+    Example:
+        >>> rows = ((f"tx{n}", {"amount": n}) for n in range(3))
+        >>> list(iter_encode(rows))
+        ['$o~tx0$r~$t~int$f~amount$f~0$r~$o~tx1$r~$t~int$f~amount$f~1$r~$o~tx2$r~$t~int$f~amount$f~2$r~']
+    """
+    if isinstance(records, Mapping):
+        records = records.items()
+    encode = _text_encoder(encoding)[0] if binary else None
+    parts: List[str] = []
+    append = parts.append
+    # Characters pending in parts since the last chunk ended
+    size = 0
+    
+    for obj_name, obj_data in records:
+        counted = len(parts)
+        _append_object(append, obj_name, obj_data)
+        start = 0
+        for end in range(counted, len(parts)):
+            size += len(parts[end])
+            if size >= chunk_size:
+                chunk = "".join(parts[start:end + 1])
+                yield encode(chunk) if binary else chunk
+                start = end + 1
+                size = 0
+        del parts[:start]
     
-    return encoder.to_string()
+    if parts:
+        chunk = "".join(parts)
+        yield encode(chunk) if binary else chunk
 
 
-def from_lsf(lsf_str: str) -> Dict[str, Dict[str, Any]]:
+def from_lsf(
+    lsf_str: str, engine: str = "auto", lazy: bool = False,
+    fields: Optional[FieldSelection] = None,
+) -> Mapping[str, Dict[str, Any]]:
     """
     Convert an LSF string to a nested dictionary
     
     Args:
         lsf_str: LSF formatted string
+        engine: Decode engine name (see lsf.engines.available_engines()),
+            or "auto" to pick one based on the input's size and shape
+        lazy: Return a read-only LazyLSFMapping that decodes each object
+            on first access instead of a dictionary
+        fields: Only decode these fields: a mapping of object name to field
+            names (None keeps every field of that object), or a predicate
+            called with (object name, field name). Other fields are skipped
+            without being sliced or converted.
         
     Returns:
         Dictionary representing the parsed data
@@ -62,6 +302,12 @@ def from_lsf(lsf_str: str) -> Dict[str, Dict[str, Any]]:
     Example:
         >>> from_lsf('$o~user$r~$f~id$f~123$r~$f~name$f~John$r~')
         {'user': {'id': '123', 'name': 'John'}}
+        >>> from_lsf('$o~user$r~$f~id$f~123$r~$f~name$f~John$r~', fields={"user": ["name"]})
+        {'user': {'name': 'John'}}
     """
-    decoder = LSFDecoder()
+    if lazy:
+        return LazyLSFMapping(lsf_str, engine, fields)
+    decoder = get_decoder(engine, lsf_str)
+    if fields is not None:
+        return decoder.decode(lsf_str, fields=fields)
     return decoder.decode(lsf_str) 
\ No newline at end of file
@@ -0,0 +1,40 @@
+"""
+LSF 3.0 parser
+
+A two-pass parser for the LSF 3.0 dialect (``$o~``, ``$f~``, ``$v~``,
+``$t~``), ported from the C# and JavaScript implementations.
+"""
+
+from .token_scanner import (
+    TOKEN_FIELD,
+    TOKEN_OBJECT,
+    TOKEN_TYPE_HINT,
+    TOKEN_VALUE,
+    TokenScanner,
+    TokenScanResult,
+)
+from .dom_builder import (
+    NO_HINT,
+    NODE_FIELD,
+    NODE_OBJECT,
+    NODE_VALUE,
+    DOM,
+    DOMBuilder,
+)
+from .dom_navigator import DOMNavigator
+
+__all__ = [
+    "TOKEN_OBJECT",
+    "TOKEN_FIELD",
+    "TOKEN_VALUE",
+    "TOKEN_TYPE_HINT",
+    "TokenScanner",
+    "TokenScanResult",
+    "NODE_OBJECT",
+    "NODE_FIELD",
+    "NODE_VALUE",
+    "NO_HINT",
+    "DOM",
+    "DOMBuilder",
+    "DOMNavigator",
+]
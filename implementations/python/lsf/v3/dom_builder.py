@@ -0,0 +1,222 @@
+"""
+LSF v3 DOM Builder for Python
+
+This module provides the second pass of the LSF 3.0 parser: it turns the
+tokens found by TokenScanner into a flat document object model stored as a
+struct of parallel typed arrays, one entry per node.
+"""
+
+from array import array
+from itertools import accumulate, compress
+from typing import Union
+
+from .token_scanner import (
+    TOKEN_FIELD,
+    TOKEN_LENGTH,
+    TOKEN_OBJECT,
+    TOKEN_TYPE_HINT,
+    TOKEN_VALUE,
+    TokenScanner,
+    TokenScanResult,
+)
+
+# Node types reuse the token types of the tokens that create them
+NODE_OBJECT = TOKEN_OBJECT
+NODE_FIELD = TOKEN_FIELD
+NODE_VALUE = TOKEN_VALUE
+
+# Stored in DOM.hints for values without a type hint (plain strings)
+NO_HINT = 0
+
+# Parent index of top-level objects
+INVALID_INDEX = -1
+
+
+class DOM:
+    """
+    Flat LSF 3.0 document object model as a struct of arrays
+
+    Node ``i`` is described by the i-th entry of each array:
+
+    - ``types``: ``NODE_OBJECT``, ``NODE_FIELD`` or ``NODE_VALUE``
+    - ``token_positions``: byte offset of the token that created the node;
+      implicit nodes use the position of the token that required them
+    - ``data_positions`` / ``data_lengths``: byte range of the object name,
+      field name or value in ``buffer`` (0 / 0 for implicit nodes)
+    - ``parents``: index of the parent node, or -1 for objects
+    - ``hints``: first byte of the value's ``$t~`` hint, or ``NO_HINT``
+
+    Children are stored in compressed sparse row form: the children of node
+    ``i`` are ``children[child_offsets[i]:child_offsets[i + 1]]``, in document
+    order, so no per-node list is allocated. ``roots`` lists the objects.
+    """
+
+    __slots__ = (
+        "buffer", "types", "token_positions", "data_positions", "data_lengths",
+        "parents", "hints", "child_offsets", "children", "roots",
+    )
+
+    def __init__(self, buffer, types, token_positions, data_positions, data_lengths,
+                 parents, hints, child_offsets, children, roots):
+        self.buffer = buffer
+        self.types = types
+        self.token_positions = token_positions
+        self.data_positions = data_positions
+        self.data_lengths = data_lengths
+        self.parents = parents
+        self.hints = hints
+        self.child_offsets = child_offsets
+        self.children = children
+        self.roots = roots
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def get_children(self, index: int) -> array:
+        """Return the indices of the children of a node."""
+        offsets = self.child_offsets
+        return self.children[offsets[index]:offsets[index + 1]]
+
+    def get_data(self, index: int) -> memoryview:
+        """Return the raw bytes of a node's name or value without copying."""
+        start = self.data_positions[index]
+        return memoryview(self.buffer)[start:start + self.data_lengths[index]]
+
+    def nbytes(self) -> int:
+        """Return the memory used by the node arrays, excluding the buffer."""
+        return sum(
+            data.itemsize * len(data)
+            for data in (self.types, self.token_positions, self.data_positions, self.data_lengths,
+                         self.parents, self.hints, self.child_offsets, self.children, self.roots)
+        )
+
+
+class DOMBuilder:
+    """
+    Builder for the LSF 3.0 DOM
+
+    Follows the C# DOMBuilder: a ``$f~`` or ``$v~`` before any ``$o~``
+    creates an implicit object, a ``$v~`` without a field creates an
+    implicit field, consecutive ``$v~`` tokens form an implicit array, and a
+    non-empty ``$t~`` hint applies only to the value directly before it.
+
+    Example:
+        >>> dom = DOMBuilder().build(TokenScanner().scan(b"$o~user$f~tags$v~a$v~b"))
+        >>> len(dom), list(dom.get_children(1))
+        (4, [2, 3])
+    """
+
+    def build(self, tokens: Union[TokenScanResult, bytes, bytearray, memoryview, str]) -> DOM:
+        """
+        Build the DOM from scanned tokens
+
+        Args:
+            tokens: Result of TokenScanner.scan(), or input to scan first
+
+        Returns:
+            DOM over the scanned buffer
+        """
+        if not isinstance(tokens, TokenScanResult):
+            tokens = TokenScanner().scan(tokens)
+        buffer = tokens.buffer
+        token_types = tokens.types
+        token_positions = tokens.positions
+        count = tokens.count
+        position_code = token_positions.typecode
+
+        types = array("B")
+        node_tokens = array(position_code)
+        data_positions = array(position_code)
+        data_lengths = array(position_code)
+        parents = array("i" if count < 1 << 30 else "q")
+        hints = array("B")
+        add_type = types.append
+        add_token = node_tokens.append
+        add_position = data_positions.append
+        add_length = data_lengths.append
+        add_parent = parents.append
+        add_hint = hints.append
+
+        current_object = INVALID_INDEX
+        current_field = INVALID_INDEX
+        last_value = INVALID_INDEX
+        nodes = 0
+        ends = iter(token_positions)
+        next(ends, None)
+
+        for token_type, position in zip(token_types, token_positions):
+            data_start = position + TOKEN_LENGTH
+            data_length = next(ends, len(buffer)) - data_start
+
+            if token_type == TOKEN_VALUE:
+                if current_field == INVALID_INDEX:
+                    if current_object == INVALID_INDEX:
+                        # Implicit object when a value comes first
+                        add_type(NODE_OBJECT); add_token(position); add_position(0)
+                        add_length(0); add_parent(INVALID_INDEX); add_hint(NO_HINT)
+                        current_object = nodes
+                        nodes += 1
+                    # Implicit field for a value without one
+                    add_type(NODE_FIELD); add_token(position); add_position(0)
+                    add_length(0); add_parent(current_object); add_hint(NO_HINT)
+                    current_field = nodes
+                    nodes += 1
+                add_type(NODE_VALUE); add_token(position); add_position(data_start)
+                add_length(data_length); add_parent(current_field); add_hint(NO_HINT)
+                last_value = nodes
+                nodes += 1
+
+            elif token_type == TOKEN_FIELD:
+                if current_object == INVALID_INDEX:
+                    # Implicit object when a field comes first
+                    add_type(NODE_OBJECT); add_token(position); add_position(0)
+                    add_length(0); add_parent(INVALID_INDEX); add_hint(NO_HINT)
+                    current_object = nodes
+                    nodes += 1
+                add_type(NODE_FIELD); add_token(position); add_position(data_start)
+                add_length(data_length); add_parent(current_object); add_hint(NO_HINT)
+                current_field = nodes
+                last_value = INVALID_INDEX
+                nodes += 1
+
+            elif token_type == TOKEN_TYPE_HINT:
+                # A hint must follow a value and have data; it applies once
+                if last_value != INVALID_INDEX and data_length > 0:
+                    hints[last_value] = buffer[data_start]
+                last_value = INVALID_INDEX
+
+            elif token_type == TOKEN_OBJECT:
+                add_type(NODE_OBJECT); add_token(position); add_position(data_start)
+                add_length(data_length); add_parent(INVALID_INDEX); add_hint(NO_HINT)
+                current_object = nodes
+                current_field = INVALID_INDEX
+                last_value = INVALID_INDEX
+                nodes += 1
+
+        child_offsets, children, roots = self._link_children(parents)
+        return DOM(buffer, types, node_tokens, data_positions, data_lengths,
+                   parents, hints, child_offsets, children, roots)
+
+    @staticmethod
+    def _link_children(parents: array):
+        """Group node indices by parent into compressed sparse row arrays."""
+        count = len(parents)
+        index_code = "I" if count < 1 << 32 else "Q"
+        # Count the children of each node, then give each node the slots
+        # after those of the nodes before it
+        counts = array(index_code, [0]) * count
+        for parent in parents:
+            if parent != INVALID_INDEX:
+                counts[parent] += 1
+        child_offsets = array(index_code, accumulate(counts, initial=0))
+        del counts
+        roots = array(index_code, compress(range(count), map(INVALID_INDEX.__eq__, parents)))
+        # Filling in node order keeps the children of each parent in document order
+        children = array(index_code, [0]) * (count - len(roots))
+        next_slots = child_offsets[:-1]
+        for node, parent in enumerate(parents):
+            if parent != INVALID_INDEX:
+                slot = next_slots[parent]
+                children[slot] = node
+                next_slots[parent] = slot + 1
+        return child_offsets, children, roots
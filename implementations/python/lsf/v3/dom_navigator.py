@@ -0,0 +1,200 @@
+"""
+LSF v3 DOM Navigator for Python
+
+This module provides read access to a DOM built by DOMBuilder. Raw data is
+returned as ``memoryview`` slices of the input buffer, and names and typed
+values are decoded only when they are first read.
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Union
+
+from .dom_builder import DOM, DOMBuilder, NO_HINT
+
+# Number of decoded names and values kept by default
+DEFAULT_CACHE_SIZE = 4096
+
+
+def _to_number(text: str) -> Union[int, float]:
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _to_datetime(text: str) -> datetime:
+    # datetime.fromisoformat() only accepts a "Z" suffix from Python 3.11
+    if text.endswith(("Z", "z")):
+        text = text[:-1] + "+00:00"
+    return datetime.fromisoformat(text)
+
+
+# Converters for the LSF 3.0 type codes, keyed by the hint byte. Values with
+# no hint, "s" or an unknown code are returned as strings.
+VALUE_CONVERTERS = {
+    ord("n"): _to_number,
+    ord("f"): float,
+    ord("b"): lambda text: text.lower() == "true",
+    ord("d"): _to_datetime,
+    ord("z"): lambda text: None,
+}
+
+
+class DOMNavigator:
+    """
+    Lazy, zero-copy reader for an LSF 3.0 DOM
+
+    ``get_raw()`` returns a ``memoryview`` of a node's bytes without copying.
+    ``get_name()`` and ``get_value()`` decode a single node on demand, so
+    reading a few fields of a huge document costs only those fields. Decoded
+    results are kept in an LRU cache of ``cache_size`` entries; pass 0 to
+    disable caching or None for an unbounded cache.
+
+    Example:
+        >>> nav = DOMNavigator(b"$o~user$f~id$v~42$t~n$f~tags$v~a$v~b")
+        >>> nav.get_name(0)
+        'user'
+        >>> nav.get_object(0)
+        {'id': 42, 'tags': ['a', 'b']}
+    """
+
+    def __init__(self, dom: Union[DOM, bytes, bytearray, memoryview, str],
+                 cache_size: Optional[int] = DEFAULT_CACHE_SIZE, errors: str = "strict"):
+        """
+        Args:
+            dom: DOM from DOMBuilder.build(), or input to scan and build
+            cache_size: Maximum number of decoded names and values to keep
+            errors: How to handle invalid UTF-8, as for ``bytes.decode``
+        """
+        if not isinstance(dom, DOM):
+            dom = DOMBuilder().build(dom)
+        if cache_size is not None and cache_size < 0:
+            raise ValueError("cache_size must be non-negative or None")
+        self.dom = dom
+        self._view = memoryview(dom.buffer)
+        self._cache_size = cache_size
+        self._cache: "OrderedDict[int, Any]" = OrderedDict()
+        self._unicode_errors = errors
+
+    def __len__(self) -> int:
+        return len(self.dom)
+
+    def get_root_indices(self):
+        """Return the indices of the object nodes."""
+        return self.dom.roots
+
+    def get_children(self, index: int):
+        """Return the indices of a node's children in document order."""
+        return self.dom.get_children(index)
+
+    def get_type(self, index: int) -> int:
+        """Return the node type (NODE_OBJECT, NODE_FIELD or NODE_VALUE)."""
+        return self.dom.types[index]
+
+    def get_type_hint(self, index: int) -> int:
+        """Return the type hint byte of a value node, or NO_HINT."""
+        return self.dom.hints[index]
+
+    def get_raw(self, index: int) -> memoryview:
+        """Return the bytes of a node's name or value without copying."""
+        dom = self.dom
+        start = dom.data_positions[index]
+        return self._view[start:start + dom.data_lengths[index]]
+
+    def get_text(self, index: int) -> str:
+        """Decode a node's data as UTF-8 text, without caching."""
+        dom = self.dom
+        start = dom.data_positions[index]
+        return str(self._view[start:start + dom.data_lengths[index]], "utf-8", self._unicode_errors)
+
+    def get_name(self, index: int) -> str:
+        """Return the name of an object or field node; implicit nodes have ''."""
+        # Names are cached under the complement of the index so they can
+        # never collide with values
+        return self._cached(~index, self.get_text, index)
+
+    def get_value(self, index: int) -> Any:
+        """
+        Return the value of a value node, converted by its type hint
+
+        Raises:
+            ValueError: If the data does not match the type hint
+        """
+        return self._cached(index, self._convert, index)
+
+    def get_field_value(self, index: int) -> Any:
+        """
+        Return the value of a field node
+
+        A field without values is None, a single value is returned as is and
+        several values (an implicit array) as a list.
+        """
+        children = self.dom.get_children(index)
+        if len(children) == 1:
+            return self.get_value(children[0])
+        if not children:
+            return None
+        return [self.get_value(child) for child in children]
+
+    def find_field(self, object_index: int, key: str) -> int:
+        """
+        Find a field of an object by name
+
+        Field names are compared as raw bytes, so no other field is decoded.
+
+        Returns:
+            Index of the last field with this name, or -1 if there is none
+        """
+        wanted = key.encode("utf-8")
+        dom = self.dom
+        view = self._view
+        starts = dom.data_positions
+        lengths = dom.data_lengths
+        size = len(wanted)
+        found = -1
+        for child in dom.get_children(object_index):
+            if lengths[child] == size and view[starts[child]:starts[child] + size] == wanted:
+                found = child
+        return found
+
+    def get(self, object_index: int, key: str, default: Any = None) -> Any:
+        """Return the value of one field of an object, or default if absent."""
+        field = self.find_field(object_index, key)
+        if field == -1:
+            return default
+        return self.get_field_value(field)
+
+    def get_object(self, index: int) -> Dict[str, Any]:
+        """Decode every field of an object node into a dictionary."""
+        get_name = self.get_name
+        get_field_value = self.get_field_value
+        return {get_name(field): get_field_value(field) for field in self.dom.get_children(index)}
+
+    def _convert(self, index: int) -> Any:
+        text = self.get_text(index)
+        hint = self.dom.hints[index]
+        if hint == NO_HINT:
+            return text
+        convert = VALUE_CONVERTERS.get(hint)
+        if convert is None:
+            return text
+        try:
+            return convert(text)
+        except ValueError as e:
+            raise ValueError(f"Error parsing value {text!r} with type hint {chr(hint)!r}: {e}") from None
+
+    def _cached(self, key: int, decode, index: int) -> Any:
+        cache_size = self._cache_size
+        if cache_size == 0:
+            return decode(index)
+        cache = self._cache
+        try:
+            value = cache[key]
+        except KeyError:
+            value = cache[key] = decode(index)
+            if cache_size is not None and len(cache) > cache_size:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return value
@@ -47,6 +47,9 @@ setup(
             "pytest>=6.0",
             "pytest-cov>=2.0",
         ],
+        "numpy": [
+            "numpy>=1.20",
+        ],
     },
     keywords="serialization, llm, ai, structured-data, parsing",
     project_urls={
@@ -0,0 +1,164 @@
+"""
+Shared conformance corpus for LSF decode engines.
+
+Every decode engine must reproduce the output and the error list of the
+reference LSFDecoder for each document produced here.
+"""
+
+import base64
+import random
+from typing import Iterator, List
+
+from lsf.decoder import LSFDecoder
+
+
+# Hand-picked documents covering each branch of the reference decoder
+CONFORMANCE_CASES: List[str] = [
+    "",
+    "   ",
+    "$r~",
+    "$r~$r~  $r~",
+    "$o~user$r~$f~name$f~John$r~",
+    "$o~user$r~$f~name$f~John$r~$f~age$f~30$r~",
+    "$o~user$r~$f~name$f~John$r~$o~product$r~$f~name$f~Laptop$r~",
+    "$o~user$r~$f~tags$f~admin$l~user$l~editor$r~",
+    "$o~user$r~$f~tags$f~$r~",
+    "$o~user$r~$f~tags$f~$l~$r~",
+    "$o~user$r~$t~int$f~age$f~30$r~",
+    "$o~user$r~$t~int$f~age$f~ 3_0 $r~",
+    "$o~user$r~$t~int$f~age$f~thirty$r~",
+    "$o~product$r~$t~float$f~price$f~19.99$r~",
+    "$o~product$r~$t~float$f~price$f~nan$r~",
+    "$o~user$r~$t~bool$f~active$f~TRUE$r~$t~bool$f~x$f~yes$r~",
+    "$o~user$r~$t~null$f~metadata$f~anything$r~",
+    "$o~user$r~$t~str$f~s$f~a$f~b$r~",
+    "$o~file$r~$t~bin$f~content$f~aGVsbG8gd29ybGQ=$r~",
+    "$o~file$r~$t~bin$f~content$f~not base64!$r~",
+    "$o~user$r~$t~invalid$f~field$f~value$r~$f~age$f~30$r~",
+    "$o~user$r~$t~int$f~missing$r~",
+    "$o~user$r~$f~name$f~John$r~$e~Something went wrong$r~",
+    "$e~before any object$r~$o~a$r~",
+    "$o~user$r~$f~name$f~John$r~$x~$r~$o~product$r~$f~name$f~Laptop$r~",
+    "$o~user$r~  \n  $f~name$f~John$r~  ",
+    "  $o~user$r~$f~name$f~John$r~",
+    "\n$o~user$r~$f~name$f~John$r~$o~b$r~$f~k$f~v$r~",
+    "$o~user$r~　 \x1c$f~name$f~John$r~",
+    "$o~user$r~$f~name$f~ John $r~",
+    "$o~user$r~$f~a$f~b$f~c$r~",
+    "$o~user$r~$f~onlykey$r~",
+    "$f~orphan$f~field$r~$o~user$r~$f~k$f~v$r~",
+    "$o~$r~$f~k$f~v$r~$t~int$f~n$f~1$r~",
+    "$o~user$r~$f~k$f~1$r~$o~user$r~$f~j$f~2$r~",
+    "$o~a$r~$f~k$f~1$r~$o~b$r~$o~a$r~$f~k$f~2$r~",
+    "$o~user$r~$f~k$f~v",
+    "$o~user$r~$f~k$f~v$o~nested$r~",
+    "$o~user$r~$v~3.0$r~$f~k$f~v$r~",
+    "$o~user$r~garbage$r~$f~k$f~v$r~",
+    "$$o~user$r~$$r~$f~k$f~v$$r~",
+    "$o~user$r~$f~k$f~a$rb$r~",
+    "$o~us$r$r~~er$r~",
+    "$o~üser$r~$f~ключ$f~値$l~🙂$r~",
+    "$o~v$r~$t~int[]$f~ids$f~1$l~-2$l~ 3 $r~$t~float[]$f~x$f~0.5$l~nan$l~1e3$r~",
+    "$o~v$r~$t~int[]$f~empty$f~$r~$t~float[]$f~one$f~2$r~$t~int[]$f~big$f~9223372036854775808$r~",
+    "$o~v$r~$t~int[]$f~bad$f~1$l~$r~$t~float[]$f~bad2$f~x$l~1$r~$t~str[]$f~s$f~a$l~b$r~",
+]
+
+
+_FRAGMENTS = [
+    "$o~", "$f~", "$t~", "$e~", "$x~", "$v~", "$l~", "$r~", "$r~", "$r~",
+    "$", "~", "$r", "r~", " ", "  ", "\n", "\t", " ", " ",
+    "user", "name", "id", "tags", "John", "42", "3.5", "true", "false",
+    "int", "float", "bool", "null", "bin", "str", "nope",
+    "aGk=", "aGk", "é", "🙂",
+]
+
+
+def random_documents(count: int = 500, seed: int = 1234) -> Iterator[str]:
+    """Yield reproducible pseudo-random documents mixing markers and text."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        pieces = [rng.choice(_FRAGMENTS) for _ in range(rng.randint(0, 40))]
+        yield "".join(pieces)
+
+
+def structured_documents(count: int = 200, seed: int = 4321) -> Iterator[str]:
+    """Yield reproducible well-formed documents with every field kind."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        parts = []
+        for obj in range(rng.randint(1, 5)):
+            parts.append(f"$o~obj{rng.randint(0, 3)}$r~")
+            for key in range(rng.randint(0, 8)):
+                kind = rng.randint(0, 7)
+                if kind == 0:
+                    parts.append(f"$t~int$f~k{key}$f~{rng.randint(-1000, 1000)}$r~")
+                elif kind == 1:
+                    parts.append(f"$t~float$f~k{key}$f~{rng.random() * 100}$r~")
+                elif kind == 2:
+                    parts.append(f"$t~bool$f~k{key}$f~{rng.choice(['true', 'false'])}$r~")
+                elif kind == 3:
+                    parts.append(f"$t~null$f~k{key}$f~$r~")
+                elif kind == 4:
+                    payload = bytes(rng.randint(0, 255) for _ in range(rng.randint(0, 12)))
+                    parts.append(f"$t~bin$f~k{key}$f~{base64.b64encode(payload).decode('ascii')}$r~")
+                elif kind == 5:
+                    items = "$l~".join(f"item{i}" for i in range(rng.randint(2, 4)))
+                    parts.append(f"$f~k{key}$f~{items}$r~")
+                elif kind == 6:
+                    parts.append(f"$e~error {key}$r~")
+                else:
+                    parts.append(f"$f~k{key}$f~value {rng.randint(0, 99)}$r~")
+                if rng.random() < 0.2:
+                    parts.append(rng.choice([" ", "\n", "\r\n  ", "\t"]))
+            if rng.random() < 0.2:
+                parts.append("$x~$r~")
+        yield "".join(parts)
+
+
+def all_documents() -> Iterator[str]:
+    """Yield the full conformance corpus."""
+    yield from CONFORMANCE_CASES
+    yield from random_documents()
+    yield from structured_documents()
+
+
+def reference_decode(lsf_str: str):
+    """Decode with the reference LSFDecoder, returning (result, errors)."""
+    decoder = LSFDecoder()
+    result = decoder.decode(lsf_str)
+    return result, decoder.get_errors()
+
+
+class ConformanceMixin:
+    """
+    TestCase mixin checking an engine against the reference decoder.
+
+    Subclasses implement ``engine_decode(lsf_str)`` returning
+    ``(result, errors)``.
+    """
+
+    def engine_decode(self, lsf_str: str):
+        raise NotImplementedError
+
+    def assert_conforms(self, lsf_str: str):
+        expected, expected_errors = reference_decode(lsf_str)
+        actual, actual_errors = self.engine_decode(lsf_str)
+        # repr() also checks value types and key order
+        self.assertEqual(repr(actual), repr(expected), msg=repr(lsf_str))
+        self.assertEqual(actual_errors, expected_errors, msg=repr(lsf_str))
+
+    def test_conformance_cases(self):
+        """Engine matches the reference on hand-picked documents."""
+        for lsf_str in CONFORMANCE_CASES:
+            with self.subTest(lsf_str=lsf_str):
+                self.assert_conforms(lsf_str)
+
+    def test_conformance_random(self):
+        """Engine matches the reference on random marker soup."""
+        for lsf_str in random_documents():
+            self.assert_conforms(lsf_str)
+
+    def test_conformance_structured(self):
+        """Engine matches the reference on well-formed documents."""
+        for lsf_str in structured_documents():
+            self.assert_conforms(lsf_str)
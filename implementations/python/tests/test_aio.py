@@ -0,0 +1,98 @@
+"""
+Tests for asyncio LSF decoding.
+"""
+
+import asyncio
+import io
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import IsolatedAsyncioTestCase
+
+from lsf.aio import aiter_objects
+from lsf.incremental import iterparse
+from tests.conformance import all_documents
+
+
+async def chunks_of(data, size):
+    """Async iterator over data in chunks of the given size."""
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def collect(source, **kwargs):
+    return [item async for item in aiter_objects(source, **kwargs)]
+
+
+class AiterObjectsTests(IsolatedAsyncioTestCase):
+    """Test cases for aiter_objects."""
+
+    async def test_matches_iterparse(self):
+        """Test str and bytes chunks of several sizes against iterparse."""
+        for lsf_str in all_documents():
+            expected = repr(list(iterparse(io.StringIO(lsf_str))))
+            data = lsf_str.encode("utf-8", "surrogatepass")
+            for size in (7, 1000):
+                self.assertEqual(repr(await collect(chunks_of(lsf_str, size))), expected, msg=(lsf_str, size))
+                self.assertEqual(
+                    repr(await collect(chunks_of(data, size), encoding="utf-8", slice_size=5)),
+                    repr(list(iterparse(io.BytesIO(data)))),
+                    msg=(lsf_str, size),
+                )
+
+    async def test_stream_reader(self):
+        """Test reading an asyncio.StreamReader in fixed-size chunks."""
+        reader = asyncio.StreamReader()
+        reader.feed_data("$o~ü$r~$f~k$f~v$r~\n".encode("utf-8"))
+        reader.feed_data(b"$o~b$r~$t~int$f~n$f~1$r~")
+        reader.feed_eof()
+        self.assertEqual(await collect(reader, read_size=5), [("ü", {"k": "v"}), ("b", {"n": 1})])
+
+    async def test_objects_are_yielded_before_the_end(self):
+        """Test that an object is yielded once the next one starts."""
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"$o~a$r~$f~k$f~v$r~$o~b$r~")
+        objects = aiter_objects(reader)
+        self.assertEqual(await objects.__anext__(), ("a", {"k": "v"}))
+        reader.feed_data(b"$f~x$f~y$r~")
+        reader.feed_eof()
+        self.assertEqual([item async for item in objects], [("b", {"x": "y"})])
+
+    async def test_large_chunk_yields_to_the_event_loop(self):
+        """Test that a large chunk is parsed in slices."""
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        lsf_str = "".join(f"$o~o{i}$r~$f~k$f~{i}$r~" for i in range(1000))
+        task = asyncio.ensure_future(ticker())
+        await asyncio.sleep(0)
+        try:
+            result = await collect(chunks_of(lsf_str, len(lsf_str)), slice_size=1000)
+        finally:
+            task.cancel()
+        self.assertEqual(len(result), 1000)
+        self.assertGreater(ticks, 10)
+
+    async def test_executor_offload(self):
+        """Test parsing large chunks in a thread pool."""
+        lsf_str = "".join(f"$o~o{i}$r~$t~int$f~k$f~{i}$r~" for i in range(100))
+        expected = list(iterparse(io.StringIO(lsf_str)))
+        with ThreadPoolExecutor(1) as executor:
+            for size in (10, 500, len(lsf_str)):
+                result = await collect(chunks_of(lsf_str.encode(), size), executor=executor, offload_size=100)
+                self.assertEqual(result, expected)
+
+    async def test_invalid_arguments(self):
+        """Test rejected sources and sizes."""
+        with self.assertRaises(TypeError):
+            await collect(["$o~a$r~"])
+        with self.assertRaises(ValueError):
+            await collect(chunks_of("", 1), slice_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
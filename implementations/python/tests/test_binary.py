@@ -0,0 +1,143 @@
+"""
+Tests for streaming base64 of bin fields.
+"""
+
+import base64
+import binascii
+import io
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+
+from lsf.binary import LazyBinary, decode_base64_into, iter_base64
+from lsf.buffer_decoder import decode_buffer, decode_file
+from lsf.encoder import LSFEncoder
+from lsf.simple import from_lsf
+
+
+class ShortReader(io.RawIOBase):
+    """Binary reader returning at most 5 bytes per read."""
+
+    def __init__(self, data):
+        self._data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        return self._data.read(min(size, 5))
+
+
+class Base64StreamTests(TestCase):
+    """Test cases for iter_base64 and decode_base64_into."""
+
+    payloads = [b"", b"a", b"ab", b"abc", bytes(range(256)) * 7]
+
+    def test_iter_base64(self):
+        """Test that the chunks join to b64encode() for every source."""
+        for data in self.payloads:
+            expected = base64.b64encode(data).decode("ascii")
+            for chunk_size in (1, 4, 6, 1000):
+                self.assertEqual("".join(iter_base64(data, chunk_size)), expected)
+                self.assertEqual("".join(iter_base64(memoryview(bytearray(data)), chunk_size)), expected)
+                self.assertEqual("".join(iter_base64(io.BytesIO(data), chunk_size)), expected)
+                self.assertEqual("".join(iter_base64(ShortReader(data), chunk_size)), expected)
+                self.assertEqual(b"".join(iter_base64(data, chunk_size, binary=True)), expected.encode("ascii"))
+                self.assertEqual(b"".join(iter_base64(ShortReader(data), chunk_size, binary=True)),
+                                 expected.encode("ascii"))
+
+    def test_decode_into_sinks(self):
+        """Test bytearray, memoryview and file sinks."""
+        for data in self.payloads:
+            encoded = base64.b64encode(data).decode("ascii")
+            for chunk_size in (4, 9, 1000):
+                sink = bytearray(b"x")
+                self.assertEqual(decode_base64_into(encoded, sink, chunk_size), len(data))
+                self.assertEqual(sink, b"x" + data)
+
+                buffer = bytearray(len(data) + 2)
+                decode_base64_into(encoded.encode("ascii"), memoryview(buffer), chunk_size)
+                self.assertEqual(buffer, data + b"\0\0")
+
+                f = io.BytesIO()
+                decode_base64_into(memoryview(encoded.encode("ascii")), f, chunk_size)
+                self.assertEqual(f.getvalue(), data)
+
+    def test_non_canonical_input_matches_b64decode(self):
+        """Test line breaks, stray characters and invalid input."""
+        for encoded in ("aGVs\nbG8=", "aG!Vsb G8", "aGk", "a", "aGk=x", "aé"):
+            try:
+                expected = base64.b64decode(encoded)
+            except (binascii.Error, ValueError) as e:
+                with self.assertRaises(type(e)):
+                    decode_base64_into(encoded, bytearray(), 4)
+            else:
+                sink = bytearray()
+                decode_base64_into(encoded, sink, 4)
+                self.assertEqual(sink, expected)
+
+    def test_memoryview_sink_too_small(self):
+        """Test that a short memoryview sink is rejected."""
+        with self.assertRaises(ValueError):
+            decode_base64_into("aGVsbG8=", memoryview(bytearray(3)))
+
+
+class LazyBinaryTests(TestCase):
+    """Test cases for LazyBinary and lazy_bin decoding."""
+
+    def test_lazy_value(self):
+        """Test decoding on access, length, equality and write_to."""
+        data = bytes(range(200))
+        lazy = LazyBinary(base64.b64encode(data).decode("ascii"))
+        self.assertIn("not decoded", repr(lazy))
+        self.assertEqual(len(lazy), len(data))
+        sink = bytearray()
+        self.assertEqual(lazy.write_to(sink, chunk_size=8), len(data))
+        self.assertEqual(sink, data)
+        self.assertEqual(lazy, data)
+        self.assertEqual(bytes(lazy), data)
+        self.assertEqual(lazy, LazyBinary(base64.b64encode(data)))
+        self.assertIn(" decoded", repr(lazy))
+        self.assertEqual(len(LazyBinary("aGVs\nbG8=")), 5)
+
+    def test_invalid_base64_raises_on_access(self):
+        """Test that lazy values defer base64 errors."""
+        decoded = decode_buffer(b"$o~f$r~$t~bin$f~data$f~not base64!$r~", lazy_bin=True)
+        with self.assertRaises(binascii.Error):
+            decoded["f"]["data"].value
+
+    def test_decode_file_lazy(self):
+        """Test lazy values that map their text from the file."""
+        data = os.urandom(10000)
+        lsf_str = (LSFEncoder()
+                   .start_object("mail").add_field("subject", "Hi").add_binary("file", io.BytesIO(data), chunk_size=30)
+                   .add_binary("empty", b"")
+                   .to_string())
+        fd, path = tempfile.mkstemp(suffix=".lsf")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(lsf_str)
+        try:
+            result = decode_file(path, lazy_bin=True)["mail"]
+            self.assertEqual(result["subject"], "Hi")
+            self.assertIsInstance(result["file"], LazyBinary)
+            out = io.BytesIO()
+            result["file"].write_to(out, chunk_size=100)
+            self.assertEqual(out.getvalue(), data)
+            self.assertEqual(len(result["file"]), len(data))
+            self.assertEqual(result["empty"], b"")
+            self.assertEqual(decode_file(path), from_lsf(lsf_str))
+        finally:
+            os.remove(path)
+
+    def test_add_binary_matches_add_typed_field(self):
+        """Test that chunked encoding writes the same text."""
+        data = bytes(range(256)) * 3
+        expected = LSFEncoder().start_object("f").add_typed_field("d", data, "bin").to_string()
+        self.assertEqual(expected, "$o~f$r~$t~bin$f~d$f~" + base64.b64encode(data).decode("ascii") + "$r~")
+        encoder = LSFEncoder().start_object("f").add_binary("d", ShortReader(data), chunk_size=7)
+        self.assertEqual(encoder.to_string(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
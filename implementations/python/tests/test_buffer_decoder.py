@@ -0,0 +1,93 @@
+"""
+Tests for the buffer LSF decoder.
+"""
+
+import base64
+import mmap
+import os
+import sys
+import tempfile
+import unittest
+from unittest import TestCase
+
+from lsf.buffer_decoder import BufferLSFDecoder, decode_buffer, decode_file, _LEADING_WS
+from tests.conformance import ConformanceMixin, all_documents, reference_decode
+
+
+class BufferLSFDecoderTests(ConformanceMixin, TestCase):
+    """Test cases for the BufferLSFDecoder class."""
+
+    def engine_decode(self, lsf_str):
+        decoder = BufferLSFDecoder()
+        result = decoder.decode(lsf_str.encode("utf-8"))
+        return result, decoder.get_errors()
+
+    def assert_buffer_conforms(self, data, lsf_str):
+        decoder = BufferLSFDecoder()
+        expected, expected_errors = reference_decode(lsf_str)
+        self.assertEqual(repr(decoder.decode(data)), repr(expected), msg=repr(lsf_str))
+        self.assertEqual(decoder.get_errors(), expected_errors, msg=repr(lsf_str))
+
+    def test_bytearray_and_memoryview(self):
+        """Test that bytearray and memoryview inputs decode identically."""
+        for lsf_str in all_documents():
+            data = lsf_str.encode("utf-8")
+            self.assert_buffer_conforms(bytearray(data), lsf_str)
+            self.assert_buffer_conforms(memoryview(data), lsf_str)
+
+    def test_mmap(self):
+        """Test decoding a memory-mapped file."""
+        lsf_str = "$o~user$r~　$f~name$f~Jöhn$r~$t~bin$f~b$f~aGk=$r~"
+        with tempfile.TemporaryFile() as f:
+            f.write(lsf_str.encode("utf-8"))
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                self.assert_buffer_conforms(mapped, lsf_str)
+
+    def test_decode_file(self):
+        """Test decode_file on a regular and an empty file."""
+        lsf_str = "$o~user$r~$f~tags$f~a$l~b$r~"
+        fd, path = tempfile.mkstemp(suffix=".lsf")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(lsf_str.encode("utf-8"))
+            self.assertEqual(decode_file(path), {"user": {"tags": ["a", "b"]}})
+            open(path, "wb").close()
+            self.assertEqual(decode_file(path), {})
+        finally:
+            os.remove(path)
+
+    def test_str_input(self):
+        """Test that str input is decoded like the bulk decoder."""
+        self.assertEqual(BufferLSFDecoder().decode("$o~a$r~$f~k$f~v$r~"), {"a": {"k": "v"}})
+
+    def test_bin_decoded_from_buffer(self):
+        """Test that bin fields are base64-decoded to bytes."""
+        payload = bytes(range(256)) * 4
+        data = b"$o~file$r~$t~bin$f~content$f~" + base64.b64encode(payload) + b"$r~"
+        self.assertEqual(decode_buffer(data)["file"]["content"], payload)
+
+    def test_non_ascii_bin_error_matches(self):
+        """Test that a non-ASCII bin value fails like the reference decoder."""
+        lsf_str = "$o~file$r~$t~bin$f~content$f~aGk=é$r~"
+        self.assert_buffer_conforms(lsf_str.encode("utf-8"), lsf_str)
+
+    def test_invalid_utf8(self):
+        """Test the errors argument for invalid UTF-8."""
+        data = b"$o~user$r~$f~name$f~J\xffhn$r~"
+        with self.assertRaises(UnicodeDecodeError):
+            decode_buffer(data)
+        self.assertEqual(decode_buffer(data, errors="replace"), {"user": {"name": "J�hn"}})
+
+    def test_whitespace_pattern_matches_isspace(self):
+        """Test that the byte whitespace pattern agrees with str.isspace()."""
+        for code in range(sys.maxunicode + 1):
+            char = chr(code)
+            if 0xD800 <= code <= 0xDFFF:
+                continue
+            matched = _LEADING_WS.fullmatch(char.encode("utf-8")) is not None
+            self.assertEqual(matched, char.isspace(), msg=hex(code))
+
+
+if __name__ == '__main__':
+    unittest.main()
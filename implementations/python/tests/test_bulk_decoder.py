@@ -0,0 +1,45 @@
+"""
+Tests for the bulk LSF decoder engine.
+"""
+
+import unittest
+from unittest import TestCase
+
+from lsf.bulk_decoder import BulkLSFDecoder
+from tests.conformance import ConformanceMixin
+
+
+class BulkLSFDecoderTests(ConformanceMixin, TestCase):
+    """Test cases for the BulkLSFDecoder class."""
+
+    def engine_decode(self, lsf_str):
+        decoder = BulkLSFDecoder()
+        result = decoder.decode(lsf_str)
+        return result, decoder.get_errors()
+
+    def test_decode_basic(self):
+        """Test decoding a basic object."""
+        decoder = BulkLSFDecoder()
+        result = decoder.decode("$o~user$r~$f~id$f~123$r~$f~name$f~John$r~")
+        self.assertEqual(result, {"user": {"id": "123", "name": "John"}})
+
+    def test_errors_reset_between_calls(self):
+        """Test that errors from a previous decode are cleared."""
+        decoder = BulkLSFDecoder()
+        decoder.decode("$o~user$r~$e~boom$r~")
+        self.assertEqual(decoder.get_errors(), ["boom"])
+        decoder.decode("$o~user$r~")
+        self.assertEqual(decoder.get_errors(), [])
+
+    def test_typed_error_message(self):
+        """Test that conversion errors match the reference wording."""
+        decoder = BulkLSFDecoder()
+        decoder.decode("$o~user$r~$t~invalid$f~field$f~value$r~")
+        self.assertEqual(
+            decoder.get_errors(),
+            ["Error parsing typed field $t~invalid$f~field$f~value: Unknown type hint: invalid"],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+Tests for the columnar LSF decoder.
+"""
+
+import math
+import unittest
+from array import array
+from unittest import TestCase
+
+from lsf.columnar import ColumnarLSFDecoder, decode_columns, numpy
+from lsf.incremental import iterparse
+from lsf.simple import to_lsf
+from tests.conformance import all_documents, reference_decode
+
+
+def same_value(a, b):
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    if isinstance(a, array) and isinstance(b, array):
+        # Typed float lists may hold NaN too
+        return repr(a) == repr(b)
+    return a == b
+
+
+class ColumnarLSFDecoderTests(TestCase):
+    """Test cases for ColumnarLSFDecoder and decode_columns."""
+
+    def test_rows_match_iterparse_on_corpus(self):
+        """Test that every object occurrence becomes a row with its fields."""
+        for lsf_str in all_documents():
+            decoder = ColumnarLSFDecoder(use_numpy=False)
+            tables = decoder.decode(lsf_str)
+            self.assertEqual(decoder.get_errors(), reference_decode(lsf_str)[1], lsf_str)
+            expected = list(iterparse(lsf_str))
+            if not expected:
+                self.assertEqual(tables, {}, lsf_str)
+                continue
+            table = tables[""]
+            self.assertEqual(table.names, [name for name, _ in expected], lsf_str)
+            for row, (_, fields) in zip(table.rows(), expected):
+                present = {key: value for key, value in fields.items() if value is not None}
+                self.assertEqual(sorted(row), sorted(present), lsf_str)
+                for key, value in present.items():
+                    self.assertTrue(same_value(row[key], value), (lsf_str, key, row[key], value))
+
+    def test_typed_columns_and_mask(self):
+        """Test array columns, list columns and the validity mask."""
+        lsf_str = to_lsf({
+            f"tx{i}": {"id": f"TX-{i}", "amount": i + 0.5, "qty": i, **({"note": "x"} if i % 2 else {})}
+            for i in range(4)
+        })
+        table = decode_columns(lsf_str, type_of=lambda name: name.rstrip("0123456789"), use_numpy=False)["tx"]
+        self.assertEqual(table.names, ["tx0", "tx1", "tx2", "tx3"])
+        self.assertEqual(table.columns["qty"], array("q", [0, 1, 2, 3]))
+        self.assertEqual(table.columns["amount"], array("d", [0.5, 1.5, 2.5, 3.5]))
+        self.assertEqual(table.columns["id"], ["TX-0", "TX-1", "TX-2", "TX-3"])
+        self.assertEqual(table.columns["note"], [None, "x", None, "x"])
+        self.assertEqual(table.valid["note"], bytearray([0, 1, 0, 1]))
+        self.assertEqual(table.valid["qty"], bytearray([1, 1, 1, 1]))
+
+    def test_promotion(self):
+        """Test int to float, mixed kinds to lists and null values."""
+        lsf_str = (
+            "$o~a$r~$t~int$f~x$f~1$r~$t~int$f~y$f~1$r~$t~int$f~z$f~2$r~"
+            "$o~b$r~$t~float$f~x$f~2.5$r~$f~y$f~text$r~$t~int$f~z$f~99999999999999999999$r~"
+            "$o~c$r~$t~null$f~x$f~$r~$t~int$f~z$f~3$r~$t~null$f~z$f~$r~"
+        )
+        table = decode_columns(lsf_str, use_numpy=False)[""]
+        self.assertEqual(table.columns["x"], array("d", [1.0, 2.5, 0.0]))
+        self.assertEqual(table.columns["y"], [1, "text", None])
+        self.assertEqual(table.columns["z"], [2, 99999999999999999999, None])
+        self.assertEqual(table.valid["x"], bytearray([1, 1, 0]))
+        self.assertEqual(table.valid["z"], bytearray([1, 1, 0]))
+
+    def test_null_first_takes_kind_of_first_value(self):
+        """Test that leading nulls give the same column as leading missing rows."""
+        rows = "$o~b$r~$t~int$f~x$f~2$r~$o~c$r~$t~null$f~x$f~$r~$t~int$f~x$f~3$r~$o~d$r~$t~float$f~y$f~1.5$r~"
+        for first in ("$o~a$r~$t~null$f~x$f~$r~$t~null$f~y$f~$r~", "$o~a$r~"):
+            table = decode_columns(first + rows, use_numpy=False)[""]
+            self.assertEqual(table.columns["x"], array("q", [0, 2, 3, 0]), first)
+            self.assertEqual(table.valid["x"], bytearray([0, 1, 1, 0]), first)
+            self.assertEqual(table.columns["y"], array("d", [0.0, 0.0, 0.0, 1.5]), first)
+            self.assertEqual(table.valid["y"], bytearray([0, 0, 0, 1]), first)
+        table = decode_columns("$o~a$r~$t~null$f~x$f~$r~$o~b$r~$f~x$f~text$r~$o~c$r~$t~null$f~n$f~$r~",
+                               use_numpy=False)[""]
+        self.assertEqual(table.columns["x"], [None, "text", None])
+        self.assertEqual(table.columns["n"], [None, None, None])
+        self.assertEqual(table.valid["n"], bytearray([0, 0, 0]))
+
+    def test_null_after_value_clears_numeric_row(self):
+        """Test that a null replacing a number in the same object stores 0."""
+        lsf_str = (
+            "$o~a$r~$t~int$f~x$f~7$r~$t~null$f~x$f~$r~$t~null$f~x$f~$r~$t~float$f~y$f~2.5$r~$t~null$f~y$f~$r~"
+            "$o~b$r~$t~int$f~x$f~9$r~$t~null$f~x$f~$r~$t~float$f~y$f~4.5$r~$t~null$f~y$f~$r~$t~null$f~y$f~$r~"
+            "$o~c$r~$t~int$f~x$f~3$r~$t~float$f~y$f~1.5$r~"
+        )
+        table = decode_columns(lsf_str, use_numpy=False)[""]
+        self.assertEqual(table.columns["x"], array("q", [0, 0, 3]))
+        self.assertEqual(table.valid["x"], bytearray([0, 0, 1]))
+        self.assertEqual(table.columns["y"], array("d", [0.0, 0.0, 1.5]))
+        self.assertEqual(table.valid["y"], bytearray([0, 0, 1]))
+
+    def test_tables_by_type(self):
+        """Test grouping objects into one table per type."""
+        tables = decode_columns("$o~user1$r~$o~tx1$r~$o~user2$r~", type_of=lambda name: name[:-1], use_numpy=False)
+        self.assertEqual({name: table.names for name, table in tables.items()}, {
+            "user": ["user1", "user2"],
+            "tx": ["tx1"],
+        })
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_columns(self):
+        """Test NumPy arrays for numeric columns and masks."""
+        table = decode_columns("$o~a$r~$t~int$f~n$f~1$r~$o~b$r~$t~float$f~f$f~2.5$r~", use_numpy=True)[""]
+        self.assertEqual(table.columns["n"].dtype, numpy.int64)
+        self.assertEqual(table.columns["f"].tolist(), [0.0, 2.5])
+        self.assertEqual(table.valid["n"].tolist(), [True, False])
+
+    @unittest.skipIf(numpy is not None, "NumPy is installed")
+    def test_numpy_required(self):
+        """Test that use_numpy=True fails without NumPy."""
+        with self.assertRaises(ImportError):
+            ColumnarLSFDecoder(use_numpy=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
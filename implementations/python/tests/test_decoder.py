@@ -3,6 +3,7 @@ Tests for the LSF decoder component.
 """
 
 import base64
+from array import array
 import unittest
 from unittest import TestCase
 
@@ -147,6 +148,24 @@ class LSFDecoderTests(TestCase):
         
         self.assertEqual(result["file"]["content"], binary_data)
 
+    def test_decode_typed_lists(self):
+        """Test decoding int and float lists into arrays."""
+        decoder = LSFDecoder()
+        lsf_str = (
+            "$o~v$r~$t~int[]$f~ids$f~1$l~-2$l~3$r~$t~float[]$f~scores$f~0.5$l~2$r~"
+            "$t~float[]$f~empty$f~$r~$t~int[]$f~bad$f~1$l~x$r~"
+        )
+        result = decoder.decode(lsf_str)
+        self.assertEqual(result, {"v": {
+            "ids": array("q", [1, -2, 3]),
+            "scores": array("d", [0.5, 2.0]),
+            "empty": array("d"),
+        }})
+        self.assertEqual(result["v"]["ids"].typecode, "q")
+        self.assertEqual(decoder.get_errors(), [
+            "Error parsing typed field $t~int[]$f~bad$f~1$l~x: invalid literal for int() with base 10: 'x'",
+        ])
+
     def test_decode_error_marker(self):
         """Test decoding with an error marker."""
         decoder = LSFDecoder()
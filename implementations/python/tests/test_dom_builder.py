@@ -0,0 +1,170 @@
+"""
+Tests for the LSF 3.0 DOMBuilder.
+"""
+
+import random
+import unittest
+from unittest import TestCase
+
+from lsf.v3 import (
+    NO_HINT,
+    NODE_FIELD,
+    NODE_OBJECT,
+    NODE_VALUE,
+    DOMBuilder,
+    TokenScanner,
+)
+
+
+def reference_build(data):
+    """Per-node builder following the C# DOMBuilder, for comparison."""
+    tokens = TokenScanner().scan(data)
+    nodes = []  # [type, token_position, data_position, data_length, parent, hint]
+    current_object = current_field = last_value = -1
+    positions = list(tokens.positions) + [len(data)]
+    for i, (kind, position) in enumerate(zip(tokens.types, tokens.positions)):
+        start, length = position + 3, positions[i + 1] - position - 3
+        if kind == ord("o"):
+            nodes.append([NODE_OBJECT, position, start, length, -1, 0])
+            current_object, current_field, last_value = len(nodes) - 1, -1, -1
+        elif kind == ord("f"):
+            if current_object == -1:
+                nodes.append([NODE_OBJECT, position, 0, 0, -1, 0])
+                current_object = len(nodes) - 1
+            nodes.append([NODE_FIELD, position, start, length, current_object, 0])
+            current_field, last_value = len(nodes) - 1, -1
+        elif kind == ord("v"):
+            if current_field == -1:
+                if current_object == -1:
+                    nodes.append([NODE_OBJECT, position, 0, 0, -1, 0])
+                    current_object = len(nodes) - 1
+                nodes.append([NODE_FIELD, position, 0, 0, current_object, 0])
+                current_field = len(nodes) - 1
+            nodes.append([NODE_VALUE, position, start, length, current_field, 0])
+            last_value = len(nodes) - 1
+        else:
+            if last_value != -1 and length > 0:
+                nodes[last_value][5] = data[start]
+            last_value = -1
+    children = [[] for _ in nodes]
+    for i, node in enumerate(nodes):
+        if node[4] != -1:
+            children[node[4]].append(i)
+    return nodes, children
+
+
+class DOMBuilderTests(TestCase):
+    """Test cases for the struct-of-arrays DOMBuilder."""
+
+    def build(self, text):
+        return DOMBuilder().build(TokenScanner().scan(text.encode("utf-8")))
+
+    def data(self, dom, index):
+        return bytes(dom.get_data(index)).decode("utf-8")
+
+    def test_empty_input(self):
+        """Test that empty or token-free input gives an empty DOM."""
+        for text in ("", "no tokens here"):
+            dom = self.build(text)
+            self.assertEqual(len(dom), 0)
+            self.assertEqual(list(dom.roots), [])
+            self.assertEqual(list(dom.child_offsets), [0])
+
+    def test_simple_object(self):
+        """Test an object with two fields."""
+        dom = self.build("$o~Root$f~Name$v~Test$f~Value$v~123")
+        self.assertEqual(list(dom.types), [NODE_OBJECT, NODE_FIELD, NODE_VALUE, NODE_FIELD, NODE_VALUE])
+        self.assertEqual(list(dom.parents), [-1, 0, 1, 0, 3])
+        self.assertEqual(list(dom.roots), [0])
+        self.assertEqual(list(dom.get_children(0)), [1, 3])
+        self.assertEqual(list(dom.get_children(1)), [2])
+        self.assertEqual(list(dom.get_children(2)), [])
+        self.assertEqual([self.data(dom, i) for i in range(5)], ["Root", "Name", "Test", "Value", "123"])
+
+    def test_implicit_array(self):
+        """Test that several values of one field become its children."""
+        dom = self.build("$o~Data$f~Items$v~A$v~B$v~C")
+        self.assertEqual(list(dom.get_children(1)), [2, 3, 4])
+        self.assertEqual([self.data(dom, i) for i in dom.get_children(1)], ["A", "B", "C"])
+
+    def test_type_hints(self):
+        """Test that hints are stored on the value before them."""
+        dom = self.build("$o~$f~Num$v~100$t~n$f~Bool$v~true$t~b$f~Nil$v~$t~z$f~Str$v~Hello")
+        self.assertEqual(dom.hints[2], ord("n"))
+        self.assertEqual(dom.hints[4], ord("b"))
+        self.assertEqual(dom.hints[6], ord("z"))
+        self.assertEqual(dom.hints[8], NO_HINT)
+        self.assertEqual(self.data(dom, 0), "")
+
+    def test_orphaned_and_empty_type_hints_ignored(self):
+        """Test hints without a preceding value, repeated or without data."""
+        dom = self.build("$o~$t~n$f~Field$v~Value")
+        self.assertEqual(list(dom.hints), [NO_HINT] * 3)
+        dom = self.build("$o~a$f~x$v~1$t~n$t~b")
+        self.assertEqual(dom.hints[2], ord("n"))
+        dom = self.build("$o~a$f~x$v~1$t~$f~y")
+        self.assertEqual(dom.hints[2], NO_HINT)
+
+    def test_implicit_object_field_first(self):
+        """Test that a field before any object creates an implicit object."""
+        dom = self.build("$f~Name$v~ImplicitRoot")
+        self.assertEqual(list(dom.types), [NODE_OBJECT, NODE_FIELD, NODE_VALUE])
+        self.assertEqual(dom.parents[0], -1)
+        self.assertEqual(dom.data_lengths[0], 0)
+        self.assertEqual(dom.token_positions[0], 0)
+        self.assertEqual(list(dom.get_children(0)), [1])
+        self.assertEqual(self.data(dom, 2), "ImplicitRoot")
+
+    def test_implicit_object_value_first(self):
+        """Test that a lone value creates an implicit object and field."""
+        dom = self.build("$v~LoneValue")
+        self.assertEqual(list(dom.types), [NODE_OBJECT, NODE_FIELD, NODE_VALUE])
+        self.assertEqual(list(dom.parents), [-1, 0, 1])
+        self.assertEqual(list(dom.data_lengths[:2]), [0, 0])
+        self.assertEqual(list(dom.token_positions), [0, 0, 0])
+        self.assertEqual(self.data(dom, 2), "LoneValue")
+
+    def test_implicit_field(self):
+        """Test that a value directly after an object creates an implicit field."""
+        dom = self.build("$o~MyObject$v~DirectValue")
+        self.assertEqual(list(dom.types), [NODE_OBJECT, NODE_FIELD, NODE_VALUE])
+        self.assertEqual(list(dom.parents), [-1, 0, 1])
+        self.assertEqual(dom.token_positions[1], len("$o~MyObject"))
+        self.assertEqual(dom.data_lengths[1], 0)
+
+    def test_data_spans(self):
+        """Test data positions and lengths in bytes."""
+        dom = self.build("$o~OBJ$f~F1$v~V1$f~F2$v~V22$t~n")
+        self.assertEqual(list(dom.data_positions), [3, 9, 14, 19, 24])
+        self.assertEqual(list(dom.data_lengths), [3, 2, 2, 2, 3])
+        self.assertEqual(dom.hints[4], ord("n"))
+        dom = self.build("$o~é$f~ü$v~€")
+        self.assertEqual(list(dom.data_lengths), [2, 2, 3])
+
+    def test_multiple_objects(self):
+        """Test roots and field context reset by a new object."""
+        dom = self.build("$o~a$f~x$v~1$o~b$v~2")
+        self.assertEqual(list(dom.roots), [0, 3])
+        self.assertEqual(list(dom.parents), [-1, 0, 1, -1, 3, 4])
+
+    def test_build_scans_raw_input(self):
+        """Test that build() also accepts unscanned input."""
+        self.assertEqual(len(DOMBuilder().build(b"$o~a$f~b$v~c")), 3)
+
+    def test_matches_reference_builder(self):
+        """Test random token sequences against a per-node builder."""
+        rng = random.Random(11)
+        pieces = ["$o~", "$f~", "$v~", "$t~", "n", "b", "z", "x", "é", "$", "~"]
+        for _ in range(300):
+            data = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 30))).encode("utf-8")
+            dom = DOMBuilder().build(data)
+            nodes, children = reference_build(data)
+            columns = (dom.types, dom.token_positions, dom.data_positions,
+                       dom.data_lengths, dom.parents, dom.hints)
+            self.assertEqual([list(node) for node in zip(*columns)], nodes, data)
+            self.assertEqual([list(dom.get_children(i)) for i in range(len(dom))], children, data)
+            self.assertEqual(list(dom.roots), [i for i, node in enumerate(nodes) if node[4] == -1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Tests for the LSF 3.0 DOMNavigator.
+"""
+
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+
+from lsf.v3 import NODE_FIELD, NODE_OBJECT, NODE_VALUE, DOMBuilder, DOMNavigator
+
+
+class DOMNavigatorTests(TestCase):
+    """Test cases for the lazy DOMNavigator."""
+
+    def test_navigation(self):
+        """Test roots, children, types and names."""
+        nav = DOMNavigator(b"$o~a$f~x$v~1$o~b$f~y$v~2$v~3")
+        self.assertEqual(list(nav.get_root_indices()), [0, 3])
+        self.assertEqual([nav.get_name(i) for i in nav.get_root_indices()], ["a", "b"])
+        self.assertEqual(list(nav.get_children(4)), [5, 6])
+        self.assertEqual([nav.get_type(i) for i in range(3)], [NODE_OBJECT, NODE_FIELD, NODE_VALUE])
+        self.assertEqual(len(nav), 7)
+
+    def test_raw_access_is_zero_copy(self):
+        """Test that get_raw returns a memoryview into the input buffer."""
+        data = bytearray("$o~obj$f~name$v~Jörg".encode("utf-8"))
+        nav = DOMNavigator(data)
+        raw = nav.get_raw(2)
+        self.assertIsInstance(raw, memoryview)
+        self.assertEqual(bytes(raw), "Jörg".encode("utf-8"))
+        data[16] = ord("X")
+        self.assertEqual(bytes(raw)[:1], b"X")
+
+    def test_typed_values(self):
+        """Test conversion of each type hint."""
+        nav = DOMNavigator(
+            "$o~t$f~n$v~42$t~n$f~nf$v~2.5$t~n$f~f$v~1.5$t~f$f~b$v~TRUE$t~b$f~b2$v~no$t~b"
+            "$f~d$v~2025-01-15T10:30:00Z$t~d$f~z$v~$t~z$f~s$v~42$t~s$f~plain$v~42$f~unknown$v~42$t~q"
+        )
+        self.assertEqual(nav.get_object(0), {
+            "n": 42,
+            "nf": 2.5,
+            "f": 1.5,
+            "b": True,
+            "b2": False,
+            "d": datetime(2025, 1, 15, 10, 30, tzinfo=timezone(timedelta(0))),
+            "z": None,
+            "s": "42",
+            "plain": "42",
+            "unknown": "42",
+        })
+
+    def test_invalid_typed_value(self):
+        """Test that data not matching its hint raises ValueError on access only."""
+        nav = DOMNavigator("$o~t$f~ok$v~1$t~n$f~bad$v~abc$t~n")
+        self.assertEqual(nav.get(0, "ok"), 1)
+        with self.assertRaises(ValueError):
+            nav.get(0, "bad")
+
+    def test_field_values(self):
+        """Test missing, single and implicit array values."""
+        nav = DOMNavigator("$o~o$f~empty$f~one$v~1$f~many$v~1$t~n$v~2$t~n")
+        self.assertIsNone(nav.get(0, "empty"))
+        self.assertEqual(nav.get(0, "one"), "1")
+        self.assertEqual(nav.get(0, "many"), [1, 2])
+        self.assertEqual(nav.get(0, "missing", "default"), "default")
+
+    def test_find_field(self):
+        """Test lookup by raw bytes, including non-ASCII and repeated names."""
+        nav = DOMNavigator("$o~o$f~clé$v~1$f~k$v~a$f~k$v~b")
+        self.assertEqual(nav.find_field(0, "clé"), 1)
+        self.assertEqual(nav.get(0, "k"), "b")
+        self.assertEqual(nav.find_field(0, "cl"), -1)
+
+    def test_implicit_nodes(self):
+        """Test names and values of implicit objects and fields."""
+        nav = DOMNavigator(b"$v~lone")
+        self.assertEqual(nav.get_name(0), "")
+        self.assertEqual(nav.get_object(0), {"": "lone"})
+
+    def test_lazy_decoding_and_cache(self):
+        """Test that only read nodes are decoded and the cache is bounded."""
+        dom = DOMBuilder().build("".join(f"$f~k{i}$v~{i}$t~n" for i in range(100)))
+        nav = DOMNavigator(dom, cache_size=10)
+        self.assertEqual(nav.get(0, "k5"), 5)
+        self.assertEqual(len(nav._cache), 1)
+        for i in range(50):
+            nav.get(0, f"k{i}")
+        self.assertEqual(len(nav._cache), 10)
+        self.assertIs(nav.get_value(2), nav.get_value(2))
+
+    def test_cache_disabled_and_unbounded(self):
+        """Test cache_size=0 and cache_size=None."""
+        data = "$o~o" + "".join(f"$f~k{i}$v~v{i}" for i in range(100))
+        nav = DOMNavigator(data, cache_size=0)
+        nav.get_object(0)
+        self.assertEqual(len(nav._cache), 0)
+        nav = DOMNavigator(data, cache_size=None)
+        nav.get_object(0)
+        self.assertEqual(len(nav._cache), 200)
+        with self.assertRaises(ValueError):
+            DOMNavigator(data, cache_size=-1)
+
+    def test_names_and_values_do_not_collide(self):
+        """Test that cached names and values of different nodes stay separate."""
+        nav = DOMNavigator("$o~o$f~num$v~7$t~n", cache_size=None)
+        self.assertEqual(nav.get_name(2), "7")
+        self.assertEqual(nav.get_value(2), 7)
+        self.assertEqual(nav.get_name(1), "num")
+
+    def test_invalid_utf8(self):
+        """Test the errors argument for invalid UTF-8."""
+        data = b"$o~o$f~k$v~\xff"
+        with self.assertRaises(UnicodeDecodeError):
+            DOMNavigator(data).get(0, "k")
+        self.assertEqual(DOMNavigator(data, errors="replace").get(0, "k"), "�")
+
+
+if __name__ == "__main__":
+    unittest.main()
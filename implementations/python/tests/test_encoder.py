@@ -3,10 +3,13 @@ Tests for the LSF encoder component.
 """
 
 import base64
+import io
+import socket
+from array import array
 import unittest
 from unittest import TestCase
 
-from lsf.encoder import LSFEncoder
+from lsf.encoder import BINARY_RUN_RECORDS, LSFEncoder
 
 
 class LSFEncoderTests(TestCase):
@@ -112,6 +115,34 @@ class LSFEncoderTests(TestCase):
                   .to_string())
         self.assertEqual(result, "$o~user$r~$f~tags$f~$r~")
 
+    def test_add_typed_list(self):
+        """Test adding int and float lists."""
+        result = (LSFEncoder()
+                  .start_object("v")
+                  .add_list("ids", [1, -2, 3], type_hint="int")
+                  .add_list("scores", [0.5, 2, float("inf")], type_hint="float")
+                  .add_list("empty", [], type_hint="float")
+                  .add_list("one", array("d", [1.25]), type_hint="float")
+                  .to_string())
+        self.assertEqual(result, (
+            "$o~v$r~$t~int[]$f~ids$f~1$l~-2$l~3$r~"
+            "$t~float[]$f~scores$f~0.5$l~2.0$l~inf$r~"
+            "$t~float[]$f~empty$f~$r~$t~float[]$f~one$f~1.25$r~"
+        ))
+
+    def test_add_typed_list_invalid(self):
+        """Test invalid list type hints and values."""
+        encoder = LSFEncoder().start_object("v")
+        with self.assertRaises(ValueError):
+            encoder.add_list("x", [1], type_hint="bool")
+        with self.assertRaises(ValueError):
+            encoder.add_list("x", [1.5], type_hint="int")
+        with self.assertRaises(ValueError):
+            encoder.add_list("x", [1 << 63], type_hint="int")
+        with self.assertRaises(ValueError):
+            encoder.add_list("x", ["1"], type_hint="float")
+        self.assertEqual(encoder.to_string(), "$o~v$r~")
+
     def test_add_error(self):
         """Test adding an error marker."""
         encoder = LSFEncoder()
@@ -160,5 +191,171 @@ class LSFEncoderTests(TestCase):
         self.assertEqual(result, expected)
 
 
+class RecordingSink:
+    """Binary sink keeping each write."""
+
+    def __init__(self):
+        self.writes = []
+        self.flushes = 0
+
+    def write(self, data):
+        self.writes.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        self.flushes += 1
+
+
+class PartialWriter(io.RawIOBase):
+    """Raw writer accepting at most 3 bytes per write."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.data += bytes(b[:3])
+        return min(len(b), 3)
+
+
+def encode_sample(encoder):
+    for i in range(50):
+        (encoder.start_object(f"tx{i}")
+         .add_field("note", "café")
+         .add_typed_field("amount", i * 1.5, "float")
+         .add_list("tags", ["a", "b"])
+         .add_binary("blob", bytes(range(i)), chunk_size=6))
+    return encoder.add_error("done").end_transaction()
+
+
+class StreamingEncoderTests(TestCase):
+    """Test cases for LSFEncoder writing to a sink."""
+
+    def setUp(self):
+        self.expected = encode_sample(LSFEncoder()).to_string()
+
+    def test_sinks_match_to_string(self):
+        """Test text, binary, buffered and raw sinks."""
+        text = io.StringIO()
+        encode_sample(LSFEncoder(sink=text, flush_threshold=10))
+        self.assertEqual(text.getvalue(), self.expected)
+
+        binary = io.BytesIO()
+        encode_sample(LSFEncoder(sink=binary, flush_threshold=100))
+        self.assertEqual(binary.getvalue().decode("utf-8"), self.expected)
+
+        raw = io.BytesIO()
+        buffered = io.BufferedWriter(raw, 16)
+        encode_sample(LSFEncoder(sink=buffered, flush_threshold=7))
+        self.assertEqual(raw.getvalue().decode("utf-8"), self.expected)
+
+        partial = PartialWriter()
+        encode_sample(LSFEncoder(sink=partial, encoding="latin-1"))
+        self.assertEqual(partial.data.decode("latin-1"), self.expected)
+
+        for encoding in ("utf-16", "utf-8-sig"):
+            binary = io.BytesIO()
+            encode_sample(LSFEncoder(sink=binary, flush_threshold=1, encoding=encoding))
+            self.assertEqual(binary.getvalue(), self.expected.encode(encoding))
+
+    def test_socket_sink(self):
+        """Test writing through sendall()."""
+        left, right = socket.socketpair()
+        with left, right:
+            encoder = LSFEncoder(sink=left, flush_threshold=64)
+            encoder.start_object("tx1").add_field("amount", 10).end_transaction()
+            left.shutdown(socket.SHUT_WR)
+            received = b"".join(iter(lambda: right.recv(4096), b""))
+        self.assertEqual(received, b"$o~tx1$r~$f~amount$f~10$r~$x~$r~")
+
+    def test_flush_threshold(self):
+        """Test that writes happen at the threshold and at end_transaction()."""
+        sink = RecordingSink()
+        encoder = LSFEncoder(sink=sink, flush_threshold=20)
+        encoder.start_object("tx1")
+        self.assertEqual(sink.writes, [])
+        encoder.add_field("amount", 10)
+        self.assertEqual(sink.writes, [b"$o~tx1$r~$f~amount$f~10$r~"])
+        encoder.add_field("x", 1).end_transaction()
+        self.assertEqual(sink.writes[1:], [b"$f~x$f~1$r~$x~$r~"])
+        self.assertEqual(sink.flushes, 1)
+        encoder.end_transaction().flush()
+        self.assertEqual(sink.writes[2:], [b"$x~$r~"])
+
+    def test_binary_field_is_written_in_pieces(self):
+        """Test that a large bin field never sits whole in the buffer."""
+        sink = RecordingSink()
+        data = bytes(range(256)) * 40
+        encoder = LSFEncoder(sink=sink, flush_threshold=1000)
+        encoder.start_object("f").add_binary("data", io.BytesIO(data), chunk_size=300).flush()
+        self.assertGreater(len(sink.writes), 10)
+        self.assertLessEqual(max(map(len, sink.writes)), 1000 + 400)
+        expected = LSFEncoder().start_object("f").add_binary("data", data).to_string()
+        self.assertEqual(b"".join(sink.writes).decode("ascii"), expected)
+
+    def test_invalid_use(self):
+        """Test to_string() with a sink, flush() without one and bad sinks."""
+        with self.assertRaises(ValueError):
+            LSFEncoder(sink=io.StringIO()).to_string()
+        with self.assertRaises(ValueError):
+            LSFEncoder().flush()
+        with self.assertRaises(ValueError):
+            LSFEncoder(sink=io.StringIO(), flush_threshold=0)
+        with self.assertRaises(TypeError):
+            LSFEncoder(sink=object())
+
+
+class BinaryEncoderTests(TestCase):
+    """Test cases for LSFEncoder(binary=True)."""
+
+    def test_matches_text_output(self):
+        """Test to_bytes() and to_string() against the str encoder."""
+        expected = encode_sample(LSFEncoder()).to_string() + "$o~more$r~$t~bin$f~b$f~//////8=$r~"
+        encoder = encode_sample(LSFEncoder(binary=True))
+        encoder.start_object("more").add_binary("b", b"\xff" * 5)
+        self.assertEqual(encoder.to_bytes(), expected.encode("utf-8"))
+        self.assertEqual(encoder.to_string(), expected)
+
+    def test_long_output_in_runs(self):
+        """Test output of more records than one encoded run."""
+        text, binary = LSFEncoder(), LSFEncoder(binary=True, encoding="utf-16-le")
+        for encoder in (text, binary):
+            for i in range(BINARY_RUN_RECORDS * 2):
+                encoder.start_object(f"ü{i}").add_field("x", i)
+        self.assertEqual(binary.to_bytes(), text.to_string().encode("utf-16-le"))
+
+    def test_bom_and_bin_fields_in_other_encodings(self):
+        """Test one BOM and base64 text encoded like the rest of the output."""
+        for encoding in ("utf-16", "utf-8-sig"):
+            expected = encode_sample(LSFEncoder()).to_string()
+            encoder = encode_sample(LSFEncoder(binary=True, encoding=encoding))
+            self.assertEqual(encoder.to_bytes(), expected.encode(encoding))
+            self.assertEqual(encoder.to_string(), expected)
+
+    def test_to_bytes_closes_the_encoder(self):
+        """Test that records cannot be added to the buffer to_bytes() returned."""
+        encoder = LSFEncoder(binary=True).start_object("a")
+        output = encoder.to_bytes()
+        self.assertIsInstance(output, bytearray)
+        with self.assertRaises(ValueError):
+            encoder.add_field("x", 1)
+        with self.assertRaises(ValueError):
+            encoder.start_object("b")
+        with self.assertRaises(ValueError):
+            encoder.add_binary("b", b"\xff")
+        self.assertEqual(output, b"$o~a$r~")
+        self.assertIs(encoder.to_bytes(), output)
+        self.assertEqual(encoder.to_string(), "$o~a$r~")
+
+    def test_invalid_use(self):
+        """Test to_bytes() on a str encoder and binary with a sink."""
+        with self.assertRaises(ValueError):
+            LSFEncoder().to_bytes()
+        with self.assertRaises(ValueError):
+            LSFEncoder(sink=io.BytesIO(), binary=True)
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
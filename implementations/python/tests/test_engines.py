@@ -0,0 +1,90 @@
+"""
+Tests for the LSF decode engine registry.
+"""
+
+import unittest
+from unittest import TestCase
+
+from lsf.engines import (
+    AUTO_THRESHOLDS,
+    available_engines,
+    get_decoder,
+    register_engine,
+    select_engine,
+    _ENGINES,
+)
+from lsf.bulk_decoder import BulkLSFDecoder
+from lsf.simple import from_lsf
+from tests.conformance import all_documents, reference_decode
+
+
+class LSFEngineTests(TestCase):
+    """Test cases for the decode engine registry."""
+
+    def test_builtin_engines_registered(self):
+        """Test that the built-in engines are available."""
+        for name in ("reference", "bulk", "regex", "scan"):
+            self.assertIn(name, available_engines())
+
+    def test_all_engines_conform(self):
+        """Test every registered engine against the reference decoder."""
+        documents = list(all_documents())
+        for engine in available_engines():
+            with self.subTest(engine=engine):
+                for lsf_str in documents:
+                    decoder = get_decoder(engine)
+                    expected, expected_errors = reference_decode(lsf_str)
+                    actual = decoder.decode(lsf_str)
+                    self.assertEqual(repr(actual), repr(expected), msg=repr(lsf_str))
+                    self.assertEqual(decoder.get_errors(), expected_errors, msg=repr(lsf_str))
+
+    def test_auto_conforms(self):
+        """Test from_lsf with the auto engine on small and large inputs."""
+        small = "$o~user$r~$f~name$f~John$r~$t~int$f~age$f~30$r~"
+        large = "$o~blob$r~$f~data$f~" + "x" * (4 * AUTO_THRESHOLDS["min_probe_size"]) + "$r~"
+        for lsf_str in (small, large):
+            self.assertEqual(from_lsf(lsf_str), reference_decode(lsf_str)[0])
+
+    def test_select_engine_small_input(self):
+        """Test that short inputs always use the bulk engine."""
+        self.assertEqual(select_engine(""), "bulk")
+        self.assertEqual(select_engine("$o~a$r~$f~k$f~" + "v" * 100 + "$r~"), "bulk")
+
+    def test_select_engine_by_shape(self):
+        """Test that large inputs pick an engine from their record size."""
+        size = AUTO_THRESHOLDS["min_probe_size"] * 2
+        short_records = "$f~k$f~v$r~" * (size // 11)
+        long_records = ("$f~k$f~" + "v" * AUTO_THRESHOLDS["regex_min_record_size"] * 2 + "$r~") * 4
+        self.assertEqual(select_engine(short_records), "bulk")
+        self.assertEqual(select_engine(long_records), "regex")
+
+    def test_from_lsf_explicit_engine(self):
+        """Test selecting an engine by name."""
+        lsf_str = "$o~user$r~$f~tags$f~a$l~b$r~"
+        for engine in available_engines():
+            self.assertEqual(from_lsf(lsf_str, engine=engine), {"user": {"tags": ["a", "b"]}})
+
+    def test_unknown_engine(self):
+        """Test that an unknown engine name raises ValueError."""
+        with self.assertRaises(ValueError):
+            from_lsf("", engine="missing")
+
+    def test_register_engine(self):
+        """Test registering a custom engine."""
+        register_engine("custom", BulkLSFDecoder)
+        try:
+            self.assertIn("custom", available_engines())
+            self.assertIsInstance(get_decoder("custom"), BulkLSFDecoder)
+            with self.assertRaises(ValueError):
+                register_engine("custom", BulkLSFDecoder)
+        finally:
+            del _ENGINES["custom"]
+
+    def test_register_auto_rejected(self):
+        """Test that 'auto' cannot be registered."""
+        with self.assertRaises(ValueError):
+            register_engine("auto", BulkLSFDecoder)
+
+
+if __name__ == '__main__':
+    unittest.main()
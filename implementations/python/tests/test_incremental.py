@@ -0,0 +1,164 @@
+"""
+Tests for the incremental LSF decoder.
+"""
+
+import io
+import random
+import unittest
+from unittest import TestCase
+
+from lsf.incremental import IncrementalLSFDecoder, LSFEvent, iterparse
+from tests.conformance import all_documents, reference_decode
+
+
+def feed_all(lsf_str, sizes):
+    """Feed lsf_str in chunks of the given sizes and return (decoder, events)."""
+    decoder = IncrementalLSFDecoder()
+    events = []
+    pos = 0
+    for size in sizes:
+        events.extend(decoder.feed(lsf_str[pos:pos + size]))
+        pos += size
+    events.extend(decoder.feed(lsf_str[pos:]))
+    events.extend(decoder.close())
+    return decoder, events
+
+
+class IncrementalLSFDecoderTests(TestCase):
+    """Test cases for the IncrementalLSFDecoder class."""
+
+    def assert_conforms(self, lsf_str, sizes):
+        decoder, _ = feed_all(lsf_str, sizes)
+        expected, expected_errors = reference_decode(lsf_str)
+        self.assertEqual(repr(decoder.result), repr(expected), msg=(lsf_str, sizes))
+        self.assertEqual(decoder.get_errors(), expected_errors, msg=(lsf_str, sizes))
+
+    def test_conformance_whole_document(self):
+        """Test feeding each document in one chunk."""
+        for lsf_str in all_documents():
+            self.assert_conforms(lsf_str, [])
+
+    def test_conformance_single_characters(self):
+        """Test feeding each document one character at a time."""
+        for lsf_str in all_documents():
+            self.assert_conforms(lsf_str, [1] * len(lsf_str))
+
+    def test_conformance_random_chunks(self):
+        """Test feeding each document in random chunk sizes."""
+        rng = random.Random(99)
+        for lsf_str in all_documents():
+            sizes = [rng.randint(1, 7) for _ in range(len(lsf_str))]
+            self.assert_conforms(lsf_str, sizes)
+
+    def test_field_emitted_on_terminator(self):
+        """Test that a field is emitted as soon as its $r~ arrives."""
+        decoder = IncrementalLSFDecoder()
+        self.assertEqual(decoder.feed("$o~user$r~$f~name$f~Jo"), [])
+        self.assertEqual(decoder.feed("hn$r"), [])
+        self.assertEqual(
+            decoder.feed("~$t~int$f~age$f~30$r~"),
+            [
+                LSFEvent("field", "user", "name", "John"),
+                LSFEvent("field", "user", "age", 30),
+            ],
+        )
+
+    def test_object_emitted_on_next_object(self):
+        """Test that an object is emitted when the next one starts."""
+        decoder = IncrementalLSFDecoder()
+        decoder.feed("$o~user$r~$f~name$f~John$r~")
+        events = decoder.feed("$o~product$r~")
+        self.assertEqual(events, [LSFEvent("object", "user", None, {"name": "John"})])
+        self.assertEqual(decoder.close(), [LSFEvent("object", "product", None, {})])
+
+    def test_final_record_without_terminator(self):
+        """Test that close() flushes a trailing unterminated record."""
+        decoder = IncrementalLSFDecoder()
+        decoder.feed("$o~user$r~$f~tags$f~a$l~b")
+        events = decoder.close()
+        self.assertEqual(events[0], LSFEvent("field", "user", "tags", ["a", "b"]))
+        self.assertEqual(decoder.result, {"user": {"tags": ["a", "b"]}})
+
+    def test_error_events(self):
+        """Test that error records and conversion errors are emitted."""
+        decoder = IncrementalLSFDecoder()
+        events = decoder.feed("$o~user$r~$e~boom$r~$t~int$f~age$f~x$r~")
+        self.assertEqual([event.kind for event in events], ["error", "error"])
+        self.assertEqual(events[0].value, "boom")
+        self.assertEqual(decoder.get_errors()[0], "boom")
+
+    def test_whitespace_split_across_chunks(self):
+        """Test whitespace skipping continues across chunk boundaries."""
+        decoder = IncrementalLSFDecoder()
+        for chunk in ("$o~user$r~", "  ", "\n", "  $f~k$f~v$r~"):
+            decoder.feed(chunk)
+        decoder.close()
+        self.assertEqual(decoder.result, {"user": {"k": "v"}})
+
+    def test_keep_result_false(self):
+        """Test that completed objects are not retained when asked."""
+        decoder = IncrementalLSFDecoder(keep_result=False)
+        events = decoder.feed("$o~a$r~$f~k$f~1$r~$o~b$r~")
+        self.assertEqual(events[-1], LSFEvent("object", "a", None, {"k": "1"}))
+        self.assertEqual(decoder.result, {})
+
+    def test_feed_after_close(self):
+        """Test that feeding a closed decoder raises ValueError."""
+        decoder = IncrementalLSFDecoder()
+        decoder.close()
+        with self.assertRaises(ValueError):
+            decoder.feed("$o~a$r~")
+
+
+class IterparseTests(TestCase):
+    """Test cases for the iterparse function."""
+
+    LSF = (
+        "$o~user$r~$f~name$f~Jöhn 🙂$r~$t~int$f~age$f~30$r~\n"
+        "$o~product$r~$f~tags$f~a$l~b$r~$t~bin$f~blob$f~aGk=$r~\n"
+        "$o~empty$r~"
+    )
+
+    def test_text_file(self):
+        """Test iterating over a text file object."""
+        objects = list(iterparse(io.StringIO(self.LSF), chunk_size=5))
+        self.assertEqual([name for name, _ in objects], ["user", "product", "empty"])
+        self.assertEqual(dict(objects), reference_decode(self.LSF)[0])
+
+    def test_binary_file_split_characters(self):
+        """Test that multi-byte characters split across reads are decoded."""
+        data = self.LSF.encode("utf-8")
+        for chunk_size in (1, 2, 3, 7, 1024):
+            objects = list(iterparse(io.BytesIO(data), chunk_size=chunk_size))
+            self.assertEqual(dict(objects), reference_decode(self.LSF)[0])
+
+    def test_matches_decoder_on_corpus(self):
+        """Test that the last occurrence of each object matches from_lsf."""
+        for lsf_str in all_documents():
+            expected = reference_decode(lsf_str)[0]
+            actual = dict(iterparse(io.StringIO(lsf_str), chunk_size=4))
+            self.assertEqual(repr(actual), repr(expected), msg=repr(lsf_str))
+
+    def test_repeated_object_names(self):
+        """Test that every occurrence of a repeated name is yielded."""
+        lsf_str = "$o~row$r~$f~k$f~1$r~$o~row$r~$f~k$f~2$r~"
+        self.assertEqual(
+            list(iterparse(io.StringIO(lsf_str))),
+            [("row", {"k": "1"}), ("row", {"k": "2"})],
+        )
+
+    def test_lazy_reading(self):
+        """Test that objects are yielded before the file is exhausted."""
+        stream = io.StringIO("$o~a$r~$f~k$f~v$r~$o~b$r~" + "$f~x$f~y$r~" * 1000)
+        objects = iterparse(stream, chunk_size=16)
+        self.assertEqual(next(objects), ("a", {"k": "v"}))
+        self.assertLess(stream.tell(), 100)
+
+    def test_invalid_chunk_size(self):
+        """Test that a non-positive chunk size raises ValueError."""
+        with self.assertRaises(ValueError):
+            list(iterparse(io.StringIO(""), chunk_size=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+"""
+Tests for the sidecar LSF index.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import TestCase
+
+from lsf.buffer_decoder import decode_file
+from lsf.index import APPENDED, FINGERPRINT_SAMPLE, FRESH, STALE, INDEX_SUFFIX, IndexedLSFFile, LSFIndex, main
+from tests.conformance import all_documents, reference_decode
+
+
+class LSFIndexTests(TestCase):
+    """Test cases for LSFIndex and IndexedLSFFile."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "data.lsf")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, lsf_str, mode="w"):
+        with open(self.path, mode, encoding="utf-8", newline="") as f:
+            f.write(lsf_str)
+
+    def test_matches_decode_file_on_corpus(self):
+        """Test keys, order and values against the reference decoder."""
+        for lsf_str in all_documents():
+            self.write(lsf_str)
+            expected, _ = reference_decode(lsf_str)
+            for use_mmap in (True, False):
+                with IndexedLSFFile(self.path, use_mmap=use_mmap, save_index=False) as data:
+                    self.assertEqual(list(data), list(expected), lsf_str)
+                    # repr() compares NaN values as equal
+                    self.assertEqual(repr(dict(data)), repr(expected), lsf_str)
+
+    def test_byte_ranges(self):
+        """Test offsets and lengths with whitespace and multi-byte names."""
+        self.write("$o~a$r~$f~x$f~1$r~ \n$o~ü$r~$f~y$f~2$r~$o~a$r~")
+        entries = LSFIndex.build(self.path).entries
+        self.assertEqual(entries, {"a": (39, 7), "ü": (20, 16)})
+
+    def test_save_and_load(self):
+        """Test that a saved index loads back identically."""
+        self.write("$o~user$r~$f~name$f~Jöhn$r~$o~order$r~$t~int$f~total$f~9$r~")
+        index = LSFIndex.build(self.path)
+        index_path = index.save()
+        self.assertEqual(index_path, self.path + INDEX_SUFFIX)
+        loaded = LSFIndex.load(index_path)
+        self.assertEqual(loaded.path, self.path)
+        self.assertEqual(loaded.entries, index.entries)
+        self.assertEqual(loaded.last_start, index.last_start)
+        self.assertEqual(loaded.status(), FRESH)
+
+    def test_load_rejects_other_files(self):
+        """Test that a file without the index header is rejected."""
+        self.write("$o~a$r~")
+        with self.assertRaises(ValueError):
+            LSFIndex.load(self.path, self.path)
+
+    def test_append_refreshes_incrementally(self):
+        """Test that appended objects and a growing last object are indexed."""
+        self.write("$o~a$r~$f~x$f~1$r~$o~b$r~$f~y$f~2")
+        index = LSFIndex.build(self.path)
+        index.save()
+        self.write("$r~\n$o~c$r~$f~z$f~3$r~$o~a$r~$f~w$f~4$r~", mode="a")
+
+        loaded = LSFIndex.load(self.path + INDEX_SUFFIX)
+        self.assertEqual(loaded.status(), APPENDED)
+        self.assertEqual(loaded.refresh(), APPENDED)
+        self.assertEqual(loaded.status(), FRESH)
+        self.assertEqual(loaded.entries, LSFIndex.build(self.path).entries)
+        with IndexedLSFFile(self.path) as data:
+            self.assertEqual(dict(data), decode_file(self.path))
+
+    def test_append_after_cut_in_object_record(self):
+        """Test files cut inside a $o~ record, including names seen before."""
+        self.write("$o~a$r~$f~k$f~1$r~$o~b$r~$o~c$r")
+        index = LSFIndex.build(self.path)
+        self.assertIn("c$r", index.entries)
+        self.write("~$f~k0$f~2$r~", mode="a")
+        index.refresh()
+        self.assertEqual(index.entries, LSFIndex.build(self.path).entries)
+        self.assertNotIn("c$r", index.entries)
+
+        document = "$o~ab$r~$f~k$f~1$r~$o~b$r~$o~ab$r~$f~k$f~2$r~$o~abc$r~$f~k$f~3$r~$o~ab$r~"
+        for cut in range(len(document) + 1):
+            self.write(document[:cut])
+            index = LSFIndex.build(self.path)
+            self.write(document[cut:], mode="a")
+            index.refresh()
+            self.assertEqual(list(index.entries.items()), list(LSFIndex.build(self.path).entries.items()), cut)
+
+    def test_rewrite_is_stale(self):
+        """Test that changed or truncated files are detected and rebuilt."""
+        self.write("$o~a$r~$f~x$f~1$r~$o~b$r~$f~y$f~2$r~")
+        LSFIndex.build(self.path).save()
+        self.write("$o~a$r~$f~x$f~9$r~$o~b$r~$f~y$f~2$r~$o~c$r~")
+        index = LSFIndex.load(self.path + INDEX_SUFFIX)
+        self.assertEqual(index.status(), STALE)
+        self.assertEqual(index.refresh(), STALE)
+        self.assertEqual(index.entries, LSFIndex.build(self.path).entries)
+
+        self.write("$o~a$r~")
+        self.assertEqual(index.status(), STALE)
+        with IndexedLSFFile(self.path) as data:
+            self.assertEqual(dict(data), {"a": {}})
+        self.assertEqual(LSFIndex.load(self.path + INDEX_SUFFIX).status(), FRESH)
+
+    def test_same_size_edit_in_the_middle_is_stale(self):
+        """Test that an edit between the hashed ends that keeps the size is detected."""
+        padding = "$f~pad$f~" + "p" * FINGERPRINT_SAMPLE + "$r~"
+        self.write(f"$o~a$r~{padding}$o~b$r~$f~x$f~1$r~$o~c$r~{padding}")
+        index = LSFIndex.build(self.path)
+        index.save()
+        stat = os.stat(self.path)
+        with open(self.path, "r+b") as f:
+            f.seek(len(padding) + 7)
+            f.write(b"$o~B")
+        # Give the edit a modification time the index cannot have recorded
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(os.path.getsize(self.path), index.file_size)
+        index = LSFIndex.load(self.path + INDEX_SUFFIX)
+        self.assertEqual(index.status(), STALE)
+        self.assertEqual(index.refresh(), STALE)
+        self.assertEqual(list(index.entries), ["a", "B", "c"])
+        self.assertEqual(index.status(), FRESH)
+
+    def test_empty_file(self):
+        """Test indexing an empty file, then appending to it."""
+        self.write("")
+        index = LSFIndex.build(self.path)
+        self.assertEqual(index.entries, {})
+        self.assertEqual(index.status(), FRESH)
+        self.write("$o~a$r~", mode="a")
+        self.assertEqual(index.refresh(), APPENDED)
+        self.assertEqual(index.entries, {"a": (0, 7)})
+
+    def test_command_line(self):
+        """Test the build, status and get commands."""
+        self.write("$o~user$r~$t~int$f~id$f~7$r~")
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(main(["status", self.path]), 1)
+            self.assertEqual(main(["build", self.path]), 0)
+            self.assertEqual(main(["status", self.path]), 0)
+            self.assertEqual(main(["get", self.path, "user"]), 0)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], "missing")
+        self.assertIn("1 objects, built", lines[1])
+        self.assertEqual(lines[2], FRESH)
+        self.assertEqual("\n".join(lines[3:]), '{\n  "id": 7\n}')
+
+
+if __name__ == '__main__':
+    unittest.main()
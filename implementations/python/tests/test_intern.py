@@ -0,0 +1,122 @@
+"""
+Tests for key, name and value interning.
+"""
+
+import unittest
+from unittest import TestCase
+
+from lsf.intern import InternTable, InterningLSFDecoder, shared_table
+from tests.conformance import all_documents, reference_decode
+
+
+def fresh(text):
+    """Return an equal str object that is not the literal itself."""
+    return "".join(list(text))
+
+
+class InternTableTests(TestCase):
+    """Test cases for InternTable."""
+
+    def test_intern_and_bound(self):
+        """Test sharing, the size bound and the counts."""
+        table = InternTable(max_size=2)
+        a = table.intern(fresh("status"))
+        self.assertIs(table.intern(fresh("status")), a)
+        table.intern(fresh("id"))
+        extra = fresh("name")
+        self.assertIs(table.intern(extra), extra)
+        self.assertIsNot(table.intern(fresh("name")), extra)
+        stats = table.stats()
+        self.assertEqual((stats.lookups, stats.hits, stats.size), (5, 1, 2))
+        self.assertEqual(stats.hit_rate, 0.2)
+        table.clear()
+        self.assertEqual(table.stats().lookups, 0)
+
+    def test_value_cardinality_cap(self):
+        """Test that a key with too many distinct values stops being interned."""
+        table = InternTable(value_cardinality=2, max_value_length=5)
+        done = table.intern_value("status", fresh("done"))
+        self.assertIs(table.intern_value("status", fresh("done")), done)
+        table.intern_value("id", "1")
+        table.intern_value("id", "2")
+        table.intern_value("id", "3")
+        self.assertEqual(table.stats().value_keys, 1)
+        value = fresh("1")
+        self.assertIs(table.intern_value("id", value), value)
+        long_value = fresh("too long")
+        self.assertIs(table.intern_value("status", long_value), long_value)
+
+    def test_names_are_added_when_seen_twice(self):
+        """Test that names are held apart from keys and only added on a second sighting."""
+        table = InternTable(max_size=2, max_names=2)
+        first = fresh("user")
+        self.assertIs(table.intern_name(first), first)
+        second = table.intern_name(fresh("user"))
+        self.assertIsNot(second, first)
+        self.assertIs(table.intern_name(fresh("user")), second)
+        for name in ("tx1", "tx2", "tx3"):
+            table.intern_name(name)
+        self.assertEqual(len(table._seen_names), 1)
+        key = table.intern(fresh("status"))
+        self.assertIs(table.intern(fresh("status")), key)
+        stats = table.stats()
+        self.assertEqual((stats.name_lookups, stats.name_hits, stats.names), (6, 1, 1))
+        self.assertEqual((stats.lookups, stats.hits, stats.size), (2, 1, 1))
+
+
+class InterningLSFDecoderTests(TestCase):
+    """Test cases for InterningLSFDecoder."""
+
+    def test_conformance(self):
+        """Test that interning does not change output or errors."""
+        for intern_values in (False, True):
+            decoder = InterningLSFDecoder(InternTable(max_size=20, value_cardinality=3), intern_values)
+            for lsf_str in all_documents():
+                expected, expected_errors = reference_decode(lsf_str)
+                self.assertEqual(repr(decoder.decode(lsf_str)), repr(expected), lsf_str)
+                self.assertEqual(decoder.get_errors(), expected_errors, lsf_str)
+
+    def test_strings_are_shared_across_decodes(self):
+        """Test that keys, names and values are the same objects."""
+        table = InternTable()
+        lsf_str = "$o~tx$r~$f~status$f~completed$r~$t~int$f~user_id$f~7$r~"
+        first, second, third = (
+            InterningLSFDecoder(table, intern_values=True).decode(fresh(lsf_str)) for _ in range(3)
+        )
+        self.assertEqual(first, second)
+        (name1, fields1), = first.items()
+        (name2, fields2), = second.items()
+        (name3, _), = third.items()
+        # Names are added on their second sighting
+        self.assertIsNot(name1, name2)
+        self.assertIs(name2, name3)
+        for key1, key2 in zip(fields1, fields2):
+            self.assertIs(key1, key2)
+        self.assertIs(fields1["status"], fields2["status"])
+        stats = table.stats()
+        self.assertEqual((stats.lookups, stats.hits), (6, 4))
+        self.assertEqual((stats.name_lookups, stats.name_hits), (3, 1))
+        self.assertEqual((stats.value_lookups, stats.value_hits), (3, 2))
+
+    def test_unique_names_do_not_crowd_out_keys(self):
+        """Test that keys are interned after many one-off object names."""
+        table = InternTable()
+        decoder = InterningLSFDecoder(table)
+        decoder.decode("".join(f"$o~tx{i}$r~$f~id$f~{i}$r~" for i in range(20_000)))
+        decoder.decode(fresh("$o~user$r~$f~email$f~a@example.com$r~"))
+        second = decoder.decode(fresh("$o~user$r~$f~email$f~b@example.com$r~"))
+        self.assertIs(next(iter(second["user"])), table.intern(fresh("email")))
+        stats = table.stats()
+        self.assertEqual((stats.size, stats.names), (2, 1))
+        self.assertEqual((stats.lookups, stats.hits), (20_003, 20_001))
+
+    def test_shared_table_by_default(self):
+        """Test that decoders without a table use shared_table."""
+        before = shared_table.stats()
+        InterningLSFDecoder().decode("$o~a$r~$f~k$f~v$r~")
+        after = shared_table.stats()
+        self.assertEqual((after.lookups, after.name_lookups), (before.lookups + 1, before.name_lookups + 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
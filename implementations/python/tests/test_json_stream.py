@@ -0,0 +1,132 @@
+"""
+Tests for the streaming LSF to JSON conversion.
+"""
+
+import io
+import json
+import random
+import unittest
+from unittest import TestCase
+
+from lsf.conversion import lsf_to_json
+from lsf.decoder import LSFDecoder
+from lsf.json_stream import dump_lsf_to_json, iter_lsf_to_json
+from tests.conformance import all_documents
+
+OPTIONS = ({}, {"indent": 2}, {"sort_keys": True}, {"indent": "\t", "sort_keys": True}, {"indent": 0})
+
+
+def expected_json(lsf_str, **options):
+    try:
+        return lsf_to_json(lsf_str, **options)
+    except TypeError:
+        return TypeError
+
+
+def streamed_json(lsf_str, **options):
+    try:
+        return "".join(iter_lsf_to_json(lsf_str, **options))
+    except TypeError:
+        return TypeError
+
+
+def has_unique_objects(lsf_str):
+    objects = sum(1 for record in lsf_str.split("$r~") if record.lstrip().startswith("$o~"))
+    return len(LSFDecoder().decode(lsf_str)) == objects
+
+
+class JSONStreamTests(TestCase):
+    """Test cases for iter_lsf_to_json and dump_lsf_to_json."""
+
+    def test_basic(self):
+        """Test compact output with typed fields and lists."""
+        lsf_str = "$o~user$r~$f~name$f~John$r~$t~int$f~age$f~30$r~$f~tags$f~a$l~b$r~"
+        self.assertEqual(
+            "".join(iter_lsf_to_json(lsf_str)),
+            '{"user": {"name": "John", "age": 30, "tags": ["a", "b"]}}',
+        )
+
+    def test_matches_lsf_to_json_on_corpus(self):
+        """Test byte-identical output for unique object names, any chunking."""
+        rng = random.Random(5)
+        for lsf_str in all_documents():
+            options = OPTIONS if has_unique_objects(lsf_str) else OPTIONS[2:4]
+            for option in options:
+                expected = expected_json(lsf_str, **option)
+                self.assertEqual(streamed_json(lsf_str, **option), expected, (lsf_str, option))
+                chunked = streamed_json(lsf_str, chunk_size=rng.randint(1, 9), **option)
+                self.assertEqual(chunked, expected, (lsf_str, option))
+
+    def test_repeated_object_names(self):
+        """Test that a repeated name raises ValueError unless sort_keys holds the output."""
+        lsf_str = "$o~a$r~$f~x$f~1$r~$o~b$r~$f~y$f~2$r~$o~a$r~$f~z$f~3$r~"
+        with self.assertRaises(ValueError):
+            "".join(iter_lsf_to_json(lsf_str))
+        with self.assertRaises(ValueError):
+            dump_lsf_to_json(lsf_str, io.StringIO())
+        self.assertEqual(
+            "".join(iter_lsf_to_json(lsf_str, sort_keys=True)),
+            lsf_to_json(lsf_str, sort_keys=True),
+        )
+
+    def test_repeated_name_replacing_bin_field(self):
+        """Test that a replaced bin field raises ValueError, or nothing with sort_keys."""
+        lsf_str = "$o~a$r~$t~bin$f~data$f~AAEC$r~$o~a$r~$f~x$f~1$r~"
+        with self.assertRaises(ValueError):
+            "".join(iter_lsf_to_json(lsf_str))
+        self.assertEqual("".join(iter_lsf_to_json(lsf_str, sort_keys=True)), lsf_to_json(lsf_str, sort_keys=True))
+
+    def test_repeated_keys_keep_first_position(self):
+        """Test that a repeated key keeps its first position and last value."""
+        lsf_str = "$o~a$r~$f~x$f~1$r~$f~y$f~2$r~$f~x$f~3$r~"
+        self.assertEqual("".join(iter_lsf_to_json(lsf_str)), lsf_to_json(lsf_str))
+
+    def test_escaping(self):
+        """Test quotes, backslashes, control and non-ASCII characters."""
+        lsf_str = '$o~q"o\\te$r~$f~k\n$f~line\nbreak "quoted" \\ é 😀 \x00$r~'
+        self.assertEqual("".join(iter_lsf_to_json(lsf_str)), lsf_to_json(lsf_str))
+
+    def test_special_floats(self):
+        """Test NaN and infinities spelled as json.dumps does."""
+        lsf_str = "$o~f$r~$t~float$f~a$f~nan$r~$t~float$f~b$f~inf$r~$t~float$f~c$f~-inf$r~"
+        self.assertEqual("".join(iter_lsf_to_json(lsf_str)), '{"f": {"a": NaN, "b": Infinity, "c": -Infinity}}')
+
+    def test_bin_field_raises(self):
+        """Test that bin fields raise TypeError like json.dumps."""
+        with self.assertRaises(TypeError):
+            "".join(iter_lsf_to_json("$o~f$r~$t~bin$f~data$f~AAEC$r~"))
+
+    def test_empty_input(self):
+        """Test that empty input gives an empty JSON object."""
+        self.assertEqual("".join(iter_lsf_to_json("")), "{}")
+        self.assertEqual("".join(iter_lsf_to_json("", indent=2)), "{}")
+
+    def test_sources(self):
+        """Test text files, binary files and iterables of chunks."""
+        lsf_str = "$o~user$r~$f~name$f~Jörg$r~"
+        expected = lsf_to_json(lsf_str)
+        data = lsf_str.encode("utf-8")
+        self.assertEqual("".join(iter_lsf_to_json(io.StringIO(lsf_str), chunk_size=3)), expected)
+        self.assertEqual("".join(iter_lsf_to_json(io.BytesIO(data), chunk_size=1)), expected)
+        self.assertEqual("".join(iter_lsf_to_json([data[:20], data[20:]])), expected)
+        self.assertEqual("".join(iter_lsf_to_json(iter(["$o~user$r", "~$f~name$f~Jörg$r~"]))), expected)
+
+    def test_output_is_incremental(self):
+        """Test that completed objects are yielded before the input ends."""
+        chunks = iter_lsf_to_json(iter(["$o~a$r~$f~x$f~1$r~$o~b$r~", "$f~y$f~2$r~"]))
+        self.assertEqual(next(chunks), '{"a": {"x": "1"}')
+        self.assertEqual("".join(chunks), ', "b": {"y": "2"}}')
+
+    def test_dump_to_text_and_binary_files(self):
+        """Test writing to text and binary file objects."""
+        lsf_str = "$o~user$r~$f~name$f~Jörg$r~"
+        text = io.StringIO()
+        dump_lsf_to_json(lsf_str, text, indent=2)
+        self.assertEqual(text.getvalue(), lsf_to_json(lsf_str, indent=2))
+        binary = io.BytesIO()
+        dump_lsf_to_json(lsf_str, binary)
+        self.assertEqual(binary.getvalue(), lsf_to_json(lsf_str).encode("ascii"))
+
+
+if __name__ == "__main__":
+    unittest.main()
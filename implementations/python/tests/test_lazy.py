@@ -0,0 +1,72 @@
+"""
+Tests for the lazy LSF mapping.
+"""
+
+import unittest
+from collections.abc import Mapping
+from unittest import TestCase
+
+from lsf.lazy import LazyLSFMapping, index_objects
+from lsf.simple import from_lsf
+from tests.conformance import all_documents, reference_decode
+
+
+class LazyLSFMappingTests(TestCase):
+    """Test cases for LazyLSFMapping and from_lsf(lazy=True)."""
+
+    def test_matches_eager_decode_on_corpus(self):
+        """Test keys, order and values against the reference decoder."""
+        for lsf_str in all_documents():
+            expected, _ = reference_decode(lsf_str)
+            lazy = LazyLSFMapping(lsf_str)
+            self.assertEqual(list(lazy), list(expected), lsf_str)
+            self.assertEqual(len(lazy), len(expected))
+            # repr() compares NaN values as equal
+            self.assertEqual(repr(dict(lazy)), repr(expected), lsf_str)
+
+    def test_from_lsf_lazy(self):
+        """Test that from_lsf(lazy=True) returns an equal read-only Mapping."""
+        lsf_str = "$o~user$r~$t~int$f~id$f~1$r~$o~order$r~$f~total$f~9$r~"
+        lazy = from_lsf(lsf_str, lazy=True)
+        self.assertIsInstance(lazy, Mapping)
+        self.assertEqual(lazy, from_lsf(lsf_str))
+        self.assertEqual(from_lsf(lsf_str), lazy)
+        with self.assertRaises(TypeError):
+            lazy["user"] = {}
+
+    def test_objects_decoded_on_first_access(self):
+        """Test that only accessed objects are decoded."""
+        lazy = LazyLSFMapping("$o~a$r~$t~int$f~x$f~1$r~$o~b$r~$t~int$f~y$f~bad$r~")
+        self.assertIn("b", lazy)
+        self.assertFalse(lazy.is_decoded("a"))
+        self.assertEqual(lazy["a"], {"x": 1})
+        self.assertTrue(lazy.is_decoded("a"))
+        self.assertFalse(lazy.is_decoded("b"))
+        self.assertIs(lazy["a"], lazy["a"])
+        with self.assertRaises(KeyError):
+            lazy["missing"]
+
+    def test_repeated_names(self):
+        """Test that the last occurrence wins at the first position."""
+        lsf_str = "$o~a$r~$f~x$f~1$r~$o~b$r~$f~y$f~2$r~\n$o~a$r~$f~z$f~3$r~"
+        lazy = LazyLSFMapping(lsf_str)
+        self.assertEqual(list(lazy), ["a", "b"])
+        self.assertEqual(lazy["a"], {"z": "3"})
+
+    def test_index_objects(self):
+        """Test object ranges, whitespace and leading whitespace."""
+        lsf_str = "$o~a$r~$f~x$f~1$r~ \n$o~b"
+        self.assertEqual(index_objects(lsf_str), {"a": (0, 15), "b": (20, 24)})
+        self.assertEqual(index_objects(" $o~a$r~$o~b$r~"), {"b": (8, 15)})
+        self.assertEqual(index_objects("$f~x$f~1$r~$e~oops$r~"), {})
+        self.assertEqual(index_objects(""), {})
+
+    def test_engine_selection(self):
+        """Test that objects are decoded with the requested engine."""
+        lsf_str = "$o~a$r~$f~x$f~1$l~2$r~"
+        for engine in ("reference", "bulk", "regex", "scan"):
+            self.assertEqual(LazyLSFMapping(lsf_str, engine)["a"], {"x": ["1", "2"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Tests for the names exported by the lsf package.
+"""
+
+import subprocess
+import sys
+import unittest
+from unittest import TestCase
+
+import lsf
+from lsf import aio, parallel
+
+
+def run_python(code):
+    """Return the output of code run in a fresh interpreter, one line per print."""
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split("\n")
+
+
+class PackageTests(TestCase):
+    """Test cases for the lsf package namespace."""
+
+    def test_all_names_resolve(self):
+        """Test that every name in __all__ is an attribute, lazy or not."""
+        for name in lsf.__all__:
+            self.assertTrue(hasattr(lsf, name), name)
+        self.assertIs(lsf.aiter_objects, aio.aiter_objects)
+        self.assertIs(lsf.decode_many, parallel.decode_many)
+        self.assertIs(lsf.DecodeResult, parallel.DecodeResult)
+        self.assertIn("aiter_objects", dir(lsf))
+        with self.assertRaises(AttributeError):
+            lsf.no_such_name
+
+    def test_import_does_not_load_asyncio(self):
+        """Test that aio is only imported on first access."""
+        output = run_python(
+            "import sys, lsf\n"
+            "print(sorted({'asyncio', 'lsf.aio'} & set(sys.modules)))\n"
+            "lsf.aiter_objects\n"
+            "print('lsf.aio' in sys.modules)\n"
+        )
+        self.assertEqual(output[:2], ["[]", "True"])
+
+    def test_import_does_not_load_process_pools(self):
+        """Test that parallel is only imported on first access."""
+        output = run_python(
+            "import sys, lsf\n"
+            "print(sorted({'concurrent.futures', 'lsf.parallel'} & set(sys.modules)))\n"
+            "lsf.decode_file_parallel\n"
+            "print('lsf.parallel' in sys.modules)\n"
+        )
+        self.assertEqual(output[:2], ["[]", "True"])
+
+
+if __name__ == '__main__':
+    unittest.main()
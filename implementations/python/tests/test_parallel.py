@@ -0,0 +1,140 @@
+"""
+Tests for parallel decoding of many documents.
+"""
+
+import os
+import random
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from lsf.buffer_decoder import decode_file
+from lsf.parallel import (
+    DecodeResult, decode_file_parallel, decode_many, iter_decode_many, partition_offsets,
+)
+from lsf.simple import from_lsf
+from tests.conformance import all_documents
+
+
+class DecodeManyTests(TestCase):
+    """Test cases for decode_many and iter_decode_many."""
+
+    def setUp(self):
+        self.documents = [f"$o~doc$r~$t~int$f~n$f~{i}$r~$e~note {i}$r~" for i in range(50)]
+
+    def check(self, results):
+        self.assertEqual(len(results), len(self.documents))
+        for i, result in enumerate(results):
+            self.assertTrue(result.ok)
+            self.assertEqual(result.data, {"doc": {"n": i}})
+            self.assertEqual(result.errors, [f"note {i}"])
+
+    def test_process_pool_preserves_order(self):
+        """Test decoding in worker processes with small batches."""
+        self.check(decode_many(self.documents, workers=2, chunksize=3))
+
+    def test_in_process(self):
+        """Test workers=1, which does not start a pool."""
+        self.check(decode_many(iter(self.documents), workers=1, chunksize=7))
+
+    def test_reused_executor(self):
+        """Test passing an existing executor."""
+        with ThreadPoolExecutor(2) as executor:
+            self.check(decode_many(self.documents, chunksize=4, executor=executor))
+            self.check(list(iter_decode_many(self.documents, workers=2, executor=executor)))
+
+    def test_errors_are_collected_per_item(self):
+        """Test that failing documents do not stop the batch."""
+        documents = ["$o~a$r~", b"$o~b$r~$f~k$f~\xff$r~", None, b"$o~c$r~$f~k$f~v$r~"]
+        results = decode_many(documents, workers=2, chunksize=2)
+        self.assertEqual([result.ok for result in results], [True, False, False, True])
+        self.assertIsInstance(results[1].exception, UnicodeDecodeError)
+        self.assertIsInstance(results[2].exception, TypeError)
+        self.assertIsNone(results[2].data)
+        self.assertEqual(results[3], DecodeResult({"c": {"k": "v"}}, []))
+
+    def test_matches_from_lsf_on_corpus(self):
+        """Test str and bytes documents against from_lsf."""
+        documents = list(all_documents())
+        results = decode_many(documents + [d.encode("utf-8") for d in documents], workers=2, chunksize=100)
+        for document, result in zip(documents * 2, results):
+            # repr() compares NaN values as equal
+            self.assertEqual(repr(result.data), repr(from_lsf(document)), document)
+
+    def test_invalid_arguments(self):
+        """Test that workers and chunksize must be positive."""
+        with self.assertRaises(ValueError):
+            decode_many([], chunksize=0)
+        with self.assertRaises(ValueError):
+            decode_many([], workers=0)
+
+
+
+class DecodeFileParallelTests(TestCase):
+    """Test cases for decode_file_parallel and partition_offsets."""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".lsf")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def write(self, lsf_str):
+        with open(self.path, "w", encoding="utf-8", newline="") as f:
+            f.write(lsf_str)
+
+    def assert_matches_serial(self, **kwargs):
+        expected = decode_file(self.path)
+        with ThreadPoolExecutor(3) as executor:
+            result = decode_file_parallel(self.path, workers=3, executor=executor, min_partition_size=16, **kwargs)
+        self.assertEqual(list(result), list(expected))
+        # repr() compares NaN values as equal
+        self.assertEqual(repr(result), repr(expected))
+
+    def test_matches_serial_with_repeated_names(self):
+        """Test the last-one-wins rule across partitions."""
+        rng = random.Random(7)
+        records = []
+        for i in range(400):
+            name = f"obj{rng.randrange(60)}"
+            separator = rng.choice(["", "\n", " \u3000", "\r\n"])
+            records.append(f"$o~{name}$r~{separator}$f~k{i % 3}$f~v{i}$r~$t~int$f~n$f~{i}$r~$e~e{i}$r~{separator}")
+        self.write("".join(records))
+        self.assert_matches_serial()
+
+    def test_matches_serial_on_corpus(self):
+        """Test the conformance corpus concatenated into one file."""
+        self.write("".join(all_documents()))
+        self.assert_matches_serial()
+        self.write(" " + "".join(all_documents()))
+        self.assert_matches_serial()
+
+    def test_partition_offsets(self):
+        """Test that split points start objects after a terminator."""
+        data = b"$f~x$f~1$r~$o~a$r~$f~k$f~v$r~ \n$o~b$r~$o~c$r~"
+        self.assertEqual(partition_offsets(data, 1), [0, len(data)])
+        offsets = partition_offsets(data, 8)
+        self.assertEqual(offsets[0], 0)
+        self.assertEqual(offsets[-1], len(data))
+        for offset in offsets[1:-1]:
+            self.assertEqual(data[offset:offset + 3], b"$o~")
+        self.assertEqual(offsets, sorted(set(offsets)))
+
+    def test_process_pool(self):
+        """Test decoding partitions in worker processes."""
+        self.write("".join(f"$o~o{i % 50}$r~$t~int$f~i$f~{i}$r~\n" for i in range(2000)))
+        result = decode_file_parallel(self.path, workers=2, min_partition_size=1024)
+        self.assertEqual(result, decode_file(self.path))
+
+    def test_small_or_empty_file_is_decoded_serially(self):
+        """Test files below the partition size and empty files."""
+        self.write("$o~a$r~$f~k$f~v$r~")
+        self.assertEqual(decode_file_parallel(self.path, workers=4), {"a": {"k": "v"}})
+        self.write("")
+        self.assertEqual(decode_file_parallel(self.path, workers=4, min_partition_size=1), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Tests for field projection while decoding.
+"""
+
+import unittest
+import zlib
+from unittest import TestCase
+
+from lsf.decoder import LSFDecoder
+from lsf.engines import available_engines, get_decoder
+from lsf.simple import from_lsf
+from tests.conformance import all_documents, reference_decode
+
+
+def some_fields(name, key):
+    """Deterministically keep about half of the fields."""
+    return zlib.crc32(f"{name}\0{key}".encode("utf-8", "surrogatepass")) % 2 == 0
+
+
+def project(result, predicate):
+    return {
+        name: {key: value for key, value in fields.items() if predicate(name, key)}
+        for name, fields in result.items()
+    }
+
+
+class ProjectionTests(TestCase):
+    """Test cases for decode(..., fields=...) on every engine."""
+
+    def test_keep_everything_matches_full_decode(self):
+        """Test that selecting every field reproduces output and errors."""
+        for engine in available_engines():
+            for lsf_str in all_documents():
+                expected, expected_errors = reference_decode(lsf_str)
+                decoder = get_decoder(engine, lsf_str)
+                result = decoder.decode(lsf_str, fields=lambda name, key: True)
+                self.assertEqual(repr(result), repr(expected), msg=(engine, lsf_str))
+                self.assertEqual(decoder.get_errors(), expected_errors, msg=(engine, lsf_str))
+
+    def test_predicate_matches_filtered_decode(self):
+        """Test that a predicate drops exactly the unselected fields."""
+        for engine in available_engines():
+            for lsf_str in all_documents():
+                expected = project(reference_decode(lsf_str)[0], some_fields)
+                result = get_decoder(engine, lsf_str).decode(lsf_str, fields=some_fields)
+                self.assertEqual(repr(result), repr(expected), msg=(engine, lsf_str))
+                self.assertEqual(list(result), list(expected))
+
+    def test_mapping_selection(self):
+        """Test field lists, None for every field and unlisted objects."""
+        lsf_str = (
+            "$o~user$r~$t~int$f~id$f~7$r~$f~name$f~Ann$r~$f~tags$f~a$l~b$r~"
+            "$o~order$r~$t~float$f~total$f~9.5$r~$o~log$r~$f~line$f~x$r~"
+        )
+        result = LSFDecoder().decode(lsf_str, fields={"user": ["id", "tags"], "order": None})
+        self.assertEqual(result, {
+            "user": {"id": 7, "tags": ["a", "b"]},
+            "order": {"total": 9.5},
+            "log": {},
+        })
+
+    def test_skipped_fields_are_not_converted(self):
+        """Test that invalid values are only reported when selected."""
+        lsf_str = "$o~f$r~$t~bin$f~blob$f~not base64!$r~$t~int$f~n$f~x$r~$e~oops$r~"
+        for engine in available_engines():
+            decoder = get_decoder(engine, lsf_str)
+            self.assertEqual(decoder.decode(lsf_str, fields={"f": []}), {"f": {}})
+            self.assertEqual(decoder.get_errors(), ["oops"])
+            decoder.decode(lsf_str, fields={"f": ["n"]})
+            self.assertEqual(decoder.get_errors(), [
+                "Error parsing typed field $t~int$f~n$f~x: invalid literal for int() with base 10: 'x'",
+                "oops",
+            ], msg=engine)
+
+    def test_shared_field_lists(self):
+        """Test objects sharing one list of field names with others using their own."""
+        lsf_str = "$o~a$r~$f~x$f~1$r~$f~y$f~2$r~$o~b$r~$f~x$f~3$r~$f~y$f~4$r~$o~c$r~$f~x$f~5$r~$f~y$f~6$r~"
+        shared = ["x"]
+        for engine in available_engines():
+            result = get_decoder(engine, lsf_str).decode(lsf_str, fields={"a": shared, "b": ["y"], "c": shared})
+            self.assertEqual(result, {"a": {"x": "1"}, "b": {"y": "4"}, "c": {"x": "5"}}, msg=engine)
+
+    def test_from_lsf(self):
+        """Test from_lsf with fields, eager and lazy."""
+        lsf_str = "$o~a$r~$f~x$f~1$r~$f~y$f~2$r~$o~b$r~$f~x$f~3$r~"
+        expected = {"a": {"x": "1"}, "b": {}}
+        self.assertEqual(from_lsf(lsf_str, fields={"a": ["x"]}), expected)
+        self.assertEqual(from_lsf(lsf_str, engine="reference", fields={"a": ["x"]}), expected)
+        self.assertEqual(dict(from_lsf(lsf_str, lazy=True, fields={"a": ["x"]})), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
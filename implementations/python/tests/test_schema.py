@@ -0,0 +1,165 @@
+"""
+Tests for the schema-compiled LSF decoder and encoder.
+"""
+
+import datetime
+import sys
+import unittest
+from array import array
+from unittest import TestCase
+
+from lsf.schema import SchemaLSFDecoder, SchemaLSFEncoder, make_record_class
+from lsf.simple import from_lsf, to_lsf
+from tests.conformance import ConformanceMixin
+
+
+class SchemaLSFDecoderTests(ConformanceMixin, TestCase):
+    """Test cases for the SchemaLSFDecoder class."""
+
+    def engine_decode(self, lsf_str):
+        # Objects without a schema must decode exactly as the reference
+        decoder = SchemaLSFDecoder()
+        decoder.register("unused", {"id": "int"})
+        result = decoder.decode(lsf_str)
+        return result, decoder.get_errors()
+
+    def test_records_match_dict_decode(self):
+        """Test that records hold the values the dict path produces."""
+        data = {
+            f"tx{i}": {
+                "id": f"TX-{i}",
+                "user_id": i * 3,
+                "amount": i / 4,
+                "paid": i % 2 == 0,
+                "tags": ["a", "b"] if i % 3 else ["only"],
+                "blob": bytes([i]),
+                "note": None,
+            }
+            for i in range(50)
+        }
+        lsf_str = to_lsf(data)
+        decoder = SchemaLSFDecoder(type_of=lambda name: name.rstrip("0123456789"))
+        Transaction = decoder.register("tx", {
+            "id": "str", "user_id": "int", "amount": "float", "paid": "bool",
+            "tags": "list", "blob": "bin", "note": "null",
+        }, class_name="Transaction")
+        result = decoder.decode(lsf_str)
+        self.assertEqual(list(result), list(data))
+        for name, record in result.items():
+            self.assertIsInstance(record, Transaction)
+            self.assertEqual(record._asdict(), data[name])
+        self.assertEqual(decoder.get_errors(), [])
+
+    def test_missing_extra_and_invalid_fields(self):
+        """Test defaults, ignored fields and conversion errors."""
+        decoder = SchemaLSFDecoder()
+        decoder.register("user", {"id": "int", "name": "str", "score": "float"})
+        result = decoder.decode(
+            "$o~user$r~$f~id$f~7$r~$f~extra$f~x$r~$t~float$f~score$f~high$r~"
+            "$o~other$r~$t~int$f~id$f~1$r~"
+        )
+        self.assertEqual(repr(result["user"]), "User(id=7, name=None, score=None)")
+        self.assertEqual(result["other"], {"id": 1})
+        self.assertEqual(decoder.get_errors(), [
+            "Error parsing typed field $t~float$f~score$f~high: could not convert string to float: 'high'",
+        ])
+
+    def test_repeated_object_keeps_first_position(self):
+        """Test that the last occurrence wins at the first position."""
+        decoder = SchemaLSFDecoder()
+        decoder.register("a", {"x": "int"}, as_tuple=True)
+        result = decoder.decode("$o~a$r~$f~x$f~1$r~$o~b$r~$o~a$r~$f~x$f~2$r~")
+        self.assertEqual(result, {"a": (2,), "b": {}})
+
+    def test_tuples_allow_any_field_name(self):
+        """Test as_tuple with keys that are not identifiers and custom converters."""
+        decoder = SchemaLSFDecoder()
+        self.assertIs(decoder.register("row", {"first name": "str", "n": lambda s: int(s, 16)}, as_tuple=True), tuple)
+        self.assertEqual(decoder.decode("$o~row$r~$f~n$f~ff$r~$f~first name$f~Ann$r~"), {"row": ("Ann", 255)})
+
+    def test_register_errors(self):
+        """Test unknown field types and invalid attribute names."""
+        decoder = SchemaLSFDecoder()
+        with self.assertRaises(ValueError):
+            decoder.register("user", {"id": "integer"})
+        with self.assertRaises(ValueError):
+            decoder.register("user", {"first name": "str"})
+        with self.assertRaises(ValueError):
+            decoder.decode("$o~user$r~", fields={"user": ["id"]})
+
+    def test_record_class(self):
+        """Test the generated slotted class."""
+        User = make_record_class("User", ["id", "name"])
+        user = User(1, "Ann")
+        self.assertEqual(user, User(1, "Ann"))
+        self.assertNotEqual(user, User(2, "Ann"))
+        self.assertEqual(User._fields, ("id", "name"))
+        self.assertFalse(hasattr(user, "__dict__"))
+        self.assertLess(sys.getsizeof(user), sys.getsizeof(user._asdict()))
+        with self.assertRaises(AttributeError):
+            user.other = 1
+
+
+class SchemaLSFEncoderTests(TestCase):
+    """Test cases for the SchemaLSFEncoder class."""
+
+    schema = {
+        "id": "int", "name": "str", "price": "float", "active": "bool", "note": "null",
+        "tags": "list", "image": "bin", "counts": "int[]", "weights": "float[]",
+    }
+
+    def records(self):
+        return {
+            f"item{i}": {
+                "id": i, "name": f"Item {i}", "price": i * 1.25, "active": i % 2 == 0, "note": None,
+                "tags": ["a", "b"][:i % 3], "image": bytes(range(i)),
+                "counts": array("q", range(i)), "weights": array("d", [i / 3]),
+            }
+            for i in range(5)
+        }
+
+    def test_matches_to_lsf(self):
+        """Test that typed values give exactly the to_lsf output."""
+        encoder = SchemaLSFEncoder(type_of=lambda name: name.rstrip("0123456789"))
+        encoder.register("item", self.schema)
+        data = self.records()
+        self.assertEqual(encoder.encode(data), to_lsf(data))
+        self.assertEqual(encoder.encode(list(data.items())), to_lsf(data))
+
+    def test_values_written_by_schema(self):
+        """Test conversion of list values and callable field types."""
+        encoder = SchemaLSFEncoder()
+        encoder.register("doc", {"n": "int[]", "x": "float[]", "when": lambda d: d.isoformat()})
+        lsf_str = encoder.encode({"doc": {"n": [1, 2], "x": (1, 2), "when": datetime.date(2024, 1, 2)}})
+        self.assertEqual(lsf_str, "$o~doc$r~$t~int[]$f~n$f~1$l~2$r~$t~float[]$f~x$f~1.0$l~2.0$r~"
+                                  "$f~when$f~2024-01-02$r~")
+        self.assertEqual(from_lsf(lsf_str)["doc"]["x"], array("d", [1.0, 2.0]))
+
+    def test_other_objects_fall_back(self):
+        """Test unregistered objects and objects whose keys differ from the schema."""
+        encoder = SchemaLSFEncoder()
+        encoder.register("user", {"id": "str", "name": "str"})
+        data = {
+            "user": {"id": 1, "other": "x"},
+            "post": {"id": 2},
+            "": {"x": 1},
+        }
+        self.assertEqual(encoder.encode(data), to_lsf(data))
+        self.assertEqual(encoder.encode({"user": {"name": "Ann", "id": 1}}),
+                         "$o~user$r~$f~id$f~1$r~$f~name$f~Ann$r~")
+
+    def test_any_key_is_safe(self):
+        """Test keys that are not valid in source code."""
+        encoder = SchemaLSFEncoder()
+        encoder.register("x", {"{a}": "str", "b'\\\"": "int"})
+        data = {"x": {"{a}": "{v}", "b'\\\"": 1}}
+        self.assertEqual(encoder.encode(data), to_lsf(data))
+
+    def test_register_errors(self):
+        """Test unknown field types."""
+        with self.assertRaises(ValueError):
+            SchemaLSFEncoder().register("user", {"id": "integer"})
+
+
+if __name__ == '__main__':
+    unittest.main()
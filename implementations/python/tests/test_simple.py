@@ -3,10 +3,13 @@ Tests for the LSF simple API functions.
 """
 
 import base64
+import enum
+from array import array
 import unittest
 from unittest import TestCase
 
-from lsf.simple import to_lsf, from_lsf
+from lsf.encoder import LSFEncoder
+from lsf.simple import _list_type_hint, encode_to_bytes, to_lsf, from_lsf, iter_encode
 
 
 class LSFSimpleTests(TestCase):
@@ -163,6 +166,22 @@ class LSFSimpleTests(TestCase):
         result = from_lsf(lsf_str)
         self.assertEqual(result["file"]["content"], binary_data)
         
+    def test_typed_list_round_trip(self):
+        """Test that arrays are written as typed lists and read back."""
+        original = {"v": {
+            "ids": array("i", [1, 2, 3]),
+            "embedding": array("d", [0.25, -1.5, 1e-300]),
+            "empty": array("q"),
+            "tags": ["a", "b"],
+        }}
+        lsf_str = to_lsf(original)
+        self.assertIn("$t~int[]$f~ids$f~1$l~2$l~3$r~", lsf_str)
+        result = from_lsf(lsf_str)["v"]
+        self.assertEqual(result["ids"], array("q", [1, 2, 3]))
+        self.assertEqual(result["embedding"], original["v"]["embedding"])
+        self.assertEqual(result["empty"], array("q"))
+        self.assertEqual(result["tags"], ["a", "b"])
+
     def test_from_lsf_empty_string(self):
         """Test converting an empty LSF string to Python dict."""
         result = from_lsf("")
@@ -198,5 +217,146 @@ class LSFSimpleTests(TestCase):
         self.assertEqual(result["user"]["image"], original["user"]["image"])
 
 
+def fluent_to_lsf(data):
+    """to_lsf written with the LSFEncoder fluent API and an isinstance chain."""
+    encoder = LSFEncoder()
+    for obj_name, obj_data in data.items():
+        encoder.start_object(obj_name)
+        for key, value in obj_data.items():
+            if isinstance(value, list):
+                encoder.add_list(key, value)
+            elif isinstance(value, int) and not isinstance(value, bool):
+                encoder.add_typed_field(key, value, "int")
+            elif isinstance(value, float):
+                encoder.add_typed_field(key, value, "float")
+            elif isinstance(value, bool):
+                encoder.add_typed_field(key, value, "bool")
+            elif value is None:
+                encoder.add_typed_field(key, value, "null")
+            elif isinstance(value, bytes):
+                encoder.add_typed_field(key, value, "bin")
+            else:
+                type_hint = _list_type_hint(value)
+                if type_hint is not None:
+                    encoder.add_list(key, value, type_hint)
+                else:
+                    encoder.add_field(key, value)
+    return encoder.to_string()
+
+
+class Color(enum.IntEnum):
+    RED = 1
+
+
+class Name(str):
+    def __str__(self):
+        return "name:" + self
+
+
+class Tags(list):
+    pass
+
+
+class Money(float):
+    def __str__(self):
+        return f"{float(self):.2f} EUR"
+
+
+class Blob(bytes):
+    pass
+
+
+class ToLsfFastPathTests(TestCase):
+    """Test that to_lsf writes exactly what the fluent encoder writes."""
+
+    def test_matches_fluent_encoder(self):
+        """Test builtin values, subclasses and other objects."""
+        values = [
+            "text", "", 0, -12, 10 ** 30, 1.5, float("nan"), float("-inf"), True, False, None,
+            b"", b"\x00bytes", bytearray(b"ba"), [], ["a", 1, None], ("t", 1), {"k": [1]}, {1, 2},
+            array("i", [1, 2]), array("f", [0.1]), array("d"), array("b", []),
+            Color.RED, Name("ann"), Tags(["x", "y"]), Money(2.5), Blob(b"blob"), object,
+        ]
+        data = {f"obj{i}": {"value": value, "after": i} for i, value in enumerate(values)}
+        data[""] = {"empty name": 1}
+        data["all"] = {f"k{i}": value for i, value in enumerate(values)}
+        self.assertEqual(to_lsf(data), fluent_to_lsf(data))
+        # Again, now that the writers of the types are cached
+        self.assertEqual(to_lsf(data), fluent_to_lsf(data))
+        self.assertEqual("".join(iter_encode(data, chunk_size=7)), fluent_to_lsf(data))
+        self.assertEqual(encode_to_bytes(data), fluent_to_lsf(data).encode("utf-8"))
+
+    def test_invalid_typed_list_values(self):
+        """Test that arrays are still converted through the typed list check."""
+        with self.assertRaises(ValueError):
+            to_lsf({"x": {"v": array("Q", [2 ** 64 - 1])}})
+
+
+class EncodeToBytesTests(TestCase):
+    """Test cases for encode_to_bytes."""
+
+    def test_matches_to_lsf(self):
+        """Test the bytearray and chunk list against to_lsf().encode()."""
+        data = {
+            f"obj{i}": {"name": f"é{i}", "n": i, "blob": bytes(range(i % 7)), "tags": ["a"]}
+            for i in range(5000)
+        }
+        expected = to_lsf(data).encode("utf-8")
+        result = encode_to_bytes(data)
+        self.assertIsInstance(result, bytearray)
+        self.assertEqual(result, expected)
+        chunks = encode_to_bytes(data, chunks=True)
+        self.assertTrue(all(isinstance(chunk, bytes) for chunk in chunks))
+        self.assertEqual(b"".join(chunks), expected)
+        for encoding in ("latin-1", "utf-16", "utf-8-sig"):
+            self.assertEqual(encode_to_bytes(data, encoding=encoding), to_lsf(data).encode(encoding))
+            self.assertEqual(b"".join(encode_to_bytes(data, chunks=True, encoding=encoding)),
+                             to_lsf(data).encode(encoding))
+        self.assertEqual(encode_to_bytes({}), b"")
+
+
+class IterEncodeTests(TestCase):
+    """Test cases for iter_encode."""
+
+    data = {
+        f"tx{i}": {"id": f"TX-{i}", "amount": i * 1.5, "qty": i, "ok": i % 2 == 0,
+                   "note": None, "tags": ["a", "é"], "blob": bytes(range(i)), "v": array("q", [i])}
+        for i in range(40)
+    }
+
+    def test_chunks_join_to_to_lsf(self):
+        """Test str and bytes chunks for pairs and mappings."""
+        expected = to_lsf(self.data)
+        for chunk_size in (1, 50, 1000, 1 << 20):
+            chunks = list(iter_encode(iter(self.data.items()), chunk_size=chunk_size))
+            self.assertTrue(all(isinstance(chunk, str) for chunk in chunks))
+            self.assertEqual("".join(chunks), expected)
+            chunks = list(iter_encode(self.data, chunk_size=chunk_size, binary=True))
+            self.assertTrue(all(isinstance(chunk, bytes) for chunk in chunks))
+            self.assertEqual(b"".join(chunks), expected.encode("utf-8"))
+            chunks = list(iter_encode(self.data, chunk_size=chunk_size, binary=True, encoding="utf-16"))
+            self.assertEqual(b"".join(chunks), expected.encode("utf-16"))
+        self.assertEqual(list(iter_encode([])), [])
+
+    def test_chunk_size_bound(self):
+        """Test that chunks exceed the size by at most one field."""
+        chunks = list(iter_encode(self.data, chunk_size=200))
+        self.assertGreater(len(chunks), 10)
+        self.assertTrue(all(len(chunk) < 300 for chunk in chunks[:-1]))
+
+    def test_records_pulled_lazily(self):
+        """Test that records are read only as chunks are consumed."""
+        pulled = []
+
+        def records():
+            for name, fields in self.data.items():
+                pulled.append(name)
+                yield name, fields
+
+        chunks = iter_encode(records(), chunk_size=100)
+        next(chunks)
+        self.assertLess(len(pulled), 3)
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""
+Tests for the LSF 3.0 TokenScanner.
+"""
+
+import random
+import unittest
+from array import array
+from unittest import TestCase
+
+from lsf.v3 import (
+    TOKEN_FIELD,
+    TOKEN_OBJECT,
+    TOKEN_TYPE_HINT,
+    TOKEN_VALUE,
+    TokenScanner,
+)
+
+O, F, V, T = TOKEN_OBJECT, TOKEN_FIELD, TOKEN_VALUE, TOKEN_TYPE_HINT
+
+
+def reference_scan(data):
+    """Byte-by-byte scan mirroring the C# and JavaScript TokenScanner."""
+    types, positions = [], []
+    i = 0
+    while i < len(data) - 2:
+        if data[i] == ord("$") and data[i + 2] == ord("~") and data[i + 1] in (O, F, V, T):
+            types.append(data[i + 1])
+            positions.append(i)
+            i += 3
+        else:
+            i += 1
+    return types, positions
+
+
+class TokenScannerTests(TestCase):
+    """Test cases for the LSF 3.0 TokenScanner."""
+
+    def setUp(self):
+        self.scanner = TokenScanner()
+
+    def assertTokens(self, data, types, positions):
+        result = self.scanner.scan(data)
+        self.assertEqual(result.count, len(types))
+        self.assertEqual(list(result.types), types)
+        self.assertEqual(list(result.positions), positions)
+
+    def test_simple_document(self):
+        """Test scanning one object with a typed value."""
+        self.assertTokens("$o~root$f~name$v~value$t~s", [O, F, V, T], [0, 7, 14, 22])
+
+    def test_typed_arrays(self):
+        """Test that types and positions are stored in compact arrays."""
+        result = self.scanner.scan(b"$o~a$f~b")
+        self.assertIsInstance(result.types, array)
+        self.assertEqual(result.types.typecode, "B")
+        self.assertIsInstance(result.positions, array)
+        self.assertEqual(result.positions.typecode, "I")
+
+    def test_empty_and_plain_input(self):
+        """Test inputs without tokens."""
+        self.assertTokens(b"", [], [])
+        self.assertTokens(b"This string has no LSF tokens.", [], [])
+
+    def test_implicit_array(self):
+        """Test multiple values for one field."""
+        self.assertTokens(
+            "$o~data$f~scores$v~10$t~n$v~20$t~n$v~30$t~n",
+            [O, F, V, T, V, T, V, T],
+            [0, 7, 16, 21, 25, 30, 34, 39],
+        )
+
+    def test_incomplete_token_at_end(self):
+        """Test that a truncated token at the end is ignored."""
+        self.assertTokens("$o~object$f~field$v~value$", [O, F, V], [0, 9, 17])
+        self.assertTokens("$o~object$f~field$v~value$f", [O, F, V], [0, 9, 17])
+        self.assertTokens("$o~object$f~field$v~value$f~", [O, F, V, F], [0, 9, 17, 25])
+
+    def test_malformed_and_v1_tokens_ignored(self):
+        """Test that unknown markers such as $x~ and $r~ are not tokens."""
+        self.assertTokens("$x~invalid$o~valid1$f~field1$a~notlsf3$f+almost$v~value1", [O, F, V], [10, 19, 47])
+        self.assertTokens("$r~$l~$e~", [], [])
+
+    def test_adjacent_and_overlapping_tokens(self):
+        """Test adjacent tokens and dollar signs before a token."""
+        self.assertTokens("$o~$f~$v~$t~", [O, F, V, T], [0, 3, 6, 9])
+        self.assertTokens("$$o~", [O], [1])
+        self.assertTokens("$f~~$v~", [F, V], [0, 4])
+
+    def test_utf8_positions_are_byte_offsets(self):
+        """Test that positions count bytes, not characters."""
+        self.assertTokens("$o~ñ$f~€$v~😀$t~n", [O, F, V, T], [0, 5, 11, 18])
+
+    def test_buffer_types(self):
+        """Test bytes, bytearray and memoryview input."""
+        data = b"$o~a$f~b$v~c"
+        for buffer in (data, bytearray(data), memoryview(data), memoryview(data).cast("c")):
+            result = self.scanner.scan(buffer)
+            self.assertEqual(list(result.positions), [0, 4, 8])
+        self.assertIs(self.scanner.scan(data).buffer, data)
+
+    def test_growth_on_large_input(self):
+        """Test a document with many more tokens than a small initial capacity."""
+        data = "$f~a$v~b" * 5000
+        self.assertTokens(data, [F, V] * 5000, [p for i in range(5000) for p in (i * 8, i * 8 + 4)])
+
+    def test_matches_reference_scan(self):
+        """Test random inputs against a byte-by-byte scan."""
+        rng = random.Random(7)
+        alphabet = ["$", "~", "o", "f", "v", "t", "x", "é", "$o~", "$f~", "$v~", "$t~"]
+        for _ in range(300):
+            data = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40))).encode("utf-8")
+            result = self.scanner.scan(data)
+            types, positions = reference_scan(data)
+            self.assertEqual(list(result.types), types, data)
+            self.assertEqual(list(result.positions), positions, data)
+
+
+if __name__ == "__main__":
+    unittest.main()